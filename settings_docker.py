@@ -40,6 +40,9 @@ WHITENOISE_AUTOREFRESH = DEBUG
 MEDIA_URL = '/media/'
 MEDIA_ROOT = Path('/app/data/media')
 
+# Shared cache next to the database so all gunicorn workers coordinate through it
+CACHES['default']['LOCATION'] = os.environ.get('CACHE_LOCATION', '/app/data/cache.sqlite3')
+
 # API Keys - Allow environment variables to override
 OPENAI_KEY = os.environ.get('OPENAI_KEY', '')
 GOOGLE_API = os.environ.get('GOOGLE_API', '')
@@ -84,6 +87,11 @@ LOGGING = {
             'level': os.environ.get('DJANGO_LOG_LEVEL', 'INFO'),
             'propagate': False,
         },
+        'stories': {
+            'handlers': ['console'],
+            'level': os.environ.get('STORIES_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
     },
 }
 
@@ -0,0 +1,26 @@
+// Idempotency keys for paid generation requests.
+//
+// Every user action gets a fresh key, so clicking "Regenerate" again really
+// generates a new image. When a request fails before any response arrives
+// (dropped connection, proxy timeout) the key is kept: retrying the same
+// action then replays the result the server may already have paid for.
+
+const pendingIdempotencyKeys = {};
+
+function idempotencyKey(action) {
+    if (!pendingIdempotencyKeys[action]) {
+        pendingIdempotencyKeys[action] = (window.crypto && crypto.randomUUID)
+            ? crypto.randomUUID()
+            : Date.now().toString(36) + Math.random().toString(36).slice(2);
+    }
+    return pendingIdempotencyKeys[action];
+}
+
+// fetch() with the action's Idempotency-Key; the key is dropped once a response arrives
+function fetchIdempotent(action, url, options) {
+    const headers = Object.assign({}, options.headers, { 'Idempotency-Key': idempotencyKey(action) });
+    return fetch(url, Object.assign({}, options, { headers: headers })).then(response => {
+        delete pendingIdempotencyKeys[action];
+        return response;
+    });
+}
@@ -60,7 +60,7 @@ function generateImageAsync(projectId, sceneId) {
     }, 3000);
 
     // Make AJAX request
-    fetch(`/project/${projectId}/scene/${sceneId}/generate-ajax/`, {
+    fetchIdempotent(`generate:${sceneId}`, `/project/${projectId}/scene/${sceneId}/generate-ajax/`, {
         method: 'POST',
         headers: {
             'X-CSRFToken': getCookie('csrftoken'),
@@ -191,7 +191,7 @@ function editImageAsync(projectId, sceneId) {
     progressMessage.textContent = 'Applying edits to your image...';
 
     // Make AJAX request to the edit endpoint
-    fetch(`/project/${projectId}/scene/${sceneId}/edit-ajax/`, {
+    fetchIdempotent(`edit:${sceneId}:${editPrompt}`, `/project/${projectId}/scene/${sceneId}/edit-ajax/`, {
         method: 'POST',
         headers: {
             'X-CSRFToken': getCookie('csrftoken'),
@@ -82,11 +82,72 @@ function initializeStoryExtraction() {
             formCard.style.opacity = '0.7';
         }
 
+        // Stream progress (scenes appear as they are extracted) when the browser supports it
+        if (form.dataset.streamUrl && window.fetch && window.ReadableStream && window.TextDecoder) {
+            e.preventDefault();
+            clearInterval(form.dataset.messageInterval);
+            streamStoryExtraction(form, progressMessage);
+            return;
+        }
+
         // Show a notification
         showNotification('Processing your story with AI. Please wait...', 'info');
     });
 }
 
+function streamStoryExtraction(form, progressMessage) {
+    const sceneList = document.getElementById('sceneProgress');
+    const setMessage = text => { if (progressMessage) progressMessage.textContent = text; };
+    setMessage('Identifying main characters...');
+
+    function handleEvent(event) {
+        if (event.event === 'characters') {
+            setMessage(`Found ${event.count} characters. Extracting scenes...`);
+        } else if (event.event === 'scene') {
+            setMessage(`Scene ${event.index} saved, extracting more...`);
+            if (sceneList) {
+                const item = document.createElement('li');
+                item.className = 'list-group-item';
+                item.textContent = event.name + (event.characters.length ? ` (${event.characters.join(', ')})` : '');
+                sceneList.appendChild(item);
+            }
+        } else if (event.event === 'done') {
+            setMessage(`Extracted ${event.characters} characters and ${event.scenes} scenes!`);
+            window.location.href = event.redirect_url;
+        } else if (event.event === 'error') {
+            throw new Error(event.message);
+        }
+    }
+
+    fetch(form.dataset.streamUrl, { method: 'POST', body: new FormData(form) })
+    .then(response => {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        function read() {
+            return reader.read().then(({ done, value }) => {
+                buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)));
+                if (!done) return read();
+            });
+        }
+        return read();
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showNotification(error.message || 'Network error. Please try again.', 'danger');
+        setMessage('Extraction stopped. Scenes saved so far are kept in the project.');
+        const submitBtn = document.getElementById('extractBtn');
+        if (submitBtn) {
+            submitBtn.disabled = false;
+            submitBtn.innerHTML = '<i class="bi bi-magic"></i> Extract Scenes & Characters';
+        }
+    });
+}
+
 function showNotification(message, type) {
     // Create notification element
     const notification = document.createElement('div');
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Project, Character, Scene, PromptTemplate
+from .models import Project, Character, Scene, SceneCandidate, PromptTemplate
 
 
 class CharacterInline(admin.TabularInline):
@@ -41,6 +41,12 @@ class SceneAdmin(admin.ModelAdmin):
     has_image.short_description = 'Has Image'
 
 
+@admin.register(SceneCandidate)
+class SceneCandidateAdmin(admin.ModelAdmin):
+    list_display = ['scene', 'created_at']
+    list_filter = ['scene__project', 'created_at']
+
+
 @admin.register(PromptTemplate)
 class PromptTemplateAdmin(admin.ModelAdmin):
     list_display = ['name', 'template_type', 'is_active', 'updated_at']
@@ -0,0 +1,196 @@
+"""
+Endpoint benchmark driver used by the `benchmark_endpoints` command, and the
+URLconf import profile used by `benchmark_imports`.
+
+Requests go through Django's test client, so the numbers cover URL routing,
+views, ORM, storage and (fake) upstream calls, but no network or WSGI server.
+"""
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from .fakes import make_png
+from .models import Character, Project, Scene
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def seed_project(scene_count=10, character_count=2, with_images=True):
+    """Create a project with characters and scenes that reference them.
+
+    With `with_images` every scene starts with a small approved image so the
+    edit endpoint has something to work on.
+    """
+    project = Project.objects.create(name='Benchmark project')
+    characters = [
+        Character.objects.create(
+            project=project,
+            name=f"Hero{i + 1}",
+            description=f"a benchmark character number {i + 1} in a red coat",
+        )
+        for i in range(character_count)
+    ]
+    for i in range(scene_count):
+        scene = Scene.objects.create(
+            project=project,
+            name=f"Scene {i + 1}",
+            prompt=f"{{Hero{(i % max(character_count, 1)) + 1}}} walks through place {i + 1}.",
+            order=(i + 1) * Scene.ORDER_GAP,
+        )
+        if characters:
+            scene.characters.add(characters[i % len(characters)])
+        if with_images:
+            scene.approved_image = ContentFile(make_png(1024), name=f"seed_{i + 1}.png")
+            scene.save()
+    return project
+
+
+def default_endpoints(project):
+    """
+    (name, method, url_factory, payload) tuples covering the page and AJAX views.
+
+    url_factory receives the request index so load is spread across scenes.
+    """
+    scene_ids = list(project.scenes.values_list('pk', flat=True))
+    character_ids = list(project.characters.values_list('pk', flat=True))
+
+    def scene_url(view):
+        return lambda i: reverse(view, args=[project.pk, scene_ids[i % len(scene_ids)]])
+
+    def character_url(i):
+        return reverse('generate_character_image_ajax', args=[project.pk, character_ids[i % len(character_ids)]])
+
+    endpoints = [
+        ('project_detail', 'get', lambda i: reverse('project_detail', args=[project.pk]), None),
+        ('story_viewer', 'get', lambda i: reverse('story_viewer', args=[project.pk]), None),
+        ('scene_manager', 'get', scene_url('scene_manager'), None),
+        ('generate_image_ajax', 'post', scene_url('generate_image_ajax'), {}),
+        ('edit_scene_image_ajax', 'json', scene_url('edit_scene_image_ajax'), {'edit_prompt': 'Make it sunset'}),
+    ]
+    if character_ids:
+        endpoints.append(('generate_character_image_ajax', 'post', character_url, {}))
+    endpoints.append((
+        'story_input', 'post',
+        lambda i: reverse('story_input', args=[project.pk]),
+        {'story_text': 'Hero1 met Hero2 in the forest. They walked home together.'},
+    ))
+    return endpoints
+
+
+def _request(method, url, payload):
+    client = Client()
+    start = time.perf_counter()
+    try:
+        if method == 'get':
+            response = client.get(url)
+        elif method == 'json':
+            response = client.post(url, data=json.dumps(payload), content_type='application/json')
+        else:
+            response = client.post(url, data=payload)
+        elapsed = time.perf_counter() - start
+
+        ok = response.status_code < 400
+        if ok and response.get('Content-Type', '').startswith('application/json'):
+            ok = json.loads(response.content).get('status') != 'error'
+        return elapsed, ok
+    except Exception:
+        return time.perf_counter() - start, False
+    finally:
+        # Worker threads open their own DB connections; don't leak them
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
+
+
+def run_benchmark(endpoints, requests=20, concurrency=1):
+    """
+    Drive every endpoint `requests` times with `concurrency` parallel clients.
+
+    Returns:
+        List of dicts with name, count, errors, p50, p99, mean (seconds) and
+        throughput (requests per second)
+    """
+    results = []
+    for name, method, url_factory, payload in endpoints:
+        urls = [url_factory(i) for i in range(requests)]
+        start = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                samples = list(pool.map(lambda url: _request(method, url, payload), urls))
+        else:
+            samples = [_request(method, url, payload) for url in urls]
+        wall = time.perf_counter() - start
+
+        latencies = [elapsed for elapsed, ok in samples]
+        results.append({
+            'name': name,
+            'count': len(samples),
+            'errors': sum(1 for elapsed, ok in samples if not ok),
+            'p50': percentile(latencies, 50),
+            'p99': percentile(latencies, 99),
+            'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'throughput': len(samples) / wall if wall > 0 else 0.0,
+        })
+    return results
+
+
+def format_results(results):
+    lines = [
+        f"{'endpoint':<32}{'n':>6}{'err':>6}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'req/s':>9}"
+    ]
+    for row in results:
+        lines.append(
+            f"{row['name']:<32}{row['count']:>6}{row['errors']:>6}"
+            f"{row['p50'] * 1000:>10.1f}{row['p99'] * 1000:>10.1f}{row['mean'] * 1000:>10.1f}"
+            f"{row['throughput']:>9.1f}"
+        )
+    return '\n'.join(lines)
+
+
+# AI SDKs that loading the URLconf must not import
+HEAVY_MODULES = ('google.genai', 'SimplerLLM', 'openai', 'tiktoken', 'PIL')
+
+
+def profile_url_import():
+    """Import stories.urls in a fresh interpreter under -X importtime.
+
+    Returns a dict of module name -> cumulative import time in microseconds.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='story_django.settings')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import django; django.setup(); import stories.urls'],
+        capture_output=True, text=True, env=env, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, total, name = line.split('|')
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def heavy_modules(cumulative):
+    """Modules from HEAVY_MODULES (or their submodules) present in an import profile."""
+    return [
+        name for name in cumulative
+        if any(name == heavy or name.startswith(heavy + '.') for heavy in HEAVY_MODULES)
+    ]
@@ -0,0 +1,186 @@
+"""
+Offline stand-ins for the upstream AI services.
+
+`FakeGeminiClient` mimics the part of `google.genai.Client` the image generator
+uses (`client.models.generate_content_stream`) and `FakeLLM` mimics the
+SimplerLLM instance used by `StoryProcessor`. Both are injected through
+settings, so views run unchanged against them:
+
+    GEMINI_CLIENT_CLASS = 'stories.fakes.FakeGeminiClient'
+    STORY_LLM_CLASS = 'stories.fakes.FakeLLM'
+
+Behaviour is tuned with the FAKE_UPSTREAM setting:
+
+    FAKE_UPSTREAM = {
+        'first_chunk_latency': 0.0,  # seconds before the first streamed chunk
+        'latency': 0.0,              # total seconds per upstream call
+        'error_rate': 0.0,           # probability a call fails
+        'error_message': '500 INTERNAL fake upstream error',
+        'image_size': 64 * 1024,     # bytes of the returned image
+        'chunks': 2,                 # streamed chunks per image response
+        'scene_count': 5,            # scenes returned by FakeLLM
+        'character_count': 2,        # characters returned by FakeLLM
+    }
+"""
+import json
+import os
+import random
+import struct
+import time
+import zlib
+from types import SimpleNamespace
+
+from django.conf import settings
+
+
+DEFAULT_FAKE_UPSTREAM = {
+    'first_chunk_latency': 0.0,
+    'latency': 0.0,
+    'error_rate': 0.0,
+    'error_message': '500 INTERNAL fake upstream error',
+    'image_size': 64 * 1024,
+    'chunks': 2,
+    'scene_count': 5,
+    'character_count': 2,
+}
+
+
+def fake_upstream_config(**overrides):
+    config = dict(DEFAULT_FAKE_UPSTREAM)
+    config.update(getattr(settings, 'FAKE_UPSTREAM', {}) or {})
+    config.update(overrides)
+    return config
+
+
+def make_png(size):
+    """Return a valid PNG of roughly `size` bytes (random payload in a private chunk)."""
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+
+    header = b'\x89PNG\r\n\x1a\n'
+    ihdr = chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+    idat = chunk(b'IDAT', zlib.compress(b'\x00\xff\xff\xff'))
+    iend = chunk(b'IEND', b'')
+    padding = max(0, size - len(header) - len(ihdr) - len(idat) - len(iend) - 12)
+    filler = chunk(b'fkPd', os.urandom(padding)) if padding else b''
+    return header + ihdr + filler + idat + iend
+
+
+def _maybe_fail(config):
+    if config['error_rate'] and random.random() < config['error_rate']:
+        raise Exception(config['error_message'])
+
+
+class _FakeModels:
+
+    def __init__(self, config):
+        self.config = config
+
+    def generate_content_stream(self, model, contents, config=None):
+        cfg = self.config
+        chunks = max(1, int(cfg['chunks']))
+        start = time.monotonic()
+
+        time.sleep(cfg['first_chunk_latency'])
+        _maybe_fail(cfg)
+
+        image = make_png(int(cfg['image_size']))
+        remaining = max(0.0, cfg['latency'] - cfg['first_chunk_latency'])
+        for index in range(chunks):
+            if index:
+                time.sleep(remaining / chunks)
+            if index < chunks - 1:
+                part = SimpleNamespace(inline_data=None, text=f"fake progress {index + 1}")
+            else:
+                part = SimpleNamespace(
+                    inline_data=SimpleNamespace(data=image, mime_type='image/png'),
+                    text=None,
+                )
+            usage = None
+            if index == chunks - 1:
+                usage = SimpleNamespace(prompt_token_count=256, candidates_token_count=1290)
+            yield SimpleNamespace(
+                candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))],
+                usage_metadata=usage,
+            )
+
+        leftover = cfg['latency'] - (time.monotonic() - start)
+        if leftover > 0:
+            time.sleep(leftover)
+
+
+class FakeGeminiClient:
+    """Drop-in for `genai.Client` that streams a synthetic PNG."""
+
+    def __init__(self, api_key=None, **kwargs):
+        self.api_key = api_key
+        self.models = _FakeModels(fake_upstream_config())
+
+
+class FakeLLM:
+    """Drop-in for a SimplerLLM instance returning JSON for scene/character extraction."""
+
+    def __init__(self, provider=None, model_name=None, api_key=None, **kwargs):
+        self.provider = provider
+        self.model_name = model_name
+        self.api_key = api_key
+        self.config = fake_upstream_config()
+
+    def _payload(self, prompt):
+        cfg = self.config
+        names = [f"Hero{i + 1}" for i in range(int(cfg['character_count']))]
+        # generate_pydantic_json_model appends an example of the target JSON to the prompt
+        if '{"characters"' in prompt:
+            return {'characters': [
+                {'name': name, 'description': f"a fake character number {i + 1} in a red coat"}
+                for i, name in enumerate(names)
+            ]}
+        return {'scenes': [
+            f"{names[i % len(names)] if names else 'Someone'} walks through fake place {i + 1}."
+            for i in range(int(cfg['scene_count']))
+        ]}
+
+    def generate_response_stream(self, prompt=None, messages=None, **kwargs):
+        """
+        Yield the same JSON as generate_response in `chunks` pieces spread over `latency`.
+
+        Chunks mimic SimplerLLM's LLMStreamChunk: text deltas, then a final
+        `done` chunk carrying the full text and token counts.
+        """
+        cfg = self.config
+        if prompt is None and messages:
+            prompt = messages[-1].get('content', '')
+        text = json.dumps(self._payload(prompt or ''))
+        pieces = max(1, int(cfg['chunks']) * 4)
+        size = -(-len(text) // pieces)
+
+        time.sleep(cfg['first_chunk_latency'])
+        _maybe_fail(cfg)
+        remaining = max(0.0, cfg['latency'] - cfg['first_chunk_latency'])
+        for index in range(0, len(text), size):
+            if index:
+                time.sleep(remaining / pieces)
+            yield SimpleNamespace(text=text[index:index + size], done=False)
+        yield SimpleNamespace(
+            text='',
+            done=True,
+            generated_text=text,
+            input_token_count=len((prompt or '').split()),
+            output_token_count=len(text.split()),
+            model=self.model_name,
+        )
+
+    def generate_response(self, prompt=None, messages=None, **kwargs):
+        time.sleep(self.config['latency'])
+        _maybe_fail(self.config)
+        if prompt is None and messages:
+            prompt = messages[-1].get('content', '')
+        text = json.dumps(self._payload(prompt or ''))
+        if kwargs.get('full_response'):
+            return SimpleNamespace(
+                generated_text=text,
+                input_token_count=len((prompt or '').split()),
+                output_token_count=len(text.split()),
+                model=self.model_name,
+            )
+        return text
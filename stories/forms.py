@@ -2,6 +2,7 @@ from django import forms
 from .models import PromptTemplate, Character, GenerationSettings
 from decimal import Decimal
 import json
+import re
 
 
 class PromptTemplateForm(forms.ModelForm):
@@ -155,10 +156,18 @@ class GenerationSettingsForm(forms.ModelForm):
             if self.instance.google_api_key:
                 self.fields['google_api_key'].widget.render_value = False
                 self.fields['google_api_key'].widget.attrs['placeholder'] = f"Current: {self.instance.mask_api_key(self.instance.google_api_key)}"
+            # Keep the stored pool around: construct_instance overwrites the instance before save()
+            self._stored_google_api_keys = self.instance.google_api_keys
+            if self.instance.google_api_keys:
+                extra_keys = [k for k in re.split(r'[\s,;]+', self.instance.google_api_keys) if k]
+                self.initial['google_api_keys'] = ''
+                self.fields['google_api_keys'].widget.attrs['placeholder'] = "Current: " + ', '.join(
+                    self.instance.mask_api_key(k) for k in extra_keys
+                )
 
     class Meta:
         model = GenerationSettings
-        fields = ['cost_per_generation', 'cost_per_edit', 'currency', 'is_tracking_enabled', 'openai_api_key', 'google_api_key']
+        fields = ['cost_per_generation', 'cost_per_edit', 'currency', 'is_tracking_enabled', 'openai_api_key', 'google_api_key', 'google_api_keys']
         widgets = {
             'cost_per_generation': forms.NumberInput(attrs={
                 'class': 'form-control',
@@ -185,6 +194,11 @@ class GenerationSettingsForm(forms.ModelForm):
             'google_api_key': forms.PasswordInput(attrs={
                 'class': 'form-control',
                 'placeholder': 'Leave empty to use environment variable'
+            }),
+            'google_api_keys': forms.Textarea(attrs={
+                'class': 'form-control',
+                'rows': 3,
+                'placeholder': 'One additional key per line'
             })
         }
         labels = {
@@ -193,7 +207,8 @@ class GenerationSettingsForm(forms.ModelForm):
             'currency': 'Currency',
             'is_tracking_enabled': 'Enable Cost Tracking',
             'openai_api_key': 'OpenAI API Key',
-            'google_api_key': 'Google Gemini API Key'
+            'google_api_key': 'Google Gemini API Key',
+            'google_api_keys': 'Additional Google Gemini API Keys'
         }
         help_texts = {
             'cost_per_generation': 'Current Gemini 2.5 Flash Image price: $0.039 per image',
@@ -201,7 +216,8 @@ class GenerationSettingsForm(forms.ModelForm):
             'currency': 'Currency for all cost calculations',
             'is_tracking_enabled': 'Turn on/off cost tracking for all projects',
             'openai_api_key': 'If set, overrides OPENAI_KEY environment variable',
-            'google_api_key': 'If set, overrides GOOGLE_API environment variable'
+            'google_api_key': 'If set, overrides GOOGLE_API environment variable',
+            'google_api_keys': 'Requests are spread across all keys; a key that hits its quota is paused automatically'
         }
 
     def clean_cost_per_generation(self):
@@ -231,6 +247,10 @@ class GenerationSettingsForm(forms.ModelForm):
             # Preserve existing key if no new value provided
             instance.google_api_key = self.instance.google_api_key if self.instance.pk else ''
 
+        if not self.cleaned_data.get('google_api_keys', '').strip():
+            # Preserve existing pooled keys if no new value provided
+            instance.google_api_keys = getattr(self, '_stored_google_api_keys', '')
+
         if commit:
             instance.save()
 
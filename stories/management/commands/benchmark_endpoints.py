@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from stories.benchmarks import default_endpoints, format_results, run_benchmark, seed_project
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the generation views against offline fake Gemini/OpenAI "
+        "stand-ins and report p50/p99 latency and throughput per endpoint. "
+        "Runs in a throwaway database and media directory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help="Requests per endpoint")
+        parser.add_argument('--concurrency', type=int, default=1, help="Parallel clients")
+        parser.add_argument('--scenes', type=int, default=10, help="Scenes in the seeded project")
+        parser.add_argument('--characters', type=int, default=2, help="Characters in the seeded project")
+        parser.add_argument('--latency', type=float, default=0.0, help="Fake upstream latency per call (s)")
+        parser.add_argument('--first-chunk-latency', type=float, default=0.0,
+                            help="Fake Gemini time-to-first-chunk (s)")
+        parser.add_argument('--error-rate', type=float, default=0.0, help="Fake upstream failure probability")
+        parser.add_argument('--image-size', type=int, default=256 * 1024, help="Fake image size in bytes")
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help="Only run the named endpoint (repeatable)")
+
+    def handle(self, *args, **options):
+        work_dir = tempfile.mkdtemp(prefix='story-bench-')
+        media_root = os.path.join(work_dir, 'media')
+        fake_upstream = {
+            'latency': options['latency'],
+            'first_chunk_latency': min(options['first_chunk_latency'], options['latency']),
+            'error_rate': options['error_rate'],
+            'image_size': options['image_size'],
+            'scene_count': options['scenes'],
+            'character_count': options['characters'],
+        }
+
+        # File-backed test DB so concurrent clients can share it
+        connection.settings_dict.setdefault('TEST', {})
+        original_test_name = connection.settings_dict['TEST'].get('NAME')
+        connection.settings_dict['TEST']['NAME'] = os.path.join(work_dir, 'bench.sqlite3')
+
+        setup_test_environment()
+        old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(
+                GEMINI_CLIENT_CLASS='stories.fakes.FakeGeminiClient',
+                STORY_LLM_CLASS='stories.fakes.FakeLLM',
+                FAKE_UPSTREAM=fake_upstream,
+                GOOGLE_API='benchmark-key',
+                GOOGLE_API_KEYS=[],
+                OPENAI_KEY='benchmark-key',
+                GEMINI_KEY_RATE_PER_MINUTE=10 ** 9,
+                GEMINI_KEY_BURST=10 ** 6,
+                MEDIA_ROOT=media_root,
+                MEDIA_GC_INTERVAL=0,
+                DEBUG=False,
+            ):
+                project = seed_project(options['scenes'], options['characters'])
+                endpoints = default_endpoints(project)
+                if options['endpoints']:
+                    endpoints = [e for e in endpoints if e[0] in options['endpoints']]
+
+                self.stdout.write(
+                    f"Fake upstream: latency={options['latency']}s error_rate={options['error_rate']} "
+                    f"image_size={options['image_size']}B; {options['requests']} requests/endpoint, "
+                    f"concurrency={options['concurrency']}"
+                )
+                results = run_benchmark(
+                    endpoints,
+                    requests=options['requests'],
+                    concurrency=options['concurrency'],
+                )
+                self.stdout.write(format_results(results))
+        finally:
+            connection.creation.destroy_test_db(old_db_name, verbosity=0)
+            teardown_test_environment()
+            if original_test_name is None:
+                connection.settings_dict['TEST'].pop('NAME', None)
+            else:
+                connection.settings_dict['TEST']['NAME'] = original_test_name
+            shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,33 @@
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from stories.benchmarks import heavy_modules, profile_url_import
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how long importing the URLconf takes in a fresh interpreter "
+        "(what every worker boot pays) and list any AI SDK it pulls in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters to measure")
+        parser.add_argument('--max-ms', type=float, default=None,
+                            help="Fail when the median import time of stories.urls exceeds this")
+
+    def handle(self, *args, **options):
+        samples = []
+        heavy = []
+        for _ in range(max(1, options['runs'])):
+            cumulative = profile_url_import()
+            samples.append(cumulative['stories.urls'] / 1000)
+            heavy = heavy_modules(cumulative)
+
+        median = statistics.median(samples)
+        self.stdout.write(f"stories.urls import: median {median:.1f} ms over {len(samples)} runs "
+                          f"(min {min(samples):.1f}, max {max(samples):.1f})")
+        if heavy:
+            raise CommandError(f"URLconf import loads AI SDK modules: {', '.join(sorted(heavy))}")
+        if options['max_ms'] is not None and median > options['max_ms']:
+            raise CommandError(f"stories.urls import took {median:.1f} ms, budget {options['max_ms']:.0f} ms")
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from stories.services.media_gc import collect_garbage, purge_expired_candidates
+
+
+class Command(BaseCommand):
+    help = "Find media files that no Scene/Character references and reclaim them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report orphaned files, do not delete anything",
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=getattr(settings, 'MEDIA_GC_MIN_AGE', 3600),
+            help="Skip files modified within this many seconds (default: MEDIA_GC_MIN_AGE)",
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help="Print every orphaned file name",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        if not dry_run:
+            purged = purge_expired_candidates()
+            if purged:
+                self.stdout.write(f"Purged {purged} scene candidates older than SCENE_CANDIDATE_RETENTION")
+        report = collect_garbage(dry_run=dry_run, min_age=options['min_age'])
+
+        if options['list'] or dry_run:
+            for name in report['files']:
+                self.stdout.write(f"  {name}")
+
+        size_mb = report['bytes'] / (1024 * 1024)
+        verb = "Would remove" if dry_run else "Removed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['count']} orphaned files ({size_mb:.2f} MB) from {settings.MEDIA_ROOT}"
+        ))
@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from stories.models import Project
+from stories.services.project_transfer import export_projects
+
+
+class Command(BaseCommand):
+    help = "Stream projects, characters and scenes out in the projects_data.json format."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', '-o',
+            default='-',
+            help="File to write; '-' for stdout (default)",
+        )
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='project_ids',
+            help="Only export this project id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        if options['project_ids']:
+            projects = projects.filter(pk__in=options['project_ids'])
+
+        if options['output'] == '-':
+            report = export_projects(sys.stdout, projects)
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as out:
+                report = export_projects(out, projects)
+
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {report['projects']} projects, {report['characters']} characters, {report['scenes']} scenes"
+        ))
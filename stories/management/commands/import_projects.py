@@ -0,0 +1,52 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from stories.services.project_transfer import import_projects
+
+
+class Command(BaseCommand):
+    help = "Stream projects from a projects_data.json file into the database in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help="projects_data.json file to read; '-' for stdin",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help="Projects inserted per transaction (default: 100)",
+        )
+        parser.add_argument(
+            '--images-dir',
+            help="Directory scene image paths are relative to (default: the input file's directory)",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = max(1, options['batch_size'])
+        try:
+            if path == '-':
+                report = import_projects(sys.stdin, batch_size, options['images_dir'])
+            else:
+                images_dir = options['images_dir'] or os.path.dirname(os.path.abspath(path))
+                with open(path, encoding='utf-8') as stream:
+                    report = import_projects(stream, batch_size, images_dir)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['projects']} projects, {report['characters']} characters, {report['scenes']} scenes"
+        ))
+        if report['missing_images']:
+            self.stdout.write(self.style.WARNING(
+                f"{report['missing_images']} scene images were not found and were left empty"
+            ))
+        if report['invalid_images']:
+            self.stdout.write(self.style.WARNING(
+                f"{report['invalid_images']} scene image paths were invalid archive entries "
+                f"(outside the media or images directory) and were left empty"
+            ))
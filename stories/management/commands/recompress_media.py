@@ -0,0 +1,45 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from stories.services.recompress import FORMATS, backfill
+
+
+class Command(BaseCommand):
+    help = "Losslessly recompress stored images (WebP or optimized PNG) and report the bytes saved."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            default='webp',
+            help="Target format: webp (default) or png",
+        )
+        parser.add_argument(
+            '--effort',
+            type=int,
+            default=6,
+            help="Encoder effort 0-6; higher is smaller and slower (default: 6)",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report what would be saved, do not rewrite anything",
+        )
+
+    def handle(self, *args, **options):
+        if options['format'] not in FORMATS:
+            raise CommandError(f"Unknown format '{options['format']}'; choose from {', '.join(FORMATS)}")
+
+        report = backfill(
+            default_storage,
+            target=options['format'],
+            effort=max(0, min(options['effort'], 6)),
+            dry_run=options['dry_run'],
+        )
+
+        saved_mb = report['bytes_saved'] / (1024 * 1024)
+        before = report['bytes_before'] or 1
+        verb = "Would recompress" if options['dry_run'] else "Recompressed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['files']} images: {saved_mb:.2f} MB saved "
+            f"({100.0 * report['bytes_saved'] / before:.1f}% of their original size)"
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stories', '0016_generationsettings_artemox_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationsettings',
+            name='google_api_keys',
+            field=models.TextField(blank=True, default='', help_text='Additional Google Gemini API keys, one per line, pooled with the primary key'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stories', '0017_generationsettings_google_api_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SceneCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(upload_to='scene_candidates/')),
+                ('thumbnail', models.ImageField(blank=True, null=True, upload_to='scene_candidates/thumbs/')),
+                ('prompt', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('scene', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidates', to='stories.scene')),
+            ],
+            options={
+                'ordering': ['-created_at', '-pk'],
+            },
+        ),
+    ]
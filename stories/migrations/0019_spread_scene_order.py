@@ -0,0 +1,39 @@
+from django.db import migrations
+
+ORDER_GAP = 1024
+
+
+def _renumber(apps, step):
+    """Renumber every project's scenes `step` apart, keeping their current sequence."""
+    Scene = apps.get_model('stories', 'Scene')
+    changed = []
+    project_id = None
+    position = 0
+    for scene in Scene.objects.order_by('project_id', 'order', 'created_at', 'pk').only('pk', 'project_id', 'order'):
+        if scene.project_id != project_id:
+            project_id = scene.project_id
+            position = 0
+        position += 1
+        if scene.order != position * step:
+            scene.order = position * step
+            changed.append(scene)
+    Scene.objects.bulk_update(changed, ['order'], batch_size=500)
+
+
+def spread_scene_order(apps, schema_editor):
+    _renumber(apps, ORDER_GAP)
+
+
+def compact_scene_order(apps, schema_editor):
+    _renumber(apps, 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stories', '0018_scenecandidate'),
+    ]
+
+    operations = [
+        migrations.RunPython(spread_scene_order, compact_scene_order),
+    ]
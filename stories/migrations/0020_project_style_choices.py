@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stories', '0019_spread_scene_order'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='color_scheme',
+            field=models.CharField(choices=[('colored', 'colored'), ('black-and-white', 'black-and-white'), ('grayscale', 'grayscale'), ('sepia', 'sepia'), ('monochrome', 'monochrome'), ('vibrant', 'vibrant'), ('pastel', 'pastel')], default='colored', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='style',
+            field=models.CharField(choices=[('Ghibli-style', 'Ghibli-style'), ('line-art-style', 'line-art-style'), ('pixel-art-style', 'pixel-art-style'), ('water-color-style', 'water-color-style'), ('Fairy-Tale-style', 'Fairy-Tale-style'), ('Game-RPG-Style', 'Game-RPG-Style'), ('Game-Zelda-Style', 'Game-Zelda-Style'), ('Manga-style', 'Manga-style'), ('Pixar-3d-style', 'Pixar-3d-style'), ('Anime-style', 'Anime-style'), ('Watercolor-style', 'Watercolor-style'), ('Cinematic-style', 'Cinematic-style'), ('wimpy-kid-style', 'wimpy-kid-style')], default='Ghibli-style', max_length=100),
+        ),
+    ]
@@ -1,14 +1,32 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Max, Min, Q, Value
+from django.db.models.functions import Replace
+from django.utils import timezone
 from django.contrib.auth.models import User
 import json
 import os
+import re
+from datetime import timedelta
 from decimal import Decimal
 
 
 class Project(models.Model):
+    # Options offered by the project forms
+    STYLES = [
+        "Ghibli-style", "line-art-style", "pixel-art-style",
+        "water-color-style", "Fairy-Tale-style", "Game-RPG-Style",
+        "Game-Zelda-Style", "Manga-style", "Pixar-3d-style",
+        "Anime-style", "Watercolor-style", "Cinematic-style",
+        "wimpy-kid-style"
+    ]
+    COLOR_SCHEMES = [
+        "colored", "black-and-white", "grayscale",
+        "sepia", "monochrome", "vibrant", "pastel"
+    ]
+
     name = models.CharField(max_length=200)
-    style = models.CharField(max_length=100, default='Ghibli-style')
-    color_scheme = models.CharField(max_length=50, default='colored')
+    style = models.CharField(max_length=100, default='Ghibli-style', choices=[(s, s) for s in STYLES])
+    color_scheme = models.CharField(max_length=50, default='colored', choices=[(c, c) for c in COLOR_SCHEMES])
     total_generation_cost = models.DecimalField(
         max_digits=10,
         decimal_places=4,
@@ -28,6 +46,70 @@ class Project(models.Model):
     class Meta:
         ordering = ['-updated_at']
 
+    def clone(self, name=None, style=None, color_scheme=None):
+        """Fork this project with its characters, scenes and scene-character links.
+
+        Rows are copied with one bulk_create per table. Image fields copy the
+        stored file name only: with content-addressed storage both projects
+        share the same file on disk, so no image bytes are duplicated.
+        Generation cost history is not copied.
+
+        Raises ValidationError when `style` or `color_scheme` is not one of
+        the offered choices.
+        """
+        fork = Project(
+            name=name or f"{self.name} (copy)",
+            style=style or self.style,
+            color_scheme=color_scheme or self.color_scheme,
+        )
+        # Only the overrides are checked, so projects with a legacy style can still be cloned
+        fork.full_clean(exclude=[
+            field for field, value in (('style', style), ('color_scheme', color_scheme)) if not value
+        ])
+
+        with transaction.atomic():
+            fork.save()
+
+            characters = list(self.characters.order_by('pk'))
+            new_characters = Character.objects.bulk_create([
+                Character(
+                    project=fork,
+                    name=c.name,
+                    description=c.description,
+                    generation_prompt=c.generation_prompt,
+                    generated_image=c.generated_image.name or None,
+                    reference_image=c.reference_image.name or None,
+                )
+                for c in characters
+            ])
+            character_map = {old.pk: new.pk for old, new in zip(characters, new_characters)}
+
+            scenes = list(self.scenes.order_by('pk'))
+            new_scenes = Scene.objects.bulk_create([
+                Scene(
+                    project=fork,
+                    name=s.name,
+                    prompt=s.prompt,
+                    order=s.order,
+                    approved_image=s.approved_image.name or None,
+                    final_prompt=s.final_prompt,
+                    use_custom_prompt=s.use_custom_prompt,
+                    edit_prompt=s.edit_prompt,
+                )
+                for s in scenes
+            ])
+            scene_map = {old.pk: new.pk for old, new in zip(scenes, new_scenes)}
+
+            SceneCharacter = Scene.characters.through
+            links = SceneCharacter.objects.filter(scene__project=self).values_list('scene_id', 'character_id')
+            SceneCharacter.objects.bulk_create([
+                SceneCharacter(scene_id=scene_map[scene_id], character_id=character_map[character_id])
+                for scene_id, character_id in links
+                if scene_id in scene_map and character_id in character_map
+            ])
+
+        return fork
+
 
 class Character(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='characters')
@@ -95,15 +177,117 @@ class Scene(models.Model):
     class Meta:
         ordering = ['order', 'created_at']
 
+    # Scenes are spaced ORDER_GAP apart so a scene can be inserted between two
+    # others by taking the midpoint, without renumbering the rest of the book
+    ORDER_GAP = 1024
+
     def save(self, *args, **kwargs):
-        if not self.order:
-            last_scene = Scene.objects.filter(project=self.project).order_by('-order').first()
-            if last_scene:
-                self.order = last_scene.order + 1
-            else:
-                self.order = 1
+        if not self.order and self._state.adding:
+            last_order = Scene.objects.filter(project_id=self.project_id).aggregate(last=Max('order'))['last']
+            self.order = (last_order or 0) + self.ORDER_GAP
         super().save(*args, **kwargs)
 
+    @classmethod
+    def reorder(cls, project, scene_ids):
+        """Apply a full scene ordering to a project with one bulk_update.
+
+        `scene_ids` must list every scene of the project exactly once. Scenes
+        are renumbered ORDER_GAP apart; only rows whose order changes are
+        written, as CASE updates inside a single transaction. Returns the
+        number of scenes updated.
+        """
+        scene_ids = [int(pk) for pk in scene_ids]
+        with transaction.atomic():
+            scenes = {s.pk: s for s in cls.objects.filter(project=project).only('pk', 'order')}
+            if len(scene_ids) != len(set(scene_ids)) or set(scene_ids) != set(scenes):
+                raise ValueError("scene_ids must list every scene of the project exactly once")
+
+            changed = []
+            for position, pk in enumerate(scene_ids, start=1):
+                scene = scenes[pk]
+                order = position * cls.ORDER_GAP
+                if scene.order != order:
+                    scene.order = order
+                    changed.append(scene)
+            if changed:
+                cls.objects.bulk_update(changed, ['order'])
+        return len(changed)
+
+    @classmethod
+    def order_after(cls, project, after=None):
+        """Return an order value that places a new scene right after `after`.
+
+        `after=None` means the start of the project. Takes the midpoint of the
+        gap to the next scene; only when that gap is used up is the project
+        renumbered (one bulk_update) to open space again.
+        """
+        scenes = cls.objects.filter(project=project)
+        low = after.order if after else 0
+        high = scenes.filter(order__gt=low).aggregate(next=Min('order'))['next']
+        if high is None:
+            return low + cls.ORDER_GAP
+        if high - low > 1:
+            return (low + high) // 2
+
+        ids = list(scenes.values_list('pk', flat=True))
+        cls.reorder(project, ids)
+        if after is None:
+            return cls.ORDER_GAP // 2
+        after.refresh_from_db(fields=['order'])
+        return after.order + cls.ORDER_GAP // 2
+
+    @classmethod
+    def rename_character_placeholder(cls, project, old_name, new_name):
+        """Rewrite {old_name} to {new_name} in every scene prompt of a project.
+
+        Runs as a single UPDATE with SQL REPLACE over both prompt fields instead
+        of loading and saving each scene. Returns the number of scenes touched.
+        """
+        old_placeholder = f"{{{old_name}}}"
+        new_placeholder = f"{{{new_name}}}"
+        return cls.objects.filter(project=project).filter(
+            Q(prompt__contains=old_placeholder) | Q(final_prompt__contains=old_placeholder)
+        ).update(
+            prompt=Replace('prompt', Value(old_placeholder), Value(new_placeholder)),
+            final_prompt=Replace('final_prompt', Value(old_placeholder), Value(new_placeholder)),
+            updated_at=timezone.now(),
+        )
+
+
+class SceneCandidate(models.Model):
+    """One of several images generated in parallel for a scene, pending a pick."""
+    scene = models.ForeignKey(Scene, on_delete=models.CASCADE, related_name='candidates')
+    image = models.ImageField(upload_to='scene_candidates/')
+    thumbnail = models.ImageField(upload_to='scene_candidates/thumbs/', null=True, blank=True)
+    prompt = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-pk']
+
+    def __str__(self):
+        return f"Candidate {self.pk} for {self.scene.name}"
+
+    def promote(self):
+        """Make this candidate the scene's approved image (the stored file is shared, not copied)."""
+        scene = self.scene
+        scene.approved_image = self.image.name
+        scene.save(update_fields=['approved_image', 'updated_at'])
+        return scene
+
+    @classmethod
+    def purge_expired(cls, retention):
+        """Delete candidates older than `retention` seconds; files still used elsewhere are kept."""
+        from stories.services.media_gc import delete_unshared_file
+
+        cutoff = timezone.now() - timedelta(seconds=retention)
+        expired = list(cls.objects.filter(created_at__lt=cutoff))
+        for candidate in expired:
+            candidate.delete()
+            delete_unshared_file(candidate.image, candidate)
+            delete_unshared_file(candidate.thumbnail, candidate)
+        return len(expired)
+
 
 class PromptTemplate(models.Model):
     TEMPLATE_TYPES = [
@@ -249,6 +433,11 @@ class GenerationSettings(models.Model):
         default='',
         help_text="Google Gemini API key (overrides environment variable if set)"
     )
+    google_api_keys = models.TextField(
+        blank=True,
+        default='',
+        help_text="Additional Google Gemini API keys, one per line, pooled with the primary key"
+    )
     artemox_api_key = models.CharField(
         max_length=255,
         blank=True,
@@ -299,6 +488,14 @@ class GenerationSettings(models.Model):
         from django.conf import settings as django_settings
         return django_settings.GOOGLE_API or ''
 
+    def get_google_api_keys(self):
+        """Get all Google API keys for the key pool (primary key first, duplicates removed)"""
+        keys = [self.get_google_api_key()]
+        keys += [line.strip() for line in re.split(r'[\s,;]+', self.google_api_keys or '')]
+        from django.conf import settings as django_settings
+        keys += list(getattr(django_settings, 'GOOGLE_API_KEYS', []))
+        return [key for key in dict.fromkeys(keys) if key]
+
     def mask_api_key(self, key):
         """Mask API key showing only last 4 characters"""
         if not key:
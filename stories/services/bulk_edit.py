@@ -0,0 +1,78 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+
+from .metrics import timed
+
+
+logger = logging.getLogger(__name__)
+
+
+def bulk_edit_scenes(generator, project, scenes, edit_prompt, max_workers=None):
+    """
+    Apply one edit instruction to many scenes on a bounded worker pool.
+
+    Upstream edits run concurrently; saving each image, recording its
+    `edit_prompt` and tracking its cost happen on the calling thread as
+    results come back, so one failed scene never affects the others.
+
+    Returns:
+        List of per-scene dicts with scene_id, name, status ('success',
+        'error' or 'skipped'), message, image_url and cost
+    """
+    max_workers = max_workers or getattr(settings, 'BULK_EDIT_MAX_WORKERS', 4)
+    results = {}
+    pending = []
+
+    for scene in scenes:
+        if not scene.approved_image:
+            results[scene.pk] = {
+                'scene_id': scene.pk,
+                'name': scene.name,
+                'status': 'skipped',
+                'message': 'Scene has no image to edit',
+                'image_url': None,
+                'cost': None,
+            }
+        else:
+            pending.append(scene)
+
+    def edit_one(scene):
+        filename_base = f"project_{project.pk}_scene_{scene.pk}_edited"
+        return generator.edit_with_nano_banana(scene.approved_image.path, edit_prompt, filename_base)
+
+    if pending:
+        with timed('bulk_edit', scenes=len(pending)):
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+                futures = {pool.submit(edit_one, scene): scene for scene in pending}
+                for future in as_completed(futures):
+                    scene = futures[future]
+                    results[scene.pk] = _apply_result(generator, project, scene, edit_prompt, future)
+
+    return [results[scene.pk] for scene in scenes]
+
+
+def _apply_result(generator, project, scene, edit_prompt, future):
+    result = {'scene_id': scene.pk, 'name': scene.name, 'image_url': None, 'cost': None}
+    try:
+        image_file = future.result()
+        with timed('file_save', operation='bulk_edit'):
+            scene.approved_image = image_file
+            scene.edit_prompt = edit_prompt
+            scene.save()
+        cost = generator._track_generation_cost(
+            project=project, scene=scene, generation_type='edit', prompt=edit_prompt
+        )
+    except Exception as e:
+        logger.warning("Bulk edit failed for scene %s: %s", scene.pk, e)
+        result.update(status='error', message=str(e))
+        return result
+
+    result.update(
+        status='success',
+        message='Image edited successfully!',
+        image_url=scene.approved_image.url,
+        cost=str(cost) if cost is not None else None,
+    )
+    return result
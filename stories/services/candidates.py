@@ -0,0 +1,82 @@
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .metrics import timed
+
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (320, 320)
+
+
+def make_thumbnail(image_file, size=THUMBNAIL_SIZE):
+    """Return a JPEG ContentFile thumbnail of a generated image, or None if it can't be decoded."""
+    from PIL import Image
+
+    try:
+        image_file.seek(0)
+        with Image.open(image_file) as image:
+            image.thumbnail(size)
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', quality=85, optimize=True)
+    except Exception as e:
+        logger.warning("Could not create thumbnail for %s: %s", image_file.name, e)
+        return None
+    finally:
+        image_file.seek(0)
+
+    base = os.path.splitext(os.path.basename(image_file.name))[0]
+    return ContentFile(buffer.getvalue(), name=f"{base}_thumb.jpg")
+
+
+def generate_scene_candidates(generator, scene, prompt, reference_images=None, count=3):
+    """
+    Generate `count` candidate images for a scene concurrently.
+
+    Upstream calls run on a thread pool; cost tracking and all database writes
+    happen on the calling thread once the images are back.
+
+    Returns:
+        Tuple (candidates, errors) - saved SceneCandidate rows and error messages
+    """
+    from stories.models import SceneCandidate
+
+    project = scene.project
+    count = max(1, min(count, getattr(settings, 'SCENE_CANDIDATE_MAX', 5)))
+    filename_base = f"project_{project.pk}_scene_{scene.pk}_candidate"
+
+    def generate_one(index):
+        return generator.generate_with_nano_banana(
+            prompt, f"{filename_base}_{index + 1}", reference_images=reference_images
+        )
+
+    with timed('candidate_fanout', count=count):
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            futures = [pool.submit(generate_one, i) for i in range(count)]
+
+    candidates = []
+    errors = []
+    for future in futures:
+        try:
+            image_file = future.result()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+
+        generator._track_generation_cost(project=project, scene=scene, generation_type='new', prompt=prompt)
+        with timed('file_save', operation='candidate'):
+            candidates.append(SceneCandidate.objects.create(
+                scene=scene,
+                image=image_file,
+                thumbnail=make_thumbnail(image_file),
+                prompt=prompt,
+            ))
+
+    return candidates, errors
@@ -1,3 +1,4 @@
+import logging
 import time
 import mimetypes
 import re
@@ -6,15 +7,24 @@ from google.genai import types
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.cache import cache
+from django.utils.module_loading import import_string
 from decimal import Decimal
 
+from .key_pool import get_key_pool, is_quota_error
+from .metrics import inc, record_stage, record_tokens, timed
+
+
+logger = logging.getLogger(__name__)
+
 
 class ImageGenerator:
     def __init__(self):
         # Get API key from GenerationSettings first, fallback to ENV
         from stories.models import GenerationSettings
-        gen_settings = GenerationSettings.get_settings()
-        self.google_api_key = gen_settings.get_google_api_key()
+        with timed('settings_load', operation='image'):
+            gen_settings = GenerationSettings.get_settings()
+            self.google_api_keys = gen_settings.get_google_api_keys()
+        self.google_api_key = self.google_api_keys[0] if self.google_api_keys else ''
 
         if not self.google_api_key:
             raise ValueError(
@@ -22,6 +32,26 @@ class ImageGenerator:
                 "Без ключа генерация изображений невозможна."
             )
 
+        # Requests are spread over all configured keys by a shared, quota-aware pool
+        self.key_pool = get_key_pool(self.google_api_keys)
+
+    def _get_client(self, api_key):
+        """Create a Gemini client for the leased key.
+
+        GEMINI_CLIENT_CLASS (dotted path) swaps in another client class, e.g.
+        stories.fakes.FakeGeminiClient for offline benchmarking.
+        """
+        client_class = getattr(settings, 'GEMINI_CLIENT_CLASS', None)
+        try:
+            if client_class:
+                return import_string(client_class)(api_key=api_key)
+            return genai.Client(api_key=api_key)
+        except Exception as e:
+            raise ValueError(
+                f"Ошибка инициализации Google API клиента: {str(e)}. "
+                f"Проверьте правильность API ключа."
+            )
+
     def get_prompt_template(self, template_type: str, **kwargs) -> str:
         """Get prompt template from database with caching.
 
@@ -52,9 +82,9 @@ class ImageGenerator:
                 template_text = template.template_text
                 # Cache for 1 hour
                 cache.set(cache_key, template_text, 3600)
-                print(f"Loaded template '{template_type}' from database: {template_text}")
+                logger.debug("Loaded template '%s' from database (%s chars)", template_type, len(template_text))
             except PromptTemplate.DoesNotExist:
-                print(f"WARNING: Template '{template_type}' not found in database")
+                logger.warning("Template '%s' not found in database", template_type)
                 # Return empty string instead of hardcoded fallback
                 return ""
 
@@ -63,7 +93,7 @@ class ImageGenerator:
             try:
                 return template_text.format(**kwargs)
             except KeyError as e:
-                print(f"WARNING: Missing variable {e} in template '{template_type}'")
+                logger.warning("Missing variable %s in template '%s'", e, template_type)
                 return template_text
 
         return template_text or ""
@@ -112,6 +142,64 @@ class ImageGenerator:
         """
         return self.generate_with_nano_banana(prompt, filename_base, max_retries, reference_images, project, scene, character)
 
+    def _stream_image(self, client, model, contents, config, operation):
+        """Consume a Gemini content stream, recording upstream timings.
+
+        Returns:
+            Tuple (image_data, mime_type, text_output)
+        """
+        image_data = None
+        mime_type = None
+        text_output = []
+        usage = None
+
+        start = time.perf_counter()
+        first_chunk = True
+        for chunk in client.models.generate_content_stream(
+            model=model,
+            contents=contents,
+            config=config,
+        ):
+            if first_chunk:
+                record_stage('upstream_first_chunk', time.perf_counter() - start,
+                             provider='gemini', operation=operation)
+                first_chunk = False
+
+            usage = getattr(chunk, 'usage_metadata', None) or usage
+
+            # Check if chunk has valid content
+            if (
+                chunk.candidates is None
+                or len(chunk.candidates) == 0
+                or chunk.candidates[0].content is None
+                or chunk.candidates[0].content.parts is None
+            ):
+                continue
+
+            # Process each part in the chunk
+            for part in chunk.candidates[0].content.parts:
+                # Handle image data
+                if hasattr(part, 'inline_data') and part.inline_data and part.inline_data.data:
+                    logger.debug("Found image data, MIME type: %s", part.inline_data.mime_type)
+                    image_data = part.inline_data.data
+                    mime_type = part.inline_data.mime_type
+
+                # Handle text data
+                elif hasattr(part, 'text') and part.text:
+                    text_output.append(part.text)
+
+        record_stage('upstream_total', time.perf_counter() - start, provider='gemini', operation=operation)
+        inc('story_upstream_bytes_received_total',
+            len(image_data or b'') + sum(len(t.encode('utf-8')) for t in text_output),
+            provider='gemini')
+        if usage is not None:
+            record_tokens(
+                'gemini',
+                getattr(usage, 'prompt_token_count', None),
+                getattr(usage, 'candidates_token_count', None),
+            )
+        return image_data, mime_type, text_output
+
     def generate_with_nano_banana(self, prompt, filename_base, max_retries=3, reference_images=None, project=None, scene=None, character=None):
         """
         Generate image using Google's Gemini model (Nano Banana)
@@ -129,21 +217,28 @@ class ImageGenerator:
                 "Google API ключ не настроен. Добавьте GOOGLE_API в настройках проекта или в Replit Secrets."
             )
 
-        try:
-            client = genai.Client(api_key=self.google_api_key)
-        except Exception as e:
-            raise ValueError(
-                f"Ошибка инициализации Google API клиента: {str(e)}. "
-                f"Проверьте правильность API ключа."
-            )
-
         model = "gemini-2.5-flash-image-preview"
         retry_delay = 2  # seconds
 
+        # Allow every pooled key at least one attempt before giving up
+        max_retries = max(max_retries, len(self.key_pool))
+        exhausted_keys = set()
+
         for attempt in range(max_retries):
+            # Lease the least-loaded key that still has quota
+            lease = self.key_pool.acquire(exclude=exhausted_keys)
+            if attempt:
+                inc('story_upstream_retries_total', provider='gemini', operation='generate')
+            try:
+                client = self._get_client(lease.key)
+            except ValueError:
+                lease.release()
+                raise
+
             try:
                 # Build content parts
                 parts = [types.Part.from_text(text=prompt)]
+                bytes_sent = len(prompt.encode('utf-8'))
 
                 # Add reference images if provided
                 if reference_images:
@@ -152,6 +247,7 @@ class ImageGenerator:
                             # Read the image file
                             with open(ref_image_path, 'rb') as f:
                                 image_data = f.read()
+                            bytes_sent += len(image_data)
 
                             # Add image as Part
                             parts.append(
@@ -161,7 +257,7 @@ class ImageGenerator:
                                 )
                             )
                         except Exception as e:
-                            print(f"Warning: Could not load reference image {ref_image_path}: {e}")
+                            logger.warning("Could not load reference image %s: %s", ref_image_path, e)
 
                 # Create contents with proper structure
                 contents = [
@@ -177,36 +273,12 @@ class ImageGenerator:
                     temperature=1.0,
                 )
 
-                image_data = None
-                mime_type = None
-                text_output = []
+                inc('story_upstream_bytes_sent_total', bytes_sent, provider='gemini')
 
                 # Use streaming
-                for chunk in client.models.generate_content_stream(
-                    model=model,
-                    contents=contents,
-                    config=generate_content_config,
-                ):
-                    # Check if chunk has valid content
-                    if (
-                        chunk.candidates is None
-                        or len(chunk.candidates) == 0
-                        or chunk.candidates[0].content is None
-                        or chunk.candidates[0].content.parts is None
-                    ):
-                        continue
-
-                    # Process each part in the chunk
-                    for part in chunk.candidates[0].content.parts:
-                        # Handle image data
-                        if hasattr(part, 'inline_data') and part.inline_data and part.inline_data.data:
-                            print(f"Found image data, MIME type: {part.inline_data.mime_type}")
-                            image_data = part.inline_data.data
-                            mime_type = part.inline_data.mime_type
-
-                        # Handle text data
-                        elif hasattr(part, 'text') and part.text:
-                            text_output.append(part.text)
+                image_data, mime_type, text_output = self._stream_image(
+                    client, model, contents, generate_content_config, operation='generate'
+                )
 
                 if image_data:
                     # Determine file extension from mime type
@@ -224,6 +296,8 @@ class ImageGenerator:
                             prompt=prompt
                         )
 
+                    lease.succeeded()
+
                     # Create a Django ContentFile from the image data
                     filename = f"{filename_base}{file_extension}"
                     return ContentFile(image_data, name=filename)
@@ -232,12 +306,25 @@ class ImageGenerator:
 
             except Exception as e:
                 error_msg = str(e)
-                print(f"Attempt {attempt + 1}/{max_retries} failed: {error_msg}")
+                logger.warning("Attempt %s/%s failed: %s", attempt + 1, max_retries, error_msg)
+                inc('story_upstream_errors_total', provider='gemini', operation='generate')
+
+                # Quota errors are per key: back off from this key and try another one
+                if is_quota_error(error_msg):
+                    lease.quota_exhausted()
+                    exhausted_keys.add(lease.key)
+                    if attempt < max_retries - 1 and len(exhausted_keys) < len(self.key_pool):
+                        logger.info("Switching to another Google API key...")
+                        continue
+                    raise Exception(
+                        f"Превышен лимит API запросов. Проверьте квоту ваших Google API ключей. "
+                        f"Детали ошибки: {error_msg}"
+                    )
 
                 # Check if it's a 500 internal error
                 if "500" in error_msg or "INTERNAL" in error_msg:
                     if attempt < max_retries - 1:
-                        print(f"Retrying in {retry_delay} seconds...")
+                        logger.info("Retrying in %s seconds...", retry_delay)
                         time.sleep(retry_delay)
                         retry_delay *= 2  # Exponential backoff
                         continue
@@ -264,6 +351,8 @@ class ImageGenerator:
                             f"Не удалось сгенерировать изображение после {max_retries} попыток. "
                             f"Детали ошибки: {error_msg}"
                         )
+            finally:
+                lease.release()
 
         raise Exception("Image generation failed")
 
@@ -305,18 +394,24 @@ class ImageGenerator:
                 "Google API ключ не настроен. Добавьте GOOGLE_API в настройках проекта или в Replit Secrets."
             )
 
-        try:
-            client = genai.Client(api_key=self.google_api_key)
-        except Exception as e:
-            raise ValueError(
-                f"Ошибка инициализации Google API клиента: {str(e)}. "
-                f"Проверьте правильность API ключа."
-            )
-
         model = "gemini-2.5-flash-image-preview"
         retry_delay = 2
 
+        # Allow every pooled key at least one attempt before giving up
+        max_retries = max(max_retries, len(self.key_pool))
+        exhausted_keys = set()
+
         for attempt in range(max_retries):
+            # Lease the least-loaded key that still has quota
+            lease = self.key_pool.acquire(exclude=exhausted_keys)
+            if attempt:
+                inc('story_upstream_retries_total', provider='gemini', operation='edit')
+            try:
+                client = self._get_client(lease.key)
+            except ValueError:
+                lease.release()
+                raise
+
             try:
                 # Read the current image
                 with open(current_image_path, 'rb') as f:
@@ -345,28 +440,13 @@ class ImageGenerator:
                     temperature=0.8,  # Slightly lower for editing to maintain consistency
                 )
 
-                # Generate edited image
-                image_data = None
-                mime_type = None
-
-                for chunk in client.models.generate_content_stream(
-                    model=model,
-                    contents=contents,
-                    config=generate_content_config,
-                ):
-                    if (
-                        chunk.candidates is None
-                        or len(chunk.candidates) == 0
-                        or chunk.candidates[0].content is None
-                        or chunk.candidates[0].content.parts is None
-                    ):
-                        continue
+                inc('story_upstream_bytes_sent_total',
+                    len(current_image_data) + len(edit_prompt.encode('utf-8')), provider='gemini')
 
-                    for part in chunk.candidates[0].content.parts:
-                        if hasattr(part, 'inline_data') and part.inline_data and part.inline_data.data:
-                            print(f"Found edited image, MIME type: {part.inline_data.mime_type}")
-                            image_data = part.inline_data.data
-                            mime_type = part.inline_data.mime_type
+                # Generate edited image
+                image_data, mime_type, _ = self._stream_image(
+                    client, model, contents, generate_content_config, operation='edit'
+                )
 
                 if image_data:
                     # Track cost if project is provided
@@ -381,6 +461,7 @@ class ImageGenerator:
 
                     # Determine file extension
                     file_extension = mimetypes.guess_extension(mime_type) or ".png"
+                    lease.succeeded()
                     filename = f"{filename_base}_edited{file_extension}"
                     return ContentFile(image_data, name=filename)
                 else:
@@ -388,10 +469,23 @@ class ImageGenerator:
 
             except Exception as e:
                 error_msg = str(e)
-                print(f"Edit attempt {attempt + 1}/{max_retries} failed: {error_msg}")
+                logger.warning("Edit attempt %s/%s failed: %s", attempt + 1, max_retries, error_msg)
+                inc('story_upstream_errors_total', provider='gemini', operation='edit')
+
+                # Quota errors are per key: back off from this key and try another one
+                if is_quota_error(error_msg):
+                    lease.quota_exhausted()
+                    exhausted_keys.add(lease.key)
+                    if attempt < max_retries - 1 and len(exhausted_keys) < len(self.key_pool):
+                        logger.info("Switching to another Google API key...")
+                        continue
+                    raise Exception(
+                        f"Превышен лимит API запросов. Проверьте квоту ваших Google API ключей. "
+                        f"Детали ошибки: {error_msg}"
+                    )
 
                 if attempt < max_retries - 1 and ("500" in error_msg or "INTERNAL" in error_msg):
-                    print(f"Retrying in {retry_delay} seconds...")
+                    logger.info("Retrying in %s seconds...", retry_delay)
                     time.sleep(retry_delay)
                     retry_delay *= 2
                     continue
@@ -412,11 +506,17 @@ class ImageGenerator:
                             f"Не удалось отредактировать изображение после {max_retries} попыток. "
                             f"Детали ошибки: {error_msg}"
                         )
+            finally:
+                lease.release()
 
         raise Exception("Image editing failed")
 
     def _track_generation_cost(self, project, scene=None, character=None, generation_type='new', prompt=''):
-        """Track the cost of an image generation."""
+        """Track the cost of an image generation; returns the recorded cost or None."""
+        with timed('cost_write'):
+            return self._write_generation_cost(project, scene, character, generation_type, prompt)
+
+    def _write_generation_cost(self, project, scene, character, generation_type, prompt):
         from stories.models import GenerationSettings, GenerationCost
 
         # Get current settings
@@ -424,7 +524,7 @@ class ImageGenerator:
 
         # Only track if tracking is enabled
         if not settings.is_tracking_enabled:
-            return
+            return None
 
         # Determine cost based on type
         if generation_type == 'edit':
@@ -446,4 +546,6 @@ class ImageGenerator:
         # Update project totals
         project.generation_count += 1
         project.total_generation_cost += cost
-        project.save(update_fields=['generation_count', 'total_generation_cost'])
\ No newline at end of file
+        project.save(update_fields=['generation_count', 'total_generation_cost'])
+
+        return cost
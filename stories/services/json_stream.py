@@ -0,0 +1,133 @@
+import json
+import re
+
+
+class StreamingArrayParser:
+    """
+    Incrementally extract the elements of one JSON array from a text stream.
+
+    Feed it completion chunks as they arrive; every call returns the array
+    elements that became complete, already decoded. Only the array under
+    `key` (e.g. the "scenes" of {"scenes": [...]}) is parsed, so leading chatter
+    or a missing opening brace in the completion does not matter.
+
+        parser = StreamingArrayParser('scenes')
+        for chunk in stream:
+            for scene in parser.feed(chunk):
+                ...
+    """
+
+    opener = '['
+    # A top-level string is a whole element in an array, but only the name
+    # half of a member in an object
+    string_is_item = True
+
+    def __init__(self, key):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*%s' % (re.escape(key), re.escape(self.opener)))
+        self._buffer = ''
+        self._pos = 0
+        self._in_array = False
+        self.finished = False
+
+        # State of the element currently being scanned
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        if self.finished or not chunk:
+            return []
+        self._buffer += chunk
+
+        if not self._in_array:
+            match = self._key_pattern.search(self._buffer)
+            if not match:
+                return []
+            self._in_array = True
+            self._pos = match.end()
+
+        items = []
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 0 and self.string_is_item:
+                        items.append(self._complete(pos + 1))
+            elif char == '"':
+                if self._start is None:
+                    self._start = pos
+                self._in_string = True
+            elif char in '[{':
+                if self._start is None:
+                    self._start = pos
+                self._depth += 1
+            elif char in ']}':
+                if self._depth == 0:
+                    # End of the array itself
+                    if self._start is not None:
+                        items.append(self._complete(pos))
+                    self.finished = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    items.append(self._complete(pos + 1))
+            elif char == ',' and self._depth == 0:
+                if self._start is not None:
+                    items.append(self._complete(pos))
+            elif not char.isspace() and self._start is None:
+                # Bare scalar (number, true, false, null)
+                self._start = pos
+            pos += 1
+
+        # Drop consumed text so long streams don't grow the buffer
+        keep_from = self._start if self._start is not None else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._start is not None:
+            self._start = 0
+        return [item for item in items if item is not _SKIP]
+
+    def _complete(self, end):
+        raw = self._buffer[self._start:end].strip() if self._start is not None else ''
+        self._start = None
+        if not raw:
+            return _SKIP
+        try:
+            return self._decode(raw)
+        except ValueError:
+            return _SKIP
+
+    def _decode(self, raw):
+        return json.loads(raw)
+
+
+class StreamingObjectParser(StreamingArrayParser):
+    """
+    Incrementally extract the members of one JSON object from a text stream.
+
+    Same contract as StreamingArrayParser, but `feed` returns (name, value)
+    pairs for the object under `key`, e.g. each project of
+    {"projects": {"name": {...}, ...}}. Only one member is held in memory at
+    a time, so arbitrarily large documents can be read in chunks.
+    """
+
+    opener = '{'
+    string_is_item = False
+
+    def _decode(self, raw):
+        member = json.loads('{%s}' % raw)
+        if len(member) != 1:
+            raise ValueError("expected a single object member")
+        return next(iter(member.items()))
+
+
+_SKIP = object()
@@ -0,0 +1,266 @@
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class KeyPoolExhausted(Exception):
+    """Raised when no API key becomes available before the wait timeout."""
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `capacity` stored."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def available(self, now):
+        self._refill(now)
+        return self.tokens >= 1
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def wait_time(self, now):
+        """Seconds until one token is available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        if self.rate <= 0:
+            return float('inf')
+        return (1 - self.tokens) / self.rate
+
+
+class KeyState:
+    """Runtime state of a single API key in the pool."""
+
+    def __init__(self, key, rate, capacity):
+        self.key = key
+        # No bucket when rate limiting is off; only quota cooldowns apply then
+        self.bucket = TokenBucket(rate, capacity) if rate > 0 else None
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.quota_strikes = 0
+
+    def is_cooling_down(self, now):
+        return now < self.cooldown_until
+
+
+class KeyLease:
+    """Context manager handed out by `GeminiKeyPool.acquire`."""
+
+    def __init__(self, pool, state):
+        self.pool = pool
+        self.state = state
+        self.key = state.key
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.pool._release(self.state)
+
+    def quota_exhausted(self):
+        """Mark the leased key as out of quota so the pool backs off from it."""
+        self.pool.report_quota_exhausted(self.key)
+
+    def succeeded(self):
+        self.pool.report_success(self.key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class GeminiKeyPool:
+    """
+    Schedules Gemini requests over several API keys.
+
+    Each key gets an in-flight counter and, when GEMINI_KEY_RATE_PER_MINUTE is
+    set, its own token bucket. `acquire` hands out the least-loaded key that
+    has a token and is not backing off after a quota error, waiting when every
+    key is busy. Quota cooldowns are also
+    published to the shared cache so other worker processes back off too.
+    """
+
+    def __init__(self, keys, rate_per_minute=None, burst=None, cooldown=None, max_cooldown=None):
+        keys = [k for k in dict.fromkeys(keys) if k]
+        if not keys:
+            raise ValueError("GeminiKeyPool requires at least one API key")
+
+        rate_per_minute = rate_per_minute if rate_per_minute is not None else getattr(settings, 'GEMINI_KEY_RATE_PER_MINUTE', 0)
+        burst = burst if burst is not None else getattr(settings, 'GEMINI_KEY_BURST', 2)
+        self.cooldown = cooldown if cooldown is not None else getattr(settings, 'GEMINI_KEY_COOLDOWN_SECONDS', 60)
+        self.max_cooldown = max_cooldown if max_cooldown is not None else getattr(settings, 'GEMINI_KEY_MAX_COOLDOWN_SECONDS', 900)
+
+        self._states = {
+            key: KeyState(key, rate_per_minute / 60.0, max(1, burst))
+            for key in keys
+        }
+        self._order = list(self._states)
+        self._cooldown_keys = {_cooldown_cache_key(key): key for key in keys}
+        self._cond = threading.Condition()
+
+    @property
+    def keys(self):
+        return list(self._order)
+
+    def __len__(self):
+        return len(self._order)
+
+    def _pick(self, now, exclude):
+        """Return the least-loaded ready key state, or None."""
+        best = None
+        for key in self._order:
+            if key in exclude:
+                continue
+            state = self._states[key]
+            if state.is_cooling_down(now) or (state.bucket and not state.bucket.available(now)):
+                continue
+            if best is None or state.in_flight < best.in_flight:
+                best = state
+        return best
+
+    def _next_ready_in(self, now, exclude):
+        waits = []
+        for key in self._order:
+            if key in exclude:
+                continue
+            state = self._states[key]
+            ready_at = max(state.cooldown_until - now, state.bucket.wait_time(now) if state.bucket else 0.0)
+            waits.append(max(ready_at, 0.0))
+        return min(waits) if waits else None
+
+    def acquire(self, timeout=None, exclude=()):
+        """
+        Lease the least-loaded available key.
+
+        Args:
+            timeout: Max seconds to wait for a key (default GEMINI_KEY_WAIT_TIMEOUT)
+            exclude: Keys that must not be handed out (e.g. ones that just failed)
+
+        Returns:
+            KeyLease usable as a context manager
+        """
+        if timeout is None:
+            timeout = getattr(settings, 'GEMINI_KEY_WAIT_TIMEOUT', 30)
+        exclude = set(exclude)
+        if len(exclude) >= len(self._order):
+            exclude = set()
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._sync_shared_cooldowns(now)
+                state = self._pick(now, exclude)
+                if state is not None:
+                    if state.bucket:
+                        state.bucket.take(now)
+                    state.in_flight += 1
+                    return KeyLease(self, state)
+
+                remaining = deadline - now
+                wait = self._next_ready_in(now, exclude)
+                if remaining <= 0 or wait is None or wait > remaining:
+                    raise KeyPoolExhausted(
+                        "Все Google API ключи исчерпали квоту или заняты. Попробуйте позже."
+                    )
+                self._cond.wait(timeout=max(wait, 0.01))
+
+    def _sync_shared_cooldowns(self, now):
+        """Adopt cooldowns other workers recorded in the shared cache."""
+        try:
+            shared = cache.get_many(list(self._cooldown_keys))
+        except Exception:
+            return
+        wall_now = time.time()
+        for cache_key, until in shared.items():
+            state = self._states[self._cooldown_keys[cache_key]]
+            state.cooldown_until = max(state.cooldown_until, now + (until - wall_now))
+
+    def _release(self, state):
+        with self._cond:
+            state.in_flight = max(0, state.in_flight - 1)
+            self._cond.notify_all()
+
+    def report_quota_exhausted(self, key):
+        """Back off from `key` with exponential cooldown after a quota error."""
+        with self._cond:
+            state = self._states.get(key)
+            if state is None:
+                return
+            state.quota_strikes += 1
+            delay = min(self.cooldown * (2 ** (state.quota_strikes - 1)), self.max_cooldown)
+            state.cooldown_until = time.monotonic() + delay
+            if state.bucket:
+                state.bucket.tokens = 0
+            try:
+                cache.set(_cooldown_cache_key(key), time.time() + delay, delay)
+            except Exception:
+                pass
+            logger.warning("Google API key ...%s hit quota, cooling down for %.0fs", key[-4:], delay)
+            self._cond.notify_all()
+
+    def report_success(self, key):
+        with self._cond:
+            state = self._states.get(key)
+            if state is not None:
+                state.quota_strikes = 0
+
+    def snapshot(self):
+        """Per-key status for diagnostics (keys are masked)."""
+        now = time.monotonic()
+        with self._cond:
+            return [
+                {
+                    'key': f"...{state.key[-4:]}",
+                    'in_flight': state.in_flight,
+                    'cooldown_remaining': max(0.0, state.cooldown_until - now),
+                    'tokens': round(min(state.bucket.capacity, state.bucket.tokens), 2) if state.bucket else None,
+                }
+                for state in (self._states[k] for k in self._order)
+            ]
+
+
+def _cooldown_cache_key(key):
+    return 'gemini_key_cooldown:' + hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_key_pool(keys):
+    """Return the process-wide pool for this exact key set, creating it once."""
+    pool_key = tuple(k for k in dict.fromkeys(keys) if k)
+    with _pools_lock:
+        pool = _pools.get(pool_key)
+        if pool is None:
+            pool = GeminiKeyPool(pool_key)
+            _pools[pool_key] = pool
+        return pool
+
+
+def is_quota_error(error_msg):
+    """Heuristic used by the generators to detect per-key quota exhaustion."""
+    lowered = error_msg.lower()
+    return '429' in error_msg or 'resource_exhausted' in lowered or 'quota' in lowered
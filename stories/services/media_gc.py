@@ -0,0 +1,176 @@
+import logging
+import os
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+
+logger = logging.getLogger(__name__)
+
+
+def referenced_media_names():
+    """Collect every file name referenced by a FileField/ImageField in the stories app."""
+    referenced = set()
+    for model in apps.get_app_config('stories').get_models():
+        file_fields = [f.name for f in model._meta.get_fields() if isinstance(f, models.FileField)]
+        for field_name in file_fields:
+            names = (
+                model.objects.exclude(**{field_name: ''})
+                .exclude(**{f'{field_name}__isnull': True})
+                .values_list(field_name, flat=True)
+                .iterator()
+            )
+            referenced.update(name.replace('\\', '/') for name in names)
+    return referenced
+
+
+def is_media_referenced(name, exclude=None):
+    """Check whether any row (other than `exclude`) still points at a media file."""
+    for model in apps.get_app_config('stories').get_models():
+        for field in model._meta.get_fields():
+            if not isinstance(field, models.FileField):
+                continue
+            queryset = model.objects.filter(**{field.name: name})
+            if exclude is not None and isinstance(exclude, model):
+                queryset = queryset.exclude(pk=exclude.pk)
+            if queryset.exists():
+                return True
+    return False
+
+
+def delete_unshared_file(field_file, instance):
+    """
+    Delete a stored file unless another row shares it.
+
+    With content-addressed storage identical images share one file, so the
+    plain FieldFile.delete() could remove an image still used elsewhere.
+    """
+    if not field_file:
+        return
+    if not is_media_referenced(field_file.name, exclude=instance):
+        field_file.delete(save=False)
+
+
+def find_orphaned_files(min_age=3600, media_root=None):
+    """
+    Yield (relative_name, size) for media files no model row references.
+
+    Files younger than `min_age` seconds are skipped so an image that has been
+    written but whose row is not saved yet is never reclaimed.
+    """
+    media_root = str(media_root or settings.MEDIA_ROOT)
+    if not os.path.isdir(media_root):
+        return
+
+    referenced = referenced_media_names()
+    cutoff = time.time() - min_age
+
+    for dirpath, dirnames, filenames in os.walk(media_root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            name = os.path.relpath(path, media_root).replace(os.sep, '/')
+            if name in referenced:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime > cutoff:
+                continue
+            yield name, stat.st_size
+
+
+def _prune_empty_dirs(media_root):
+    for dirpath, dirnames, filenames in os.walk(media_root, topdown=False):
+        if dirpath != media_root and not os.listdir(dirpath):
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+
+
+def collect_garbage(dry_run=True, min_age=3600, media_root=None):
+    """
+    Delete (or just report) unreferenced media files.
+
+    Returns:
+        Dict with 'files' (list of names), 'count', 'bytes' and 'dry_run'
+    """
+    media_root = str(media_root or settings.MEDIA_ROOT)
+    report = {'files': [], 'count': 0, 'bytes': 0, 'dry_run': dry_run}
+
+    for name, size in find_orphaned_files(min_age=min_age, media_root=media_root):
+        if not dry_run:
+            try:
+                os.remove(os.path.join(media_root, name))
+            except FileNotFoundError:
+                continue
+        report['files'].append(name)
+        report['count'] += 1
+        report['bytes'] += size
+
+    if not dry_run:
+        _prune_empty_dirs(media_root)
+
+    return report
+
+
+def purge_expired_candidates(retention=None):
+    """Drop scene candidates older than SCENE_CANDIDATE_RETENTION seconds; returns how many."""
+    SceneCandidate = apps.get_model('stories', 'SceneCandidate')
+    if retention is None:
+        retention = getattr(settings, 'SCENE_CANDIDATE_RETENTION', 7 * 24 * 3600)
+    return SceneCandidate.purge_expired(retention)
+
+
+def run_locked_gc_pass(interval, min_age):
+    """
+    Run one GC pass unless another process already ran one this interval.
+
+    The lock lives in the shared cache and is kept for the whole interval, so
+    with several workers (gunicorn --workers N) exactly one of them does the work.
+    Returns False when the pass was skipped.
+    """
+    if not cache.add('media_gc_running', os.getpid(), interval):
+        return False
+    try:
+        purged = purge_expired_candidates()
+        if purged:
+            logger.info("Media GC: purged %s expired scene candidates", purged)
+        report = collect_garbage(dry_run=False, min_age=min_age)
+        logger.info("Media GC: removed %s files, %s bytes reclaimed", report['count'], report['bytes'])
+    except Exception:
+        logger.exception("Media GC failed")
+    return True
+
+
+def _periodic_gc_loop(interval, min_age):
+    while True:
+        time.sleep(interval)
+        run_locked_gc_pass(interval, min_age)
+
+
+_gc_thread = None
+
+
+def start_periodic_media_gc():
+    """Start the background GC thread once per process if MEDIA_GC_INTERVAL is set (off by default)."""
+    global _gc_thread
+    interval = getattr(settings, 'MEDIA_GC_INTERVAL', 0)
+    if not interval or _gc_thread is not None:
+        return
+    if 'LocMemCache' in settings.CACHES['default']['BACKEND']:
+        # A per-process cache cannot keep the other workers out of a pass
+        logger.warning("Media GC: MEDIA_GC_INTERVAL needs the shared cache; run collect_media_garbage from cron instead")
+        return
+    min_age = getattr(settings, 'MEDIA_GC_MIN_AGE', 3600)
+    _gc_thread = threading.Thread(
+        target=_periodic_gc_loop,
+        args=(interval, min_age),
+        name='media-gc',
+        daemon=True,
+    )
+    _gc_thread.start()
@@ -0,0 +1,238 @@
+"""
+Metrics for the generation pipeline.
+
+Stage timings go into histograms, retries/bytes/tokens into counters, and
+everything is exposed in Prometheus text format by the `metrics` view. Every
+recorded stage is also written to the `stories.metrics` logger as a logfmt
+line so one slow generation can be traced stage by stage.
+
+Each worker process keeps its own registry and publishes a snapshot to the
+shared cache every few seconds; the `metrics` view sums the snapshots of all
+workers, so a scrape sees the whole host whichever worker answers it.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+
+logger = logging.getLogger('stories.metrics')
+
+# Upper bounds (seconds) for stage duration histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+
+METRIC_HELP = {
+    'story_stage_duration_seconds': 'Duration of generation pipeline stages',
+    'story_upstream_retries_total': 'Upstream attempts that were retried',
+    'story_upstream_errors_total': 'Upstream attempts that failed',
+    'story_upstream_bytes_sent_total': 'Bytes uploaded to upstream AI APIs',
+    'story_upstream_bytes_received_total': 'Bytes downloaded from upstream AI APIs',
+    'story_tokens_total': 'Token usage reported by upstream AI APIs',
+    'story_media_bytes_saved_total': 'Bytes saved by lossless media recompression',
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ''
+    body = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in pairs
+    )
+    return '{' + body + '}'
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms with Prometheus text rendering."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        if not value:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = {'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0}
+                self._histograms[key] = hist
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist['buckets'][i] += 1
+            hist['count'] += 1
+            hist['sum'] += value
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: {'buckets': list(v['buckets']), 'count': v['count'], 'sum': v['sum']}
+                          for k, v in self._histograms.items()}
+        return counters, histograms
+
+    def render_prometheus(self, snapshot=None):
+        counters, histograms = snapshot or self.snapshot()
+        lines = []
+
+        for name in sorted({n for n, _ in counters}):
+            lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for (metric, label_key), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(label_key)} {value}")
+
+        for name in sorted({n for n, _ in histograms}):
+            lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, label_key), hist in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, count in zip(self.buckets, hist['buckets']):
+                    lines.append(f"{name}_bucket{_format_labels(label_key, [('le', bound)])} {count}")
+                lines.append(f"{name}_bucket{_format_labels(label_key, [('le', '+Inf')])} {hist['count']}")
+                lines.append(f"{name}_sum{_format_labels(label_key)} {hist['sum']:.6f}")
+                lines.append(f"{name}_count{_format_labels(label_key)} {hist['count']}")
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+# Seconds between snapshot publications, and how long a silent worker's last one is kept
+PUBLISH_INTERVAL = 5
+SNAPSHOT_TTL = 24 * 3600
+_WORKERS_KEY = 'metrics:workers'
+_last_publish = 0.0
+
+
+def _snapshot_key(pid):
+    return f'metrics:worker:{pid}'
+
+
+def publish(force=False):
+    """Write this process's snapshot to the shared cache (at most every PUBLISH_INTERVAL s)."""
+    global _last_publish
+    now = time.monotonic()
+    if not force and now - _last_publish < PUBLISH_INTERVAL:
+        return
+    _last_publish = now
+    pid = os.getpid()
+    try:
+        cache.set(_snapshot_key(pid), registry.snapshot(), SNAPSHOT_TTL)
+        workers = cache.get(_WORKERS_KEY) or []
+        if pid not in workers:
+            # A lost update here is repaired on the worker's next publish
+            cache.set(_WORKERS_KEY, workers + [pid], SNAPSHOT_TTL)
+    except Exception as e:
+        logger.warning("event=metrics_publish_failed error=%r", e)
+
+
+def merge_snapshots(snapshots):
+    """Sum (counters, histograms) snapshots from several processes."""
+    counters, histograms = {}, {}
+    for worker_counters, worker_histograms in snapshots:
+        for key, value in worker_counters.items():
+            counters[key] = counters.get(key, 0) + value
+        for key, hist in worker_histograms.items():
+            total = histograms.setdefault(key, {'buckets': [0] * len(hist['buckets']), 'count': 0, 'sum': 0.0})
+            total['buckets'] = [a + b for a, b in zip(total['buckets'], hist['buckets'])]
+            total['count'] += hist['count']
+            total['sum'] += hist['sum']
+    return counters, histograms
+
+
+def aggregated_snapshot():
+    """Snapshot summed over every worker that published to the shared cache."""
+    publish(force=True)
+    try:
+        workers = cache.get(_WORKERS_KEY) or []
+        published = cache.get_many([_snapshot_key(pid) for pid in workers])
+    except Exception:
+        return registry.snapshot()
+    live = [pid for pid in workers if _snapshot_key(pid) in published]
+    if len(live) < len(workers):
+        # Forget workers whose snapshot expired
+        cache.set(_WORKERS_KEY, live, SNAPSHOT_TTL)
+    snapshots = list(published.values())
+    if _snapshot_key(os.getpid()) not in published:
+        snapshots.append(registry.snapshot())
+    return merge_snapshots(snapshots)
+
+
+def render_prometheus():
+    """Prometheus text for the whole host (all worker processes)."""
+    return registry.render_prometheus(aggregated_snapshot())
+
+
+def _log_fields(fields):
+    return ' '.join(f"{k}={v}" for k, v in fields.items() if v not in (None, ''))
+
+
+def record_stage(stage, duration, operation='', provider='', outcome='ok', **fields):
+    """
+    Record one stage duration (seconds) and log it.
+
+    Every series is labelled with stage, operation, provider and outcome, so
+    the same stage recorded here and through `timed` lines up; other keyword
+    arguments (counts, sizes) only go to the log line.
+    """
+    registry.observe('story_stage_duration_seconds', duration,
+                     stage=stage, operation=operation, provider=provider, outcome=outcome)
+    publish()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info('%s', _log_fields({
+            'event': 'stage', 'stage': stage, 'duration_ms': f"{duration * 1000:.1f}",
+            'operation': operation, 'provider': provider, 'outcome': outcome, **fields,
+        }))
+
+
+@contextmanager
+def timed(stage, **labels):
+    """Time the enclosed block as pipeline `stage`; failures are labelled outcome=error."""
+    start = time.perf_counter()
+    outcome = 'ok'
+    try:
+        yield
+    except Exception:
+        outcome = 'error'
+        raise
+    finally:
+        record_stage(stage, time.perf_counter() - start, outcome=outcome, **labels)
+
+
+def inc(name, value=1, **labels):
+    """Increment a counter and log the event."""
+    if not value:
+        return
+    registry.inc(name, value, **labels)
+    publish()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info('%s', _log_fields({'event': 'counter', 'metric': name, 'value': value, **labels}))
+
+
+def record_tokens(provider, input_tokens=None, output_tokens=None):
+    if input_tokens:
+        inc('story_tokens_total', input_tokens, provider=provider, direction='input')
+    if output_tokens:
+        inc('story_tokens_total', output_tokens, provider=provider, direction='output')
@@ -0,0 +1,214 @@
+"""
+Streaming import/export of projects in the projects_data.json format.
+
+    {"projects": {"<name>": {"style": ..., "color_scheme": ...,
+                             "characters": {"<name>": "<description>"},
+                             "scenes": [{"name", "prompt", "approved_image"}]}}}
+
+Neither direction holds the whole document: export walks projects,
+characters and scenes with `iterator()` in project order and writes each
+project as soon as its rows are read; import parses one project at a time
+from the input stream and inserts them in batches with `bulk_create`.
+"""
+import json
+import os
+from itertools import groupby
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.db import transaction
+
+from stories.models import Character, Project, Scene
+from .json_stream import StreamingObjectParser
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _grouped(queryset, chunk_size):
+    """Yield (project_id, rows) from a queryset ordered by project_id."""
+    return groupby(queryset.iterator(chunk_size=chunk_size), key=lambda row: row['project_id'])
+
+
+def _indent(text, prefix):
+    return text.replace('\n', '\n' + prefix)
+
+
+def export_projects(out, projects=None, chunk_size=500):
+    """
+    Write projects to the text stream `out` in the projects_data.json format.
+
+    Projects, characters and scenes are read with three ordered iterators
+    that are merged by project id, so memory stays bounded by one project.
+    Project names are JSON object keys; repeated names get a " (2)", " (3)"...
+    suffix so ordinary JSON readers don't drop them.
+
+    Returns:
+        Dict with 'projects', 'characters', 'scenes' counts
+    """
+    projects = (projects if projects is not None else Project.objects.all()).order_by('pk')
+    characters = _grouped(
+        Character.objects.filter(project__in=projects)
+        .order_by('project_id', 'pk')
+        .values('project_id', 'name', 'description'),
+        chunk_size,
+    )
+    scenes = _grouped(
+        Scene.objects.filter(project__in=projects)
+        .order_by('project_id', 'order', 'created_at', 'pk')
+        .values('project_id', 'name', 'prompt', 'approved_image'),
+        chunk_size,
+    )
+    next_characters = next(characters, None)
+    next_scenes = next(scenes, None)
+
+    report = {'projects': 0, 'characters': 0, 'scenes': 0}
+    seen_names = {}
+    out.write('{\n    "projects": {')
+    for project in projects.values('pk', 'name', 'style', 'color_scheme').iterator(chunk_size=chunk_size):
+        body = {'characters': {}, 'scenes': [], 'style': project['style'], 'color_scheme': project['color_scheme']}
+
+        while next_characters and next_characters[0] <= project['pk']:
+            if next_characters[0] == project['pk']:
+                for row in next_characters[1]:
+                    body['characters'][row['name']] = row['description']
+            next_characters = next(characters, None)
+        while next_scenes and next_scenes[0] <= project['pk']:
+            if next_scenes[0] == project['pk']:
+                body['scenes'] = [
+                    {'name': row['name'], 'prompt': row['prompt'], 'approved_image': row['approved_image'] or ''}
+                    for row in next_scenes[1]
+                ]
+            next_scenes = next(scenes, None)
+
+        name = project['name']
+        seen_names[name] = seen_names.get(name, 0) + 1
+        if seen_names[name] > 1:
+            name = f"{name} ({seen_names[name]})"
+
+        out.write(',' if report['projects'] else '')
+        out.write('\n        %s: %s' % (
+            json.dumps(name, ensure_ascii=False),
+            _indent(json.dumps(body, indent=4, ensure_ascii=False), '        '),
+        ))
+        report['projects'] += 1
+        report['characters'] += len(body['characters'])
+        report['scenes'] += len(body['scenes'])
+
+    out.write('\n    }\n}\n')
+    return report
+
+
+def _resolve_image(name, storage, images_dir):
+    """
+    Map an exported approved_image to a stored file name.
+
+    Names already present in storage are kept. Otherwise the file is looked
+    up under `images_dir` (backslash paths from older exports included) and
+    saved into storage. Returns None when the image can't be found.
+
+    Raises:
+        SuspiciousFileOperation: if the name points outside media storage or
+            `images_dir` (the archive is untrusted)
+    """
+    if not name:
+        return None
+    name = name.replace('\\', '/')
+    if storage.exists(name):
+        return name
+    if images_dir:
+        root = os.path.realpath(images_dir)
+        path = os.path.realpath(os.path.join(root, *name.split('/')))
+        if os.path.commonpath([root, path]) != root:
+            raise SuspiciousFileOperation(f"Image path {name!r} is outside the images directory")
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                return storage.save(f"generated_images/{os.path.basename(path)}", File(f))
+    return None
+
+
+def _import_batch(batch, images_dir, report):
+    storage = Scene._meta.get_field('approved_image').storage
+    SceneCharacter = Scene.characters.through
+
+    with transaction.atomic():
+        projects = Project.objects.bulk_create([
+            Project(name=name, **{k: data[k] for k in ('style', 'color_scheme') if data.get(k)})
+            for name, data in batch
+        ])
+
+        characters = []
+        scenes = []
+        for project, (_, data) in zip(projects, batch):
+            for character_name, description in (data.get('characters') or {}).items():
+                characters.append(Character(project=project, name=character_name, description=description or ''))
+            for position, scene in enumerate(data.get('scenes') or [], start=1):
+                try:
+                    image = _resolve_image(scene.get('approved_image'), storage, images_dir)
+                except SuspiciousFileOperation:
+                    report['invalid_images'] += 1
+                    image = None
+                else:
+                    if scene.get('approved_image') and image is None:
+                        report['missing_images'] += 1
+                scenes.append(Scene(
+                    project=project,
+                    name=scene.get('name') or f"Scene {position}",
+                    prompt=scene.get('prompt') or '',
+                    order=position * Scene.ORDER_GAP,
+                    approved_image=image,
+                ))
+        Character.objects.bulk_create(characters, batch_size=500)
+        Scene.objects.bulk_create(scenes, batch_size=500)
+
+        # Link characters mentioned as {Name} placeholders, as story ingestion does
+        by_project = {}
+        for character in characters:
+            by_project.setdefault(character.project_id, []).append(character)
+        SceneCharacter.objects.bulk_create([
+            SceneCharacter(scene_id=scene.pk, character_id=character.pk)
+            for scene in scenes
+            for character in by_project.get(scene.project_id, [])
+            if f"{{{character.name}}}" in scene.prompt
+        ], batch_size=500)
+
+    report['projects'] += len(projects)
+    report['characters'] += len(characters)
+    report['scenes'] += len(scenes)
+
+
+def import_projects(stream, batch_size=100, images_dir=None):
+    """
+    Create projects from a projects_data.json text stream.
+
+    The stream is read in chunks and parsed one project at a time; every
+    `batch_size` projects are inserted with one bulk_create per table in
+    their own transaction. Scene images are resolved by `_resolve_image`.
+
+    Returns:
+        Dict with 'projects', 'characters', 'scenes', 'missing_images' and
+        'invalid_images' (paths escaping the media or images directory) counts
+
+    Raises:
+        ValueError: if the document has no complete "projects" object
+    """
+    parser = StreamingObjectParser('projects')
+    report = {'projects': 0, 'characters': 0, 'scenes': 0, 'missing_images': 0, 'invalid_images': 0}
+    batch = []
+    while not parser.finished:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        for name, data in parser.feed(chunk):
+            if not isinstance(data, dict):
+                continue
+            batch.append((name, data))
+            if len(batch) >= batch_size:
+                _import_batch(batch, images_dir, report)
+                batch = []
+    if batch:
+        _import_batch(batch, images_dir, report)
+
+    if not parser.finished:
+        raise ValueError('Input ended before the "projects" object was closed')
+    return report
@@ -0,0 +1,164 @@
+"""
+Lossless recompression of stored images.
+
+Gemini returns large PNGs. Re-encoding them as lossless WebP (or an
+optimized PNG) keeps every pixel and usually saves a good share of the bytes.
+Used by ContentAddressedStorage at save time when MEDIA_RECOMPRESS is set, and
+by the `recompress_media` command to backfill existing files.
+"""
+import io
+import os
+import posixpath
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.db import models
+
+from .metrics import inc
+
+
+FORMATS = {
+    'webp': ('WEBP', '.webp'),
+    'png': ('PNG', '.png'),
+}
+
+# Only lossless sources are worth re-encoding; a JPEG would just grow
+LOSSLESS_SOURCES = {'PNG', 'BMP', 'TIFF', 'WEBP'}
+
+# 8-bit modes that convert to RGB/RGBA without losing information. 16-bit,
+# 32-bit integer/float and CMYK images are left alone.
+LOSSLESS_MODES = {'1', 'L', 'LA', 'P', 'PA', 'RGB', 'RGBA'}
+
+
+def recompress_bytes(data, target='webp', effort=4):
+    """
+    Re-encode image bytes losslessly in `target` format.
+
+    Args:
+        data: Original image bytes
+        target: 'webp' or 'png'
+        effort: Encoder effort 0-6 (WebP method / PNG optimize pass)
+
+    Returns:
+        Tuple (new_bytes, extension) or None when the image can't be decoded,
+        isn't from a lossless source, can't be re-encoded without loss (high
+        bit depth, CMYK, several frames), or the result would not be smaller
+    """
+    from PIL import Image
+
+    pil_format, extension = FORMATS[target]
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.format not in LOSSLESS_SOURCES:
+                return None
+            if image.format == 'WEBP' and target == 'webp':
+                return None
+            # save() would keep only the first frame of an APNG / multi-page TIFF
+            if image.mode not in LOSSLESS_MODES or getattr(image, 'n_frames', 1) > 1:
+                return None
+            image.load()
+            icc_profile = image.info.get('icc_profile')
+            buffer = io.BytesIO()
+            if pil_format == 'WEBP':
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+                image.save(buffer, format='WEBP', lossless=True, quality=100, method=effort, exact=True,
+                           icc_profile=icc_profile)
+            else:
+                image.save(buffer, format='PNG', optimize=effort > 0, icc_profile=icc_profile)
+    except Exception:
+        return None
+
+    new_data = buffer.getvalue()
+    if len(new_data) >= len(data):
+        return None
+    return new_data, extension
+
+
+def recompress_content(name, content, target='webp', effort=4):
+    """
+    Recompress a File about to be stored.
+
+    Returns:
+        Tuple (name, content); unchanged when recompression doesn't help
+    """
+    content.seek(0)
+    data = content.read()
+    content.seek(0)
+    result = recompress_bytes(data, target=target, effort=effort)
+    if result is None:
+        return name, content
+
+    new_data, extension = result
+    inc('story_media_bytes_saved_total', len(data) - len(new_data), stage='save')
+    new_name = os.path.splitext(name)[0] + extension
+    return new_name, ContentFile(new_data, name=os.path.basename(new_name))
+
+
+def _upload_name(name):
+    """Undo the `<hh>/` fan-out directory ContentAddressedStorage adds, so a re-save lands beside the original."""
+    directory, filename = posixpath.split(name)
+    fanout = posixpath.basename(directory)
+    if len(fanout) == 2 and filename.startswith(fanout):
+        directory = posixpath.dirname(directory)
+    return posixpath.join(directory, filename)
+
+
+def image_fields():
+    """Yield (model, field_name) for every ImageField in the stories app."""
+    for model in apps.get_app_config('stories').get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, models.ImageField):
+                yield model, field.name
+
+
+def backfill(storage, target='webp', effort=6, dry_run=False):
+    """
+    Recompress every stored image referenced by the stories models.
+
+    Each distinct file is re-encoded once, saved under its new content-hash
+    name, and all rows pointing at it are repointed with one UPDATE per
+    model field. The old file is removed once nothing references it.
+
+    Returns:
+        Dict with 'files', 'bytes_before', 'bytes_after', 'bytes_saved', 'dry_run'
+    """
+    from .media_gc import is_media_referenced
+
+    fields = list(image_fields())
+    names = set()
+    for model, field_name in fields:
+        names.update(
+            model.objects.exclude(**{field_name: ''})
+            .exclude(**{f'{field_name}__isnull': True})
+            .values_list(field_name, flat=True)
+            .distinct()
+            .iterator()
+        )
+
+    report = {'files': 0, 'bytes_before': 0, 'bytes_after': 0, 'bytes_saved': 0, 'dry_run': dry_run}
+    for name in sorted(names):
+        if not storage.exists(name):
+            continue
+        with storage.open(name, 'rb') as f:
+            data = f.read()
+        result = recompress_bytes(data, target=target, effort=effort)
+        if result is None:
+            continue
+
+        new_data, extension = result
+        report['files'] += 1
+        report['bytes_before'] += len(data)
+        report['bytes_after'] += len(new_data)
+        if dry_run:
+            continue
+
+        new_name = storage.save(os.path.splitext(_upload_name(name))[0] + extension, ContentFile(new_data))
+        for model, field_name in fields:
+            model.objects.filter(**{field_name: name}).update(**{field_name: new_name})
+        if not is_media_referenced(name):
+            storage.delete(name)
+        inc('story_media_bytes_saved_total', len(data) - len(new_data), stage='backfill')
+
+    report['bytes_saved'] = report['bytes_before'] - report['bytes_after']
+    return report
@@ -0,0 +1,155 @@
+"""
+Single-flight execution for paid generation calls.
+
+Concurrent calls with the same flight key (e.g. the same scene and final
+prompt) run the work once; duplicates wait for it and receive the same
+result. Threads of one worker share the result directly, other worker
+processes find it through the Django cache. A client-supplied idempotency key
+additionally makes the finished result replayable for IDEMPOTENCY_TTL seconds,
+but only for the same flight key: reusing it for another request is an error.
+"""
+import hashlib
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class IdempotencyKeyReused(Exception):
+    """An idempotency key was replayed with a request different from the one it was first used for."""
+
+
+def flight_key(kind, pk, *parts):
+    """Stable key for one unit of paid work, e.g. ('scene', 12, final_prompt)."""
+    digest = hashlib.sha256('\x1f'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+    return f"{kind}:{pk}:{digest}"
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls per key; see the module docstring."""
+
+    poll_interval = 0.25
+
+    def __init__(self, namespace='single_flight', lock_timeout=None, result_ttl=None, idempotency_ttl=None):
+        self.namespace = namespace
+        self.lock_timeout = lock_timeout or getattr(settings, 'SINGLE_FLIGHT_LOCK_TIMEOUT', 300)
+        self.result_ttl = result_ttl or getattr(settings, 'SINGLE_FLIGHT_RESULT_TTL', 60)
+        self.idempotency_ttl = idempotency_ttl or getattr(settings, 'IDEMPOTENCY_TTL', 600)
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def _cache_key(self, kind, key):
+        return f"{self.namespace}:{kind}:{key}"
+
+    def do(self, key, fn, idempotency_key=None, remember=None):
+        """
+        Run `fn()` once per in-flight `key`.
+
+        Args:
+            key: Flight key, see `flight_key`
+            fn: Zero-argument callable returning a picklable value
+            idempotency_key: Optional client key; a finished result is replayed for it
+            remember: Optional predicate; only values it accepts are replayed later
+
+        Returns:
+            Tuple (value, shared) where `shared` is True if the value came from
+            another call
+
+        Raises:
+            IdempotencyKeyReused: `idempotency_key` was stored for another flight key
+        """
+        idem_cache_key = self._cache_key('idem', idempotency_key) if idempotency_key else None
+        if idem_cache_key:
+            stored = cache.get(idem_cache_key)
+            if stored is not None:
+                stored_key, stored_value = stored
+                if stored_key != key:
+                    raise IdempotencyKeyReused("Idempotency key was already used for another request")
+                return stored_value, True
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            value, shared = self._run_across_workers(key, fn)
+            call.value = value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        if idem_cache_key and (remember is None or remember(value)):
+            cache.set(idem_cache_key, (key, value), self.idempotency_ttl)
+        return value, shared
+
+    def _run_across_workers(self, key, fn):
+        lock_key = self._cache_key('lock', key)
+        deadline = time.monotonic() + self.lock_timeout
+
+        while True:
+            token = uuid.uuid4().hex
+            if cache.add(lock_key, token, self.lock_timeout):
+                break
+
+            # Another worker owns the flight: wait for its published result
+            owner = cache.get(lock_key)
+            while owner is not None and time.monotonic() < deadline:
+                value = cache.get(self._cache_key('result', owner))
+                if value is not None:
+                    return value, True
+                time.sleep(self.poll_interval)
+                current = cache.get(lock_key)
+                if current != owner:
+                    value = cache.get(self._cache_key('result', owner))
+                    if value is not None:
+                        return value, True
+                    owner = current
+            if time.monotonic() >= deadline:
+                # The owner is stuck or gone; its lock expires on its own
+                break
+
+        try:
+            value = fn()
+            cache.set(self._cache_key('result', token), value, self.result_ttl)
+            return value, False
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+
+generation_flights = SingleFlight('generation')
+
+
+def request_idempotency_key(request, scope):
+    """
+    Idempotency key sent by the client (`Idempotency-Key` header or POST field), scoped to the endpoint.
+
+    The front end sends one per user action (static/js/idempotency.js). A replay
+    must also match the original flight key, see `SingleFlight.do`.
+    """
+    key = request.headers.get('Idempotency-Key') or request.POST.get('idempotency_key')
+    if not key:
+        return None
+    return f"{scope}:{key.strip()[:128]}"
@@ -1,10 +1,19 @@
+import logging
 import os
+import time
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from SimplerLLM.language.llm import LLM, LLMProvider
-from SimplerLLM.language.llm_addons import generate_pydantic_json_model
+from SimplerLLM.language.llm_addons import create_optimized_prompt, generate_pydantic_json_model
 from django.conf import settings
 from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from .json_stream import StreamingArrayParser
+from .metrics import inc, record_stage, record_tokens, timed
+
+
+logger = logging.getLogger(__name__)
 
 
 class Scenes(BaseModel):
@@ -22,26 +31,32 @@ class Characters(BaseModel):
 
 ORIGINAL_OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL')
 
+# Same system prompt generate_pydantic_json_model uses
+JSON_SYSTEM_PROMPT = "The Output is a VALID Structured JSON"
+
 
 class StoryProcessor:
+    # Extra attempts when a streamed extraction yields nothing usable,
+    # as generate_pydantic_json_model's max_retries
+    stream_max_retries = 3
+    stream_retry_delay = 1.0
+
     def __init__(self):
         # Получить API ключ сначала из GenerationSettings, затем из переменных окружения
         from stories.models import GenerationSettings
-        gen_settings = GenerationSettings.get_settings()
-        ai_provider = gen_settings.get_current_provider()
-        api_key = gen_settings.get_current_api_key()
-        base_url = gen_settings.get_current_base_url()
+        with timed('settings_load', operation='story'):
+            gen_settings = GenerationSettings.get_settings()
+            ai_provider = gen_settings.get_current_provider()
+            api_key = gen_settings.get_current_api_key()
+            base_url = gen_settings.get_current_base_url()
         self._configure_openai_base_url(ai_provider, base_url)
-        
-        print("=== DEBUG StoryProcessor INIT ===")
-        print(f"Выбран AI провайдер: {ai_provider}")
-        print(f"API Key получен: {'ДА' if api_key else 'НЕТ'}")
-        if api_key:
-            print(f"Длина API ключа: {len(api_key)}")
-            print(f"Префикс API ключа: {api_key[:15]}...")
-        if base_url:
-            print(f"Используется кастомный base_url: {base_url}")
-        
+        self.ai_provider = ai_provider
+
+        logger.debug(
+            "StoryProcessor: провайдер=%s, API ключ получен=%s, кастомный base_url=%s",
+            ai_provider, 'ДА' if api_key else 'НЕТ', 'ДА' if base_url else 'НЕТ'
+        )
+
         if not api_key:
             raise ValueError("API ключ не найден ни для OpenAI, ни для Artemox. Укажите креды в .env или в GenerationSettings.")
         
@@ -56,16 +71,21 @@ class StoryProcessor:
             'model_name': model_name,
             'api_key': api_key
         }
+        self.api_key = api_key
+        self.model_name = model_name
 
         try:
-            self.llm_instance = LLM.create(**llm_kwargs)
-            print("LLM instance создан успешно")
+            # STORY_LLM_CLASS (dotted path) swaps in another LLM, e.g. stories.fakes.FakeLLM
+            llm_class = getattr(settings, 'STORY_LLM_CLASS', None)
+            if llm_class:
+                self.llm_instance = import_string(llm_class)(**llm_kwargs)
+            else:
+                self.llm_instance = LLM.create(**llm_kwargs)
         except Exception as e:
-            print(f"Ошибка создания LLM instance: {e}")
+            logger.error("Ошибка создания LLM instance: %s", e)
             raise
         
         self._prompt_cache = {}
-        print("=== DEBUG StoryProcessor INIT COMPLETED ===")
 
     def _configure_openai_base_url(self, ai_provider: str, base_url: Optional[str]):
         """
@@ -105,101 +125,176 @@ class StoryProcessor:
             return prompt_text
         except PromptTemplate.DoesNotExist:
             # Записать предупреждение и вернуть пустую строку - шаблоны должны быть в базе данных
-            print(f"ПРЕДУПРЕЖДЕНИЕ: Шаблон '{template_type}' не найден в базе данных. Пожалуйста, убедитесь, что промпт-шаблоны правильно инициализированы.")
+            logger.warning("Шаблон '%s' не найден в базе данных. Пожалуйста, убедитесь, что промпт-шаблоны правильно инициализированы.", template_type)
             return ""
 
-    def extract_scenes(self, story: str) -> List[str]:
-        print("=== DEBUG extract_scenes ===")
-        print(f"1. Получение шаблона для извлечения сцен...")
-        
-        prompt_template = self.get_prompt_template('scene_extraction')
-        print(f"2. Шаблон получен: {'ДА' if prompt_template else 'НЕТ'}")
-        print(f"3. Длина шаблона: {len(prompt_template) if prompt_template else 0}")
-
-        if not prompt_template:
-            raise ValueError("Шаблон извлечения сцен не найден в базе данных. Пожалуйста, убедитесь, что промпт-шаблоны инициализированы.")
-
-        print(f"4. Длина исходной истории: {len(story)} символов")
-        print(f"5. Первые 200 символов истории: {story[:200]}...")
-        
-        prompt = prompt_template.format(story=story)
-        print(f"6. Длина полного промпта: {len(prompt)} символов")
-        print(f"7. Первые 300 символов промпта: {prompt[:300]}...")
-        
-        print(f"8. Вызов generate_pydantic_json_model...")
-        try:
+    def _generate_model(self, model_class, prompt, stage):
+        """Call the LLM for `model_class`, recording upstream time, bytes and tokens."""
+        inc('story_upstream_bytes_sent_total', len(prompt.encode('utf-8')), provider=self.ai_provider)
+        with timed('upstream_total', provider=self.ai_provider, operation=stage):
             result = generate_pydantic_json_model(
-                model_class=Scenes,
+                model_class=model_class,
                 llm_instance=self.llm_instance,
-                prompt=prompt
+                prompt=prompt,
+                full_response=True
             )
-            
-            print(f"9. Успешный вызов API")
-            print(f"10. Тип результата: {type(result)}")
-            print(f"11. Результат: {result}")
-            
-            if isinstance(result, str):
-                print(f"12. ОШИБКА: Результат является строкой вместо объекта")
-                print(f"13. Содержимое строки: {result}")
-                print(f"14. Первые 500 символов ответа: {result[:500]}")
-                raise ValueError(f"Не удалось извлечь сцены. API вернул неожиданный ответ: {result[:200]}")
-            
-            if not hasattr(result, 'scenes'):
-                print(f"15. ОШИБКА: Результат не имеет атрибута 'scenes'")
-                print(f"16. Доступные атрибуты: {dir(result)}")
-                print(f"17. Содержимое результата: {result}")
-                raise ValueError(f"Не удалось извлечь сцены. Результат не имеет атрибута 'scenes'. Тип: {type(result)}")
-            
-            print(f"18. Успешно извлечено сцен: {len(result.scenes)}")
-            print(f"19. Сцены: {result.scenes}")
-            print("=== DEBUG extract_scenes COMPLETED ===")
-            
-            return result.scenes
-            
-        except Exception as e:
-            print(f"20. ИСКЛЮЧЕНИЕ в extract_scenes: {str(e)}")
-            print(f"21. Тип исключения: {type(e).__name__}")
-            import traceback
-            print(f"22. Traceback: {traceback.format_exc()}")
-            print("=== DEBUG extract_scenes FAILED ===")
-            raise
+
+        if isinstance(result, str):
+            inc('story_upstream_errors_total', provider=self.ai_provider, operation=stage)
+            return result
+
+        record_tokens(self.ai_provider,
+                      getattr(result, 'input_token_count', None),
+                      getattr(result, 'output_token_count', None))
+        text = getattr(result, 'generated_text', None) or ''
+        inc('story_upstream_bytes_received_total', len(text.encode('utf-8')), provider=self.ai_provider)
+        return result.model_object
 
     def extract_characters(self, story: str) -> List[CharacterModel]:
-        prompt_template = self.get_prompt_template('character_extraction')
+        with timed('prompt_assembly', operation='extract_characters'):
+            prompt_template = self.get_prompt_template('character_extraction')
 
-        if not prompt_template:
-            raise ValueError("Шаблон извлечения персонажей не найден в базе данных.")
+            if not prompt_template:
+                raise ValueError("Шаблон извлечения персонажей не найден в базе данных.")
 
-        print(f"Prompt template: {prompt_template}")  # Логируем шаблон
-        print(f"Story length: {len(story)}")  # Логируем длину истории
-        
-        prompt = prompt_template.format(story=story)
-        print(f"Full prompt: {prompt[:500]}...")  # Логируем начало промпта
-        
-        try:
-            result = generate_pydantic_json_model(
-                model_class=Characters,
-                llm_instance=self.llm_instance,
-                prompt=prompt
+            prompt = prompt_template.format(story=story)
+        logger.debug("extract_characters: история %s символов, промпт %s символов", len(story), len(prompt))
+
+        result = self._generate_model(Characters, prompt, 'extract_characters')
+
+        if isinstance(result, str):
+            logger.error("extract_characters: неожиданный ответ API (%s символов)", len(result))
+            raise ValueError(f"Не удалось извлечь персонажей. API вернул неожиданный ответ: {result[:200]}")
+
+        if not hasattr(result, 'characters'):
+            raise ValueError(f"Результат не имеет атрибута 'characters'. Полный ответ: {result}")
+
+        logger.info("extract_characters: извлечено персонажей: %s", len(result.characters))
+        return result.characters
+
+
+    def _stream_completion(self, prompt, operation):
+        """
+        Yield completion text chunks for `prompt` as they arrive.
+
+        LLM instances exposing `generate_response_stream` (SimplerLLM's
+        LLMStreamChunk API, or FakeLLM) are streamed directly; OpenAI-compatible
+        providers go through the OpenAI SDK with stream=True. Anything else
+        falls back to a single full response.
+        """
+        inc('story_upstream_bytes_sent_total', len(prompt.encode('utf-8')), provider=self.ai_provider)
+        start = time.perf_counter()
+        first_chunk = True
+        received = 0
+
+        stream_method = getattr(self.llm_instance, 'generate_response_stream', None)
+        if stream_method is not None:
+            chunks = self._llm_stream_text(
+                stream_method(prompt=prompt, system_prompt=JSON_SYSTEM_PROMPT, max_tokens=4096, json_mode=True)
             )
-            
-            print(f"Result type: {type(result)}")  # Логируем тип результата
-            print(f"Result: {result}")  # Логируем полный результат
-            
-            if isinstance(result, str):
-                print(f"Raw API response: {result}")  # Логируем сырой ответ
-                raise ValueError(f"Не удалось извлечь персонажей. API вернул неожиданный ответ: {result[:200]}")
-            
-            if not hasattr(result, 'characters'):
-                raise ValueError(f"Результат не имеет атрибута 'characters'. Полный ответ: {result}")
-            
-            return result.characters
-            
-        except Exception as e:
-            print(f"Error in extract_characters: {str(e)}")
-            print(f"Error type: {type(e)}")
-            raise
+        elif self.ai_provider in ('openai', 'artemox'):
+            chunks = self._stream_openai(prompt)
+        else:
+            chunks = [self.llm_instance.generate_response(
+                prompt=prompt, system_prompt=JSON_SYSTEM_PROMPT, max_tokens=4096, json_mode=True
+            ) or '']
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if first_chunk:
+                record_stage('upstream_first_chunk', time.perf_counter() - start,
+                             provider=self.ai_provider, operation=operation)
+                first_chunk = False
+            received += len(chunk.encode('utf-8'))
+            yield chunk
+
+        record_stage('upstream_total', time.perf_counter() - start, provider=self.ai_provider, operation=operation)
+        inc('story_upstream_bytes_received_total', received, provider=self.ai_provider)
+
+    def _llm_stream_text(self, stream):
+        """Text deltas of an LLMStreamChunk stream; token usage comes from the final chunk."""
+        for chunk in stream:
+            if chunk.done:
+                record_tokens(self.ai_provider, chunk.input_token_count, chunk.output_token_count)
+                continue
+            yield chunk.text
+
+    def _stream_openai(self, prompt):
+        from openai import OpenAI
+
+        # OPENAI_BASE_URL (set for Artemox in _configure_openai_base_url) is read by the client
+        client = OpenAI(api_key=self.api_key)
+        params = {
+            'model': self.model_name,
+            'messages': [
+                {'role': 'system', 'content': JSON_SYSTEM_PROMPT},
+                {'role': 'user', 'content': prompt},
+            ],
+            'max_tokens': 4096,
+            'response_format': {'type': 'json_object'},
+            'stream': True,
+        }
+        if self.ai_provider == 'openai':
+            params['stream_options'] = {'include_usage': True}
+
+        for event in client.chat.completions.create(**params):
+            usage = getattr(event, 'usage', None)
+            if usage:
+                record_tokens(self.ai_provider, usage.prompt_tokens, usage.completion_tokens)
+            if event.choices and event.choices[0].delta and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
+
+    def stream_scenes(self, story: str):
+        """
+        Yield scene texts one by one while the extraction completion is still streaming.
+
+        Every scene is validated against the `Scenes` model. An attempt that
+        fails or produces no valid scene is retried up to `stream_max_retries`
+        times; once scenes have been handed out a retry could only duplicate
+        them, so later failures are raised and invalid items are skipped.
+        """
+        with timed('prompt_assembly', operation='stream_scenes'):
+            prompt_template = self.get_prompt_template('scene_extraction')
+
+            if not prompt_template:
+                raise ValueError("Шаблон извлечения сцен не найден в базе данных. Пожалуйста, убедитесь, что промпт-шаблоны инициализированы.")
+
+            prompt = create_optimized_prompt(prompt_template.format(story=story), Scenes)
+
+        count = 0
+        for attempt in range(self.stream_max_retries + 1):
+            parser = StreamingArrayParser('scenes')
+            try:
+                for chunk in self._stream_completion(prompt, 'stream_scenes'):
+                    for item in parser.feed(chunk):
+                        try:
+                            scene = Scenes(scenes=[item]).scenes[0]
+                        except ValidationError:
+                            if not count:
+                                raise
+                            logger.warning("stream_scenes: пропущена некорректная сцена: %r", item)
+                            continue
+                        if scene.strip():
+                            count += 1
+                            yield scene
+            except Exception as e:
+                if count:
+                    raise
+                error = e
+            else:
+                if count:
+                    break
+                error = ValueError("Не удалось извлечь сцены. API не вернул ни одной сцены в ожидаемом формате.")
+
+            inc('story_upstream_errors_total', provider=self.ai_provider, operation='stream_scenes')
+            if attempt == self.stream_max_retries:
+                raise error
+            logger.warning("stream_scenes: попытка %s не удалась (%s), повтор", attempt + 1, error)
+            inc('story_upstream_retries_total', provider=self.ai_provider, operation='stream_scenes')
+            time.sleep(self.stream_retry_delay * 2 ** attempt)
 
+        logger.info("stream_scenes: извлечено сцен: %s", count)
 
     def test_openai_connection(self):
         """Тестирование подключения к OpenAI"""
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import posixpath
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage that names files after the SHA-256 of their bytes.
+
+    The upload_to directory is kept, the original file name is replaced by
+    `<upload_to>/<hash[:2]>/<hash><ext>`. Saving identical bytes twice returns
+    the existing name instead of writing a second copy, so regenerations that
+    produce the same image and cloned projects share one file on disk.
+    Unreferenced files are reclaimed by the `collect_media_garbage` command.
+
+    With MEDIA_RECOMPRESS set to 'webp' or 'png', lossless images are
+    re-encoded losslessly before hashing when that makes them smaller; the
+    returned name carries the matching extension.
+    """
+
+    hash_algorithm = 'sha256'
+
+    def content_hash(self, content):
+        """Return the hex digest of a File's bytes, leaving it rewound."""
+        digest = hashlib.new(self.hash_algorithm)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return digest.hexdigest()
+
+    def hashed_name(self, name, digest):
+        directory, filename = posixpath.split(name.replace('\\', '/'))
+        ext = os.path.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], f"{digest}{ext}")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        recompress = getattr(settings, 'MEDIA_RECOMPRESS', '')
+        if recompress:
+            from stories.services.recompress import recompress_content
+            name, content = recompress_content(
+                name, content, target=recompress,
+                effort=getattr(settings, 'MEDIA_RECOMPRESS_EFFORT', 4)
+            )
+
+        name = self.hashed_name(name, self.content_hash(content))
+        if self.exists(name):
+            # Same bytes already stored: deduplicate by reusing the file, and
+            # touch it so the GC's min_age grace covers the new reference
+            try:
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                pass  # Collected in the meantime; write it again
+        return super().save(name, content, max_length=max_length)
@@ -1,3 +1,818 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from .cache import SQLiteCache
+from .models import Character, GenerationSettings, Project, Scene, SceneCandidate
+from .benchmarks import default_endpoints, heavy_modules, percentile, profile_url_import, run_benchmark, seed_project
+from .fakes import make_png
+from .services.key_pool import GeminiKeyPool, KeyPoolExhausted, is_quota_error
+from .services.media_gc import collect_garbage, run_locked_gc_pass
+from .services.recompress import recompress_bytes
+from .services.metrics import MetricsRegistry, record_stage, registry, render_prometheus, timed
+from .services.json_stream import StreamingArrayParser, StreamingObjectParser
+from .services.single_flight import IdempotencyKeyReused, SingleFlight, flight_key
+
+
+class IsolatedCacheMixin:
+    """
+    Give each test class its own SQLite cache file in a throwaway directory, so
+    parallel workers and concurrent runs never clear each other's entries and
+    the development cache is left alone.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp(prefix='story-test-cache-')
+        cls.cache_override = override_settings(CACHES={'default': {
+            'BACKEND': 'stories.cache.SQLiteCache',
+            'LOCATION': os.path.join(cls.cache_dir, 'cache.sqlite3'),
+        }})
+        cls.cache_override.enable()
+        cls.addClassCleanup(shutil.rmtree, cls.cache_dir, ignore_errors=True)
+        cls.addClassCleanup(cls.cache_override.disable)
+        super().setUpClass()
+
+
+class GeminiKeyPoolTests(IsolatedCacheMixin, SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_acquire_prefers_least_loaded_key(self):
+        pool = GeminiKeyPool(['key-a', 'key-b'], rate_per_minute=600, burst=5)
+        first = pool.acquire(timeout=0)
+        second = pool.acquire(timeout=0)
+        self.assertNotEqual(first.key, second.key)
+        first.release()
+        third = pool.acquire(timeout=0)
+        self.assertEqual(third.key, first.key)
+
+    def test_quota_exhausted_key_is_skipped(self):
+        pool = GeminiKeyPool(['key-a', 'key-b'], rate_per_minute=600, burst=5, cooldown=60)
+        with pool.acquire(timeout=0) as lease:
+            lease.quota_exhausted()
+            bad_key = lease.key
+        for _ in range(3):
+            with pool.acquire(timeout=0) as lease:
+                self.assertNotEqual(lease.key, bad_key)
+
+    def test_raises_when_all_keys_cooling_down(self):
+        pool = GeminiKeyPool(['key-a'], rate_per_minute=600, burst=5, cooldown=60)
+        pool.report_quota_exhausted('key-a')
+        with self.assertRaises(KeyPoolExhausted):
+            pool.acquire(timeout=0.05)
+
+    def test_cooldown_is_shared_with_other_pools(self):
+        GeminiKeyPool(['key-a', 'key-b'], cooldown=60).report_quota_exhausted('key-a')
+        # A pool in another worker process sees the cooldown through the shared cache
+        other = GeminiKeyPool(['key-a', 'key-b'], rate_per_minute=600, burst=5)
+        for _ in range(3):
+            with other.acquire(timeout=0) as lease:
+                self.assertEqual(lease.key, 'key-b')
+
+    def test_token_bucket_limits_burst(self):
+        pool = GeminiKeyPool(['key-a'], rate_per_minute=1, burst=1)
+        pool.acquire(timeout=0).release()
+        with self.assertRaises(KeyPoolExhausted):
+            pool.acquire(timeout=0.05)
+
+    def test_rate_limit_is_off_by_default(self):
+        pool = GeminiKeyPool(['key-a'], rate_per_minute=0)
+        leases = [pool.acquire(timeout=0) for _ in range(10)]
+        self.assertEqual(pool.snapshot()[0]['in_flight'], 10)
+        for lease in leases:
+            lease.release()
+
+    def test_is_quota_error(self):
+        self.assertTrue(is_quota_error('429 RESOURCE_EXHAUSTED'))
+        self.assertFalse(is_quota_error('500 INTERNAL'))
+
+
+class SQLiteCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def make_cache(self, **options):
+        return SQLiteCache(self.path, {'OPTIONS': options})
+
+    def test_entries_are_visible_to_other_instances(self):
+        first, second = self.make_cache(), self.make_cache()
+        first.set('template', {'text': 'hi'}, 60)
+        self.assertEqual(second.get('template'), {'text': 'hi'})
+        self.assertTrue(second.add('lock', 'a', 60))
+        self.assertFalse(first.add('lock', 'b', 60))
+        self.assertEqual(first.get_many(['template', 'lock', 'missing']), {'template': {'text': 'hi'}, 'lock': 'a'})
+        second.delete_many(['template', 'lock'])
+        self.assertIsNone(first.get('template'))
+
+    def test_expired_entries_are_replaced_by_add(self):
+        cache_ = self.make_cache()
+        cache_.set('lock', 'old', 0)
+        self.assertIsNone(cache_.get('lock'))
+        self.assertTrue(cache_.add('lock', 'new', 60))
+        self.assertEqual(cache_.get('lock'), 'new')
+
+    def test_incr_is_atomic_across_threads(self):
+        self.make_cache().set('hits', 0, None)
+
+        def bump():
+            cache_ = self.make_cache()
+            for _ in range(50):
+                cache_.incr('hits')
+
+        threads = [threading.Thread(target=bump) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.make_cache().get('hits'), 200)
+        with self.assertRaises(ValueError):
+            self.make_cache().incr('missing')
+
+    def test_cull_keeps_entry_count_bounded(self):
+        cache_ = self.make_cache(MAX_ENTRIES=50, CULL_FREQUENCY=2)
+        cache_.cull_check_every = 10
+        for i in range(200):
+            cache_.set(f'k{i}', i, 60)
+        count = cache_._connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        self.assertLessEqual(count, 60)
+        self.assertEqual(cache_.get('k199'), 199)
+
+
+class MetricsRegistryTests(IsolatedCacheMixin, SimpleTestCase):
+
+    def test_render_prometheus(self):
+        metrics = MetricsRegistry(buckets=(0.1, 1))
+        metrics.inc('story_upstream_retries_total', provider='gemini')
+        metrics.inc('story_upstream_retries_total', 2, provider='gemini')
+        metrics.observe('story_stage_duration_seconds', 0.5, stage='upstream_total')
+        text = metrics.render_prometheus()
+        self.assertIn('# TYPE story_upstream_retries_total counter', text)
+        self.assertIn('story_upstream_retries_total{provider="gemini"} 3', text)
+        self.assertIn('story_stage_duration_seconds_bucket{stage="upstream_total",le="0.1"} 0', text)
+        self.assertIn('story_stage_duration_seconds_bucket{stage="upstream_total",le="1"} 1', text)
+        self.assertIn('story_stage_duration_seconds_count{stage="upstream_total"} 1', text)
+
+    def test_scrape_sums_every_worker(self):
+        cache.clear()
+        registry.reset()
+        registry.inc('story_upstream_retries_total', 2, provider='gemini')
+        # Another gunicorn worker published its own snapshot
+        other = MetricsRegistry()
+        other.inc('story_upstream_retries_total', 5, provider='gemini')
+        cache.set('metrics:worker:999999', other.snapshot())
+        cache.set('metrics:workers', [999999])
+
+        text = render_prometheus()
+        self.assertIn('story_upstream_retries_total{provider="gemini"} 7', text)
+        registry.reset()
+
+    def test_record_stage_and_timed_share_one_label_set(self):
+        registry.reset()
+        record_stage('upstream_total', 0.2, provider='gemini', operation='generate')
+        with timed('upstream_total', provider='gemini', operation='generate', attempt=1):
+            pass
+        counters, histograms = registry.snapshot()
+        self.assertEqual(list(histograms), [('story_stage_duration_seconds', (
+            ('operation', 'generate'), ('outcome', 'ok'), ('provider', 'gemini'), ('stage', 'upstream_total'),
+        ))])
+        self.assertEqual(histograms[list(histograms)[0]]['count'], 2)
+        registry.reset()
+
+
+class SingleFlightTests(IsolatedCacheMixin, SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_duplicates_share_one_call(self):
+        flights = SingleFlight('test-flights')
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'status': 'success'}
+
+        key = flight_key('scene', 1, 'a prompt')
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do(key, work)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(flights.do(key, work)))
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True])
+
+    def test_idempotency_key_replays_result(self):
+        flights = SingleFlight('test-idem')
+        key = flight_key('scene', 1, 'a prompt')
+        first, _ = flights.do(key, lambda: {'n': 1}, idempotency_key='abc')
+        second, shared = flights.do(key, lambda: {'n': 2}, idempotency_key='abc')
+        self.assertEqual(second, first)
+        self.assertTrue(shared)
+        third, shared = flights.do(key, lambda: {'n': 3})
+        self.assertEqual(third, {'n': 3})
+        self.assertFalse(shared)
+
+    def test_idempotency_key_reused_for_other_request_is_rejected(self):
+        flights = SingleFlight('test-idem-conflict')
+        flights.do(flight_key('scene', 1, 'a prompt'), lambda: {'n': 1}, idempotency_key='abc')
+        with self.assertRaises(IdempotencyKeyReused):
+            flights.do(flight_key('scene', 2, 'a prompt'), lambda: {'n': 2}, idempotency_key='abc')
+
+
+class StreamScenesTests(IsolatedCacheMixin, SimpleTestCase):
+
+    class StreamingLLM:
+        """Yields scripted LLMStreamChunk-like objects, one script per call."""
+
+        def __init__(self, *scripts):
+            self.scripts = list(scripts)
+            self.calls = 0
+
+        def generate_response_stream(self, **kwargs):
+            self.calls += 1
+            text = self.scripts.pop(0)
+            if isinstance(text, Exception):
+                raise text
+            for i in range(0, len(text), 7):
+                yield SimpleNamespace(text=text[i:i + 7], done=False)
+            yield SimpleNamespace(text='', done=True, input_token_count=11, output_token_count=5)
+
+    def processor(self, llm):
+        from .services.story_processing import StoryProcessor
+
+        processor = StoryProcessor.__new__(StoryProcessor)
+        processor.llm_instance = llm
+        processor.ai_provider = 'openai'
+        processor.stream_retry_delay = 0
+        processor.get_prompt_template = lambda template_type: '{story}'
+        return processor
+
+    def test_chunks_are_read_and_tokens_recorded(self):
+        registry.reset()
+        llm = self.StreamingLLM(json.dumps({'scenes': ['One.', 'Two.']}))
+        self.assertEqual(list(self.processor(llm).stream_scenes('story')), ['One.', 'Two.'])
+        counters, _ = registry.snapshot()
+        self.assertEqual(counters[('story_tokens_total', (('direction', 'input'), ('provider', 'openai')))], 11)
+
+    def test_unparseable_attempt_is_retried(self):
+        llm = self.StreamingLLM('not json', Exception('502'), json.dumps({'scenes': [1]}), json.dumps({'scenes': ['Ok.']}))
+        self.assertEqual(list(self.processor(llm).stream_scenes('story')), ['Ok.'])
+        self.assertEqual(llm.calls, 4)
+
+    def test_gives_up_after_max_retries(self):
+        processor = self.processor(self.StreamingLLM(*['{}'] * 4))
+        with self.assertRaises(ValueError):
+            list(processor.stream_scenes('story'))
+
+
+class StreamingArrayParserTests(SimpleTestCase):
+
+    def test_items_are_emitted_as_soon_as_complete(self):
+        parser = StreamingArrayParser('scenes')
+        self.assertEqual(parser.feed('{"scenes": ["Ali says \\"hi, there\\"", "Sec'), ['Ali says "hi, there"'])
+        self.assertEqual(parser.feed('ond [scene]"'), ['Second [scene]'])
+        self.assertEqual(parser.feed(', {"a": [1]}]}'), [{'a': [1]}])
+        self.assertTrue(parser.finished)
+
+    def test_object_members_are_emitted_as_pairs(self):
+        parser = StreamingObjectParser('projects')
+        self.assertEqual(parser.feed('{"projects": {"A": {"style": "x}"}, "B'), [('A', {'style': 'x}'})])
+        self.assertEqual(parser.feed('": "plain"}}'), [('B', 'plain')])
+        self.assertTrue(parser.finished)
+
+
+class UrlImportTests(SimpleTestCase):
+    """Loading the URLconf (every worker boot and `manage.py` check) must not import the AI SDKs.
+
+    The wall-clock budget is checked by `manage.py benchmark_imports --max-ms`.
+    """
+
+    def test_urls_import_skips_ai_sdks(self):
+        self.assertEqual(heavy_modules(profile_url_import()), [])
+
+
+class GenerationSettingsKeysTests(IsolatedCacheMixin, TestCase):
+
+    def test_google_api_keys_deduplicates_and_keeps_primary_first(self):
+        settings = GenerationSettings.get_settings()
+        settings.google_api_key = 'primary'
+        settings.google_api_keys = 'second\nprimary\n\nthird, second'
+        settings.save()
+        self.assertEqual(settings.get_google_api_keys(), ['primary', 'second', 'third'])
+
+
+class MediaTestMixin(IsolatedCacheMixin):
+    """Point MEDIA_ROOT at a throwaway directory and start from an empty cache."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.media_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_override.enable()
+
+    def tearDown(self):
+        self.media_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        super().tearDown()
+
+
+class ContentAddressedStorageTests(MediaTestMixin, TestCase):
+
+    def test_identical_bytes_are_stored_once(self):
+        project = Project.objects.create(name='P')
+        first = Scene.objects.create(project=project, name='A', prompt='a')
+        second = Scene.objects.create(project=project, name='B', prompt='b')
+        first.approved_image = ContentFile(b'same-bytes', name='project_1_scene_1.png')
+        first.save()
+        second.approved_image = ContentFile(b'same-bytes', name='project_1_scene_2.png')
+        second.save()
+
+        self.assertEqual(first.approved_image.name, second.approved_image.name)
+        self.assertTrue(first.approved_image.name.startswith('generated_images/'))
+        self.assertTrue(first.approved_image.name.endswith('.png'))
+
+    def test_reusing_an_old_file_refreshes_its_mtime(self):
+        project = Project.objects.create(name='P')
+        scene = Scene.objects.create(project=project, name='A', prompt='a')
+        scene.approved_image = ContentFile(b'same-bytes', name='a.png')
+        scene.save()
+        scene.approved_image = ContentFile(b'other-bytes', name='b.png')
+        scene.save()
+        # The first file is now an old orphan
+        old = time.time() - 7200
+        orphan = os.path.join(self.media_root, collect_garbage(dry_run=True, min_age=0)['files'][0])
+        os.utime(orphan, (old, old))
+
+        # Saved again, e.g. by a regeneration whose row is not committed yet
+        Scene._meta.get_field('approved_image').storage.save('generated_images/c.png', ContentFile(b'same-bytes'))
+        self.assertGreater(os.path.getmtime(orphan), old)
+        self.assertEqual(collect_garbage(dry_run=True, min_age=3600)['count'], 0)
+
+
+class MediaRecompressionTests(MediaTestMixin, TestCase):
+
+    def _scene(self):
+        project = Project.objects.create(name='P')
+        return Scene.objects.create(project=project, name='A', prompt='a')
+
+    def test_png_saved_as_lossless_webp(self):
+        scene = self._scene()
+        with override_settings(MEDIA_RECOMPRESS='webp'):
+            scene.approved_image = ContentFile(make_png(8192), name='project_1_scene_1.png')
+            scene.save()
+        self.assertTrue(scene.approved_image.name.endswith('.webp'))
+        self.assertLess(scene.approved_image.size, 8192)
+
+    def test_backfill_command_repoints_rows_and_reports_savings(self):
+        scene = self._scene()
+        scene.approved_image = ContentFile(make_png(8192), name='project_1_scene_1.png')
+        scene.save()
+        old_path = scene.approved_image.path
+
+        out = StringIO()
+        call_command('recompress_media', stdout=out)
+
+        scene.refresh_from_db()
+        self.assertTrue(scene.approved_image.name.startswith('generated_images/'))
+        self.assertTrue(scene.approved_image.name.endswith('.webp'))
+        self.assertFalse(os.path.exists(old_path))
+        self.assertIn('Recompressed 1 images', out.getvalue())
+
+    def test_lossy_conversions_are_skipped(self):
+        from PIL import Image
+
+        def encode(image, **params):
+            buffer = BytesIO()
+            image.save(buffer, **params)
+            return buffer.getvalue()
+
+        deep = encode(Image.new('I;16', (64, 64), 4000), format='PNG')
+        cmyk = encode(Image.new('CMYK', (64, 64), (1, 2, 3, 4)), format='TIFF')
+        frames = [Image.new('RGB', (64, 64), color) for color in ('red', 'blue')]
+        animated = encode(frames[0], format='PNG', save_all=True, append_images=frames[1:])
+        for data in (deep, cmyk, animated):
+            self.assertIsNone(recompress_bytes(data, 'webp'))
+            self.assertIsNone(recompress_bytes(data, 'png'))
+
+    def test_icc_profile_is_kept(self):
+        from PIL import Image, ImageCms
+
+        profile = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+        buffer = BytesIO()
+        Image.new('RGB', (256, 256), 'white').save(buffer, format='TIFF', icc_profile=profile)
+        data, _ = recompress_bytes(buffer.getvalue(), 'webp')
+        self.assertEqual(Image.open(BytesIO(data)).info.get('icc_profile'), profile)
+
+
+class MediaGarbageCollectionTests(MediaTestMixin, TestCase):
+
+    def test_orphans_are_reported_then_removed(self):
+        project = Project.objects.create(name='P')
+        scene = Scene.objects.create(project=project, name='A', prompt='a')
+        scene.approved_image = ContentFile(b'old', name='old.png')
+        scene.save()
+        orphan = scene.approved_image.name
+        scene.approved_image = ContentFile(b'new', name='new.png')
+        scene.save()
+        live = scene.approved_image.name
+
+        report = collect_garbage(dry_run=True, min_age=0)
+        self.assertEqual(report['files'], [orphan])
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, orphan)))
+
+        call_command('collect_media_garbage', min_age=0, stdout=StringIO())
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, orphan)))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, live)))
+
+    def test_recent_files_are_kept(self):
+        os.makedirs(os.path.join(self.media_root, 'generated_images'))
+        with open(os.path.join(self.media_root, 'generated_images', 'fresh.png'), 'wb') as f:
+            f.write(b'x')
+        self.assertEqual(collect_garbage(dry_run=True, min_age=3600)['count'], 0)
+
+    def test_only_one_process_runs_a_pass_per_interval(self):
+        cache.delete('media_gc_running')
+        self.assertTrue(run_locked_gc_pass(interval=60, min_age=0))
+        # Another worker waking up within the interval skips the pass
+        self.assertFalse(run_locked_gc_pass(interval=60, min_age=0))
+        cache.delete('media_gc_running')
+
+
+class CharacterRenameTests(IsolatedCacheMixin, TestCase):
+
+    def test_rename_rewrites_both_prompt_fields_in_one_query(self):
+        project = Project.objects.create(name='P')
+        other = Project.objects.create(name='Other')
+        character = Character.objects.create(project=project, name='Ali', description='a boy')
+        Scene.objects.create(project=project, name='S1', prompt='{Ali} runs', final_prompt='{Ali} runs fast')
+        Scene.objects.create(project=project, name='S2', prompt='Nobody here')
+        Scene.objects.create(project=other, name='S3', prompt='{Ali} elsewhere')
+
+        with self.assertNumQueries(1):
+            updated = Scene.rename_character_placeholder(project, 'Ali', 'Omar')
+
+        self.assertEqual(updated, 1)
+        scene = Scene.objects.get(name='S1')
+        self.assertEqual(scene.prompt, '{Omar} runs')
+        self.assertEqual(scene.final_prompt, '{Omar} runs fast')
+        self.assertEqual(Scene.objects.get(name='S3').prompt, '{Ali} elsewhere')
+
+        Character.objects.filter(pk=character.pk).update(name='Omar')
+        response = self.client.post(
+            f'/project/{project.pk}/character/{character.pk}/edit/',
+            {'name': 'Zaid', 'description': 'a boy', 'update_placeholders': 'on'},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Scene.objects.get(name='S1').final_prompt, '{Zaid} runs fast')
+
+
+class SceneOrderTests(IsolatedCacheMixin, TestCase):
+
+    def setUp(self):
+        self.project = Project.objects.create(name='P')
+        self.scenes = [
+            Scene.objects.create(project=self.project, name=f'S{i}', prompt='p') for i in range(1, 6)
+        ]
+
+    def test_new_scenes_are_spaced_by_gap(self):
+        self.assertEqual([s.order for s in self.scenes], [Scene.ORDER_GAP * i for i in range(1, 6)])
+
+    def test_reorder_is_one_select_and_one_update(self):
+        new_ids = [s.pk for s in reversed(self.scenes)]
+        # Savepoint pair + select + bulk update
+        with self.assertNumQueries(4):
+            updated = Scene.reorder(self.project, new_ids)
+        self.assertEqual(updated, 4)  # the middle scene keeps its order
+        self.assertEqual(list(self.project.scenes.values_list('pk', flat=True)), new_ids)
+
+        with self.assertRaises(ValueError):
+            Scene.reorder(self.project, new_ids[:-1])
+
+    def test_insert_takes_midpoint_and_renumbers_only_when_gap_is_used_up(self):
+        first, second = self.scenes[0], self.scenes[1]
+        for _ in range(10):
+            Scene.objects.create(
+                project=self.project, name='I', prompt='p', order=Scene.order_after(self.project, first)
+            )
+        self.assertEqual(Scene.objects.get(pk=second.pk).order, second.order)
+
+        Scene.objects.create(project=self.project, name='Last', prompt='p', order=Scene.order_after(self.project, first))
+        names = list(self.project.scenes.values_list('name', flat=True))
+        self.assertEqual(names[:2], ['S1', 'Last'])
+        self.assertEqual(names[-4:], ['S2', 'S3', 'S4', 'S5'])
+
+    def test_reorder_and_insert_views(self):
+        new_ids = [s.pk for s in reversed(self.scenes)]
+        response = self.client.post(
+            f'/project/{self.project.pk}/scenes/reorder/',
+            json.dumps({'scene_ids': new_ids}), content_type='application/json',
+        )
+        self.assertEqual(response.json()['updated'], 4)
+        self.assertEqual(list(self.project.scenes.values_list('pk', flat=True)), new_ids)
+
+        response = self.client.post(
+            f'/project/{self.project.pk}/scenes/reorder/',
+            json.dumps({'scene_ids': [new_ids[0]]}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            f'/project/{self.project.pk}/scenes/insert/',
+            json.dumps({'prompt': 'new scene', 'after_scene_id': new_ids[0]}), content_type='application/json',
+        )
+        data = response.json()
+        self.assertEqual(data['status'], 'success')
+        self.assertEqual(list(self.project.scenes.values_list('pk', flat=True))[:2], [new_ids[0], data['id']])
+
+    def test_reorder_and_insert_reject_malformed_bodies(self):
+        bodies = {
+            'reorder': [[1, 2], 'scene_ids', {'scene_ids': 'abc'}, {'scene_ids': ['1', 2]}, {'scene_ids': [True]}],
+            'insert': [
+                ['prompt'], 3, {'prompt': 5}, {'prompt': 'p', 'name': ['n']},
+                {'prompt': 'p', 'after_scene_id': 'abc'}, {'prompt': 'p', 'after_scene_id': [1]},
+            ],
+        }
+        for action, cases in bodies.items():
+            for body in cases:
+                with self.subTest(action=action, body=body):
+                    response = self.client.post(
+                        f'/project/{self.project.pk}/scenes/{action}/',
+                        json.dumps(body), content_type='application/json',
+                    )
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.json()['status'], 'error')
+        self.assertEqual(self.project.scenes.count(), 5)
+
+
+@override_settings(
+    GEMINI_CLIENT_CLASS='stories.fakes.FakeGeminiClient',
+    STORY_LLM_CLASS='stories.fakes.FakeLLM',
+    FAKE_UPSTREAM={'image_size': 2048, 'scene_count': 3},
+    GOOGLE_API='fake-key',
+    OPENAI_KEY='fake-key',
+    GEMINI_KEY_RATE_PER_MINUTE=10 ** 6,
+    GEMINI_KEY_BURST=10 ** 6,
+)
+class FakeUpstreamViewTests(MediaTestMixin, TestCase):
+
+    def test_generate_image_ajax_uses_fake_gemini(self):
+        project = seed_project(scene_count=1, character_count=1, with_images=False)
+        scene = project.scenes.get()
+        response = self.client.post(f'/project/{project.pk}/scene/{scene.pk}/generate-ajax/')
+        self.assertEqual(response.json()['status'], 'success')
+        scene.refresh_from_db()
+        self.assertTrue(scene.approved_image.name.endswith('.png'))
+        project.refresh_from_db()
+        self.assertEqual(project.generation_count, 1)
+
+    def test_generate_image_form_post_uses_fake_gemini(self):
+        project = seed_project(scene_count=1, character_count=1, with_images=False)
+        scene = project.scenes.get()
+        response = self.client.post(f'/project/{project.pk}/scene/{scene.pk}/generate/')
+        self.assertRedirects(response, f'/project/{project.pk}/scene/{scene.pk}/', fetch_redirect_response=False)
+        scene.refresh_from_db()
+        self.assertTrue(scene.approved_image.name.endswith('.png'))
+
+    def test_repeated_idempotency_key_is_not_charged_twice(self):
+        project = seed_project(scene_count=1, character_count=1, with_images=False)
+        character = project.characters.get()
+        url = f'/project/{project.pk}/character/{character.pk}/generate-image/'
+        first = self.client.post(url, HTTP_IDEMPOTENCY_KEY='click-1').json()
+        second = self.client.post(url, HTTP_IDEMPOTENCY_KEY='click-1').json()
+        self.assertEqual(first['status'], 'success')
+        self.assertEqual(second['image_url'], first['image_url'])
+        self.assertTrue(second['deduplicated'])
+        project.refresh_from_db()
+        self.assertEqual(project.generation_count, 1)
+
+        other = Character.objects.create(project=project, name='Other', description='d')
+        url = f'/project/{project.pk}/character/{other.pk}/generate-image/'
+        reused = self.client.post(url, HTTP_IDEMPOTENCY_KEY='click-1').json()
+        self.assertEqual(reused['status'], 'error')
+
+    def test_candidates_generated_in_parallel_and_promoted(self):
+        project = seed_project(scene_count=1, character_count=1, with_images=False)
+        scene = project.scenes.get()
+        data = self.client.post(f'/project/{project.pk}/scene/{scene.pk}/candidates/', {'count': 3}).json()
+        self.assertEqual(data['status'], 'success')
+        self.assertEqual(len(data['candidates']), 3)
+        self.assertTrue(all(c.thumbnail for c in scene.candidates.all()))
+        project.refresh_from_db()
+        self.assertEqual(project.generation_count, 3)
+
+        candidate = scene.candidates.last()
+        self.client.post(f'/project/{project.pk}/scene/{scene.pk}/candidates/{candidate.pk}/promote/')
+        scene.refresh_from_db()
+        self.assertEqual(scene.approved_image.name, candidate.image.name)
+
+    def test_expired_candidates_are_purged_but_approved_file_kept(self):
+        project = seed_project(scene_count=1, character_count=0, with_images=False)
+        scene = project.scenes.get()
+        kept = SceneCandidate.objects.create(scene=scene, image=ContentFile(make_png(256), name='a.png'))
+        dropped = SceneCandidate.objects.create(scene=scene, image=ContentFile(make_png(256), name='b.png'))
+        kept.promote()
+        SceneCandidate.objects.update(created_at=timezone.now() - timedelta(days=30))
+
+        self.assertEqual(SceneCandidate.purge_expired(retention=3600), 2)
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, kept.image.name)))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, dropped.image.name)))
+
+    def test_bulk_edit_applies_prompt_to_selected_scenes(self):
+        project = seed_project(scene_count=4, character_count=1)
+        scenes = list(project.scenes.all())
+        scenes[3].approved_image = None
+        scenes[3].save()
+        selected = [scenes[0].pk, scenes[1].pk, scenes[3].pk]
+
+        data = self.client.post(
+            f'/project/{project.pk}/bulk-edit/',
+            data=json.dumps({'edit_prompt': 'Make it night', 'scene_ids': selected}),
+            content_type='application/json',
+        ).json()
+
+        statuses = {r['scene_id']: r['status'] for r in data['results']}
+        self.assertEqual(statuses, {scenes[0].pk: 'success', scenes[1].pk: 'success', scenes[3].pk: 'skipped'})
+        self.assertEqual(
+            list(project.scenes.filter(edit_prompt='Make it night').values_list('pk', flat=True)),
+            selected[:2],
+        )
+        project.refresh_from_db()
+        self.assertEqual(project.generation_count, 2)
+
+    def test_bulk_edit_rejects_malformed_bodies(self):
+        project = seed_project(scene_count=1, character_count=1, with_images=False)
+        url = f'/project/{project.pk}/bulk-edit/'
+        for body in (
+            ['not', 'an', 'object'],
+            {'edit_prompt': 'x', 'scene_ids': ['a']},
+            {'edit_prompt': 'x', 'scene_ids': '12'},
+            {'edit_prompt': 7},
+        ):
+            response = self.client.post(url, data=json.dumps(body), content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['status'], 'error')
+
+    def test_story_input_stream_saves_scenes_incrementally(self):
+        project = Project.objects.create(name='P')
+        response = self.client.post(f'/project/{project.pk}/story-input/stream/', {'story_text': 'Hero1 meets Hero2.'})
+        events = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+        self.assertEqual([e['event'] for e in events], ['characters', 'scene', 'scene', 'scene', 'done'])
+        self.assertEqual(events[1]['characters'], ['Hero1'])
+        self.assertEqual(project.scenes.get(pk=events[1]['id']).characters.get().name, 'Hero1')
+
+    def test_story_input_uses_fake_llm(self):
+        project = Project.objects.create(name='P')
+        self.client.post(f'/project/{project.pk}/story-input/', {'story_text': 'Hero1 meets Hero2.'})
+        self.assertEqual(project.scenes.count(), 3)
+        self.assertEqual(project.characters.count(), 2)
+
+    def test_benchmark_reports_every_endpoint(self):
+        project = seed_project(scene_count=2, character_count=1)
+        results = run_benchmark(default_endpoints(project), requests=2)
+        self.assertEqual(len(results), 7)
+        for row in results:
+            self.assertEqual(row['errors'], 0, row['name'])
+            self.assertLessEqual(row['p50'], row['p99'])
+
+    def test_generation_records_stage_metrics(self):
+        registry.reset()
+        project = seed_project(scene_count=1, character_count=1, with_images=False)
+        scene = project.scenes.get()
+        self.client.post(f'/project/{project.pk}/scene/{scene.pk}/generate-ajax/')
+
+        body = self.client.get('/metrics/').content.decode()
+        for stage in ('settings_load', 'prompt_assembly', 'upstream_first_chunk',
+                      'upstream_total', 'file_save', 'cost_write'):
+            self.assertIn(f'stage="{stage}"', body)
+        self.assertIn('story_upstream_bytes_received_total{provider="gemini"}', body)
+        self.assertIn('story_tokens_total{direction="output",provider="gemini"} 1290', body)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2)
+        self.assertEqual(percentile(list(range(1, 101)), 99), 99)
+
+
+class ProjectTransferTests(MediaTestMixin, TestCase):
+
+    def test_import_shipped_projects_data(self):
+        out = StringIO()
+        call_command('import_projects', 'projects_data.json', '--batch-size', '1', '--images-dir', self.media_root, stdout=out)
+
+        project = Project.objects.get(name='test')
+        self.assertEqual(project.characters.count(), 9)
+        scenes = list(project.scenes.all())
+        self.assertEqual(scenes[0].name, 'Scene 1')
+        self.assertEqual([s.order for s in scenes[:2]], [Scene.ORDER_GAP, 2 * Scene.ORDER_GAP])
+        self.assertEqual(list(scenes[0].characters.values_list('name', flat=True)), ['Lily'])
+        self.assertIn('scene images were not found', out.getvalue())
+
+    def test_export_import_round_trip_in_batches(self):
+        for _ in range(3):
+            seed_project(scene_count=4, character_count=2)
+        Project.objects.create(name='Empty')
+        path = os.path.join(self.media_root, 'export.json')
+        call_command('export_projects', '-o', path, stderr=StringIO())
+
+        with open(path, encoding='utf-8') as f:
+            exported = json.load(f)['projects']
+        self.assertEqual(len(exported), 4)  # repeated seed names get a suffix
+        self.assertEqual(exported['Empty']['scenes'], [])
+
+        Project.objects.all().delete()
+        from .services.project_transfer import import_projects
+        with open(path, encoding='utf-8') as f:
+            # Per batch of 2 projects: savepoint pair + one insert per table
+            with self.assertNumQueries(12):
+                report = import_projects(f, batch_size=2)
+        self.assertEqual(report, {'projects': 4, 'characters': 6, 'scenes': 12, 'missing_images': 0, 'invalid_images': 0})
+        scene = Scene.objects.filter(project__name=next(iter(exported))).first()
+        self.assertTrue(scene.approved_image.name)
+        self.assertEqual(scene.characters.count(), 1)
+
+    def test_path_traversal_entries_are_reported_not_raised(self):
+        images_dir = os.path.join(self.media_root, 'archive')
+        os.makedirs(images_dir)
+        with open(os.path.join(self.media_root, 'secret.png'), 'wb') as f:
+            f.write(b'outside')
+        path = os.path.join(images_dir, 'projects_data.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'projects': {'P': {'scenes': [
+                {'name': 'A', 'prompt': 'a', 'approved_image': '../../../../etc/passwd'},
+                {'name': 'B', 'prompt': 'b', 'approved_image': '..\\secret.png'},
+            ]}}}, f)
+
+        out = StringIO()
+        call_command('import_projects', path, stdout=out)
+        self.assertIn('2 scene image paths were invalid archive entries', out.getvalue())
+        self.assertEqual(list(Scene.objects.values_list('approved_image', flat=True)), ['', ''])
+
+
+class ProjectCloneTests(MediaTestMixin, TestCase):
+
+    def test_clone_copies_rows_and_shares_images(self):
+        project = seed_project(scene_count=5, character_count=2)
+        character = project.characters.first()
+        character.generated_image = ContentFile(b'portrait', name='hero.png')
+        character.save()
+
+        # Savepoint pair + project insert + select/bulk insert for characters, scenes, links
+        with self.assertNumQueries(9):
+            fork = project.clone(style='Manga-style')
+
+        self.assertEqual(fork.style, 'Manga-style')
+        self.assertEqual(fork.color_scheme, project.color_scheme)
+        self.assertEqual(fork.scenes.count(), 5)
+        self.assertEqual(fork.characters.count(), 2)
+        self.assertEqual(
+            list(fork.scenes.values_list('order', 'approved_image')),
+            list(project.scenes.values_list('order', 'approved_image')),
+        )
+        fork_scene = fork.scenes.get(order=Scene.ORDER_GAP)
+        self.assertEqual(fork_scene.characters.get().project, fork)
+        self.assertEqual(fork.characters.get(name=character.name).generated_image.name, character.generated_image.name)
+
+    def test_clone_rejects_unknown_style(self):
+        project = seed_project(scene_count=1, character_count=1, with_images=False)
+        with self.assertRaises(ValidationError):
+            project.clone(style='not-a-style')
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_clone_view_redirects_to_fork(self):
+        project = seed_project(scene_count=1, character_count=1, with_images=False)
+        response = self.client.post(f'/project/{project.pk}/clone/', {'name': 'Fork'})
+        fork = Project.objects.get(name='Fork')
+        self.assertRedirects(response, f'/project/{fork.pk}/')
@@ -6,8 +6,10 @@ urlpatterns = [
     path('project/new/', views.ProjectCreateView.as_view(), name='project_create'),
     path('project/<int:pk>/', views.project_detail, name='project_detail'),
     path('project/<int:pk>/story-input/', views.story_input, name='story_input'),
+    path('project/<int:pk>/story-input/stream/', views.story_input_stream, name='story_input_stream'),
     path('project/<int:pk>/viewer/', views.story_viewer, name='story_viewer'),
     path('project/<int:pk>/delete/', views.delete_project, name='project_delete'),
+    path('project/<int:pk>/clone/', views.clone_project, name='project_clone'),
     path('project/<int:pk>/update-style/', views.update_style, name='update_style'),
     path('project/<int:pk>/update-color-scheme/', views.update_color_scheme, name='update_color_scheme'),
     path('project/<int:project_pk>/scene/<int:scene_pk>/', views.scene_manager, name='scene_manager'),
@@ -15,6 +17,11 @@ urlpatterns = [
     path('project/<int:project_pk>/scene/<int:scene_pk>/generate-ajax/', views.generate_image_ajax, name='generate_image_ajax'),
     path('project/<int:project_pk>/scene/<int:scene_pk>/edit/', views.edit_scene_image, name='edit_scene_image'),
     path('project/<int:project_pk>/scene/<int:scene_pk>/edit-ajax/', views.edit_scene_image_ajax, name='edit_scene_image_ajax'),
+    path('project/<int:project_pk>/bulk-edit/', views.bulk_edit_scenes_ajax, name='bulk_edit_scenes_ajax'),
+    path('project/<int:project_pk>/scenes/reorder/', views.reorder_scenes_ajax, name='reorder_scenes_ajax'),
+    path('project/<int:project_pk>/scenes/insert/', views.insert_scene_ajax, name='insert_scene_ajax'),
+    path('project/<int:project_pk>/scene/<int:scene_pk>/candidates/', views.generate_scene_candidates_ajax, name='generate_scene_candidates_ajax'),
+    path('project/<int:project_pk>/scene/<int:scene_pk>/candidates/<int:candidate_pk>/promote/', views.promote_scene_candidate, name='promote_scene_candidate'),
 
     # Character management URLs
     path('project/<int:project_pk>/character/add/', views.character_add, name='character_add'),
@@ -33,4 +40,7 @@ urlpatterns = [
 
     # Settings URLs
     path('settings/', views.generation_settings, name='generation_settings'),
+
+    # Prometheus metrics
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -1,24 +1,43 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, CreateView, DetailView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
+from django.conf import settings
 from django.core.cache import cache
-import re
+from django.core.exceptions import ValidationError
+from django.db import transaction
 import json
 import time
 
-from .models import Project, Character, Scene, PromptTemplate, GenerationSettings, GenerationCost
-from .services.story_processing import StoryProcessor
-from .services.image_generation import ImageGenerator
-from .services.character_generation import CharacterGenerator
+from .models import Project, Character, Scene, SceneCandidate, PromptTemplate, GenerationSettings, GenerationCost
+# The AI service layer (google-genai, SimplerLLM/OpenAI SDKs) is imported lazily by
+# _image_generator() / _story_processor() so worker boot and management commands don't pay for it
+from .services.candidates import generate_scene_candidates
+from .services.bulk_edit import bulk_edit_scenes
+from .services.story_ingestion import ingest_story
+from .services.media_gc import delete_unshared_file
+from .services.metrics import record_stage, render_prometheus, timed
+from .services.single_flight import IdempotencyKeyReused, flight_key, generation_flights, request_idempotency_key
 from .forms import PromptTemplateForm, PromptTestForm, GenerationSettingsForm
 from decimal import Decimal
 from django.db.models import Sum, Count, Q
 
 
+def _image_generator():
+    """New ImageGenerator; google-genai is imported on first use, not at worker boot."""
+    from .services.image_generation import ImageGenerator
+    return ImageGenerator()
+
+
+def _story_processor():
+    """New StoryProcessor; SimplerLLM and the OpenAI SDK are imported on first use."""
+    from .services.story_processing import StoryProcessor
+    return StoryProcessor()
+
+
 class ProjectListView(ListView):
     model = Project
     template_name = 'stories/project_list.html'
@@ -41,17 +60,8 @@ def project_detail(request, pk):
         'project': project,
         'characters': characters,
         'scenes': scenes,
-        'styles': [
-            "Ghibli-style", "line-art-style", "pixel-art-style",
-            "water-color-style", "Fairy-Tale-style", "Game-RPG-Style",
-            "Game-Zelda-Style", "Manga-style", "Pixar-3d-style",
-            "Anime-style", "Watercolor-style", "Cinematic-style",
-            "wimpy-kid-style"
-        ],
-        'color_schemes': [
-            "colored", "black-and-white", "grayscale",
-            "sepia", "monochrome", "vibrant", "pastel"
-        ]
+        'styles': Project.STYLES,
+        'color_schemes': Project.COLOR_SCHEMES
     }
     return render(request, 'stories/project_detail.html', context)
 
@@ -64,58 +74,52 @@ def story_input(request, pk):
 
         if story_text:
             try:
-                processor = StoryProcessor()
-
-                # Extract characters
-                extracted_characters = processor.extract_characters(story_text)
-
-                # Save characters to database
-                for char in extracted_characters:
-                    Character.objects.create(
-                        project=project,
-                        name=char.name,
-                        description=char.description
-                    )
-
-                # Extract scenes
-                extracted_scenes = processor.extract_scenes(story_text)
+                processor = _story_processor()
+                summary = None
+                for event in ingest_story(project, story_text, processor):
+                    if event['event'] == 'error':
+                        raise Exception(event['message'])
+                    if event['event'] == 'done':
+                        summary = event
+
+                messages.success(request, f"Extracted {summary['characters']} characters and {summary['scenes']} scenes!")
+                return redirect('project_detail', pk=project.pk)
 
-                # Process scenes with character placeholders
-                for i, scene_text in enumerate(extracted_scenes):
-                    processed_scene = scene_text
+            except Exception as e:
+                messages.error(request, f"Error processing story: {str(e)}")
 
-                    # Replace character names with placeholders
-                    for char in extracted_characters:
-                        processed_scene = re.sub(
-                            r'\b' + re.escape(char.name) + r'\b',
-                            f"{{{char.name}}}",
-                            processed_scene,
-                            flags=re.IGNORECASE
-                        )
+    return render(request, 'stories/story_input.html', {'project': project})
 
-                    # Create scene in database
-                    scene = Scene.objects.create(
-                        project=project,
-                        name=f"Scene {i+1}",
-                        prompt=processed_scene,
-                        order=i+1
-                    )
 
-                    # Auto-detect and link characters mentioned in the scene
-                    for char in extracted_characters:
-                        if f"{{{char.name}}}" in processed_scene:
-                            # Get the Character object from database
-                            db_char = Character.objects.filter(project=project, name=char.name).first()
-                            if db_char:
-                                scene.characters.add(db_char)
+@require_POST
+def story_input_stream(request, pk):
+    """Streaming story ingestion: one JSON line per progress event (NDJSON).
 
-                messages.success(request, f"Extracted {len(extracted_characters)} characters and {len(extracted_scenes)} scenes!")
-                return redirect('project_detail', pk=project.pk)
+    Scenes are saved as soon as they are parsed out of the LLM stream, so the
+    browser can show them long before the whole extraction is finished.
+    """
+    project = get_object_or_404(Project, pk=pk)
+    story_text = request.POST.get('story_text', '')
 
-            except Exception as e:
-                messages.error(request, f"Error processing story: {str(e)}")
+    def events():
+        if not story_text:
+            yield json.dumps({'event': 'error', 'message': 'Please enter your story text'}) + '\n'
+            return
+        try:
+            processor = _story_processor()
+        except Exception as e:
+            yield json.dumps({'event': 'error', 'message': f"Error processing story: {str(e)}"}) + '\n'
+            return
+        for event in ingest_story(project, story_text, processor):
+            if event['event'] == 'done':
+                event['redirect_url'] = reverse('project_detail', args=[project.pk])
+            yield json.dumps(event) + '\n'
 
-    return render(request, 'stories/story_input.html', {'project': project})
+    response = StreamingHttpResponse(events(), content_type='application/x-ndjson')
+    # Keep reverse proxies from buffering the progress events
+    response['X-Accel-Buffering'] = 'no'
+    response['Cache-Control'] = 'no-cache'
+    return response
 
 
 def scene_manager(request, project_pk, scene_pk):
@@ -143,10 +147,9 @@ def scene_manager(request, project_pk, scene_pk):
         messages.success(request, "Scene updated successfully!")
 
     # Generate the final prompt preview - EXACTLY as it will be sent to the API
-    from .services.image_generation import ImageGenerator
     from .models import PromptTemplate
 
-    generator = ImageGenerator()
+    generator = _image_generator()
     characters = project.characters.all()
     selected_chars = scene.characters.all()
 
@@ -235,175 +238,153 @@ def scene_manager(request, project_pk, scene_pk):
         'selected_characters': scene.characters.all(),
         'final_prompt_preview': preview_prompt,
         'reference_notes': reference_notes,
-        'style_template_status': style_template_status
+        'style_template_status': style_template_status,
+        'candidates': scene.candidates.all(),
+        'candidate_range': range(2, getattr(settings, 'SCENE_CANDIDATE_MAX', 5) + 1),
     }
     return render(request, 'stories/scene_manager.html', context)
 
 
+def _run_single_flight(request, scope, key, work):
+    """Run `work` once per in-flight key; duplicates get the same JSON payload.
+
+    Successful payloads are also replayed for a repeated Idempotency-Key.
+    """
+    try:
+        response_data, shared = generation_flights.do(
+            key, work,
+            idempotency_key=request_idempotency_key(request, scope),
+            remember=lambda data: data.get('status') == 'success'
+        )
+    except IdempotencyKeyReused as e:
+        return {'status': 'error', 'message': str(e)}
+    if shared:
+        response_data = dict(response_data, deduplicated=True)
+    return response_data
+
+
 @require_POST
 def generate_image(request, project_pk, scene_pk):
     project = get_object_or_404(Project, pk=project_pk)
     scene = get_object_or_404(Scene, pk=scene_pk, project=project)
 
     try:
-        generator = ImageGenerator()
+        generator = _image_generator()
+        final_prompt, reference_images = _build_scene_prompt(generator, project, scene)
 
-        # GENERATION MODE: Generate new image
-        if scene.use_custom_prompt and scene.final_prompt:
-            final_prompt = scene.final_prompt
-
-            # Gather reference images for selected characters
-            reference_images = []
-            char_names_with_images = []
-            for character in scene.characters.all():
-                # Check for reference_image first (manually uploaded), then generated_image
-                if character.reference_image:
-                    # Get the full path to the manually uploaded image
-                    image_path = character.reference_image.path
-                    reference_images.append(image_path)
-                    char_names_with_images.append(character.name)
-                elif character.generated_image:
-                    # Get the full path to the AI-generated image
-                    image_path = character.generated_image.path
-                    reference_images.append(image_path)
-                    char_names_with_images.append(character.name)
-
-            # Add a single, clear instruction for all characters with images
-            if char_names_with_images:
-                # Use template for reference image instruction
-                try:
-                    ref_template = PromptTemplate.objects.get(
-                        template_type='reference_image_instruction',
-                        is_active=True
-                    )
-                    if len(char_names_with_images) == 1:
-                        ref_instruction = ref_template.render(
-                            character_names=char_names_with_images[0],
-                            plural=''
-                        )
-                    else:
-                        names_str = ', '.join(char_names_with_images[:-1]) + f' and {char_names_with_images[-1]}'
-                        ref_instruction = ref_template.render(
-                            character_names=names_str,
-                            plural='s'
-                        )
-                    final_prompt += ref_instruction
-                except PromptTemplate.DoesNotExist:
-                    # Fallback if template not found
-                    if len(char_names_with_images) == 1:
-                        final_prompt += f" Use the exact appearance of {char_names_with_images[0]} from the provided reference image."
-                    else:
-                        names_str = ', '.join(char_names_with_images[:-1]) + f' and {char_names_with_images[-1]}'
-                        final_prompt += f" Use the exact appearance of {names_str} from the provided reference images."
-
-            # Generate image using Nano Banana
-            filename_base = f"project_{project.pk}_scene_{scene.pk}"
-            image_file = generator.generate(final_prompt, filename_base, reference_images=reference_images, project=project, scene=scene)
+        # Generate image using Nano Banana
+        filename_base = f"project_{project.pk}_scene_{scene.pk}"
+        image_file = generator.generate(final_prompt, filename_base, reference_images=reference_images, project=project, scene=scene)
 
-            # Save image to scene
+        # Save image to scene
+        with timed('file_save', operation='generate'):
             scene.approved_image = image_file
             scene.save()
 
-            messages.success(request, "Image generated successfully!")
+        messages.success(request, "Image generated successfully!")
 
-        else:
-            # Get the prompt and replace character placeholders
-            prompt = scene.prompt
-            characters = project.characters.all()
-
-            # Check which selected characters have images
-            characters_with_images = set()
-            for char in scene.characters.all():
-                # Check for reference_image first, then generated_image
-                if char.reference_image or char.generated_image:
-                    characters_with_images.add(char.name)
-
-            # Use minimal replacement when reference images are available
-            use_references = bool(characters_with_images)
-            final_prompt = generator.replace_character_placeholders(
-                prompt,
-                characters,
-                use_references=use_references,
-                characters_with_images=characters_with_images
-            )
+    except Exception as e:
+        messages.error(request, f"Error generating image: {str(e)}")
 
-            # Add style and color scheme to prompt using template
-            from .models import PromptTemplate
-            style_suffix = ""
-            try:
-                style_template = PromptTemplate.objects.get(
-                    template_type='image_style_suffix',
-                    is_active=True
-                )
-                style_suffix = style_template.render(
-                    style=project.style,
-                    color_scheme=project.color_scheme
-                )
-                print(f"Using style template: {style_suffix}")
-            except PromptTemplate.DoesNotExist:
-                print("WARNING: image_style_suffix template not found for generation")
-            except ValueError as e:
-                print(f"ERROR rendering style template: {e}")
-            final_prompt += style_suffix
-
-            # Gather reference images for selected characters
-            reference_images = []
-            char_names_with_images = []
-            for character in scene.characters.all():
-                # Check for reference_image first (manually uploaded), then generated_image
-                if character.reference_image:
-                    # Get the full path to the manually uploaded image
-                    image_path = character.reference_image.path
-                    reference_images.append(image_path)
-                    char_names_with_images.append(character.name)
-                elif character.generated_image:
-                    # Get the full path to the AI-generated image
-                    image_path = character.generated_image.path
-                    reference_images.append(image_path)
-                    char_names_with_images.append(character.name)
-
-            # Add a single, clear instruction for all characters with images
-            if char_names_with_images:
-                # Use template for reference image instruction
-                try:
-                    ref_template = PromptTemplate.objects.get(
-                        template_type='reference_image_instruction',
-                        is_active=True
-                    )
-                    if len(char_names_with_images) == 1:
-                        ref_instruction = ref_template.render(
-                            character_names=char_names_with_images[0],
-                            plural=''
-                        )
-                    else:
-                        names_str = ', '.join(char_names_with_images[:-1]) + f' and {char_names_with_images[-1]}'
-                        ref_instruction = ref_template.render(
-                            character_names=names_str,
-                            plural='s'
-                        )
-                    final_prompt += ref_instruction
-                except PromptTemplate.DoesNotExist:
-                    # Fallback if template not found
-                    if len(char_names_with_images) == 1:
-                        final_prompt += f" Use the exact appearance of {char_names_with_images[0]} from the provided reference image."
-                    else:
-                        names_str = ', '.join(char_names_with_images[:-1]) + f' and {char_names_with_images[-1]}'
-                        final_prompt += f" Use the exact appearance of {names_str} from the provided reference images."
-
-            # Generate image using Nano Banana
-            filename_base = f"project_{project.pk}_scene_{scene.pk}"
-            image_file = generator.generate(final_prompt, filename_base, reference_images=reference_images, project=project, scene=scene)
+    return redirect('scene_manager', project_pk=project.pk, scene_pk=scene.pk)
 
-            # Save image to scene
-            scene.approved_image = image_file
-            scene.save()
 
-            messages.success(request, "Image generated successfully!")
+def _build_scene_prompt(generator, project, scene):
+    """Assemble the final generation prompt and reference image paths for a scene.
 
-    except Exception as e:
-        messages.error(request, f"Error generating image: {str(e)}")
+    Returns:
+        Tuple (final_prompt, reference_images)
+    """
+    assembly_start = time.perf_counter()
 
-    return redirect('scene_manager', project_pk=project.pk, scene_pk=scene.pk)
+    # Check if we should use custom prompt
+    if scene.use_custom_prompt and scene.final_prompt:
+        final_prompt = scene.final_prompt
+    else:
+        # Get the prompt and replace character placeholders
+        prompt = scene.prompt
+        characters = project.characters.all()
+
+        # Check which selected characters have images
+        characters_with_images = set()
+        for char in scene.characters.all():
+            # Check for reference_image first, then generated_image
+            if char.reference_image or char.generated_image:
+                characters_with_images.add(char.name)
+
+        # Use minimal replacement when reference images are available
+        use_references = bool(characters_with_images)
+        final_prompt = generator.replace_character_placeholders(
+            prompt,
+            characters,
+            use_references=use_references,
+            characters_with_images=characters_with_images
+        )
+
+        # Add style and color scheme to prompt using template
+        style_suffix = ""
+        try:
+            style_template = PromptTemplate.objects.get(
+                template_type='image_style_suffix',
+                is_active=True
+            )
+            style_suffix = style_template.render(
+                style=project.style,
+                color_scheme=project.color_scheme
+            )
+            print(f"Using style template: {style_suffix}")
+        except PromptTemplate.DoesNotExist:
+            print("WARNING: image_style_suffix template not found for generation")
+        except ValueError as e:
+            print(f"ERROR rendering style template: {e}")
+        final_prompt += style_suffix
+
+    # Gather reference images for selected characters
+    reference_images = []
+    char_names_with_images = []
+    for character in scene.characters.all():
+        # Check for reference_image first (manually uploaded), then generated_image
+        if character.reference_image:
+            # Get the full path to the manually uploaded image
+            image_path = character.reference_image.path
+            reference_images.append(image_path)
+            char_names_with_images.append(character.name)
+        elif character.generated_image:
+            # Get the full path to the AI-generated image
+            image_path = character.generated_image.path
+            reference_images.append(image_path)
+            char_names_with_images.append(character.name)
+
+    # Add a single, clear instruction for all characters with images
+    if char_names_with_images:
+        # Use template for reference image instruction
+        try:
+            ref_template = PromptTemplate.objects.get(
+                template_type='reference_image_instruction',
+                is_active=True
+            )
+            if len(char_names_with_images) == 1:
+                ref_instruction = ref_template.render(
+                    character_names=char_names_with_images[0],
+                    plural=''
+                )
+            else:
+                names_str = ', '.join(char_names_with_images[:-1]) + f' and {char_names_with_images[-1]}'
+                ref_instruction = ref_template.render(
+                    character_names=names_str,
+                    plural='s'
+                )
+            final_prompt += ref_instruction
+        except PromptTemplate.DoesNotExist:
+            # Fallback if template not found
+            if len(char_names_with_images) == 1:
+                final_prompt += f" Use the exact appearance of {char_names_with_images[0]} from the provided reference image."
+            else:
+                names_str = ', '.join(char_names_with_images[:-1]) + f' and {char_names_with_images[-1]}'
+                final_prompt += f" Use the exact appearance of {names_str} from the provided reference images."
+
+    record_stage('prompt_assembly', time.perf_counter() - assembly_start, operation='generate')
+    return final_prompt, reference_images
 
 
 @require_POST
@@ -419,94 +400,8 @@ def generate_image_ajax(request, project_pk, scene_pk):
             'message': 'Initializing image generation...'
         }
 
-        generator = ImageGenerator()
-
-        # Check if we should use custom prompt
-        if scene.use_custom_prompt and scene.final_prompt:
-            final_prompt = scene.final_prompt
-        else:
-            # Get the prompt and replace character placeholders
-            prompt = scene.prompt
-            characters = project.characters.all()
-
-            # Check which selected characters have images
-            characters_with_images = set()
-            for char in scene.characters.all():
-                # Check for reference_image first, then generated_image
-                if char.reference_image or char.generated_image:
-                    characters_with_images.add(char.name)
-
-            # Use minimal replacement when reference images are available
-            use_references = bool(characters_with_images)
-            final_prompt = generator.replace_character_placeholders(
-                prompt,
-                characters,
-                use_references=use_references,
-                characters_with_images=characters_with_images
-            )
-
-            # Add style and color scheme to prompt using template
-            from .models import PromptTemplate
-            style_suffix = ""
-            try:
-                style_template = PromptTemplate.objects.get(
-                    template_type='image_style_suffix',
-                    is_active=True
-                )
-                style_suffix = style_template.render(
-                    style=project.style,
-                    color_scheme=project.color_scheme
-                )
-                print(f"Using style template: {style_suffix}")
-            except PromptTemplate.DoesNotExist:
-                print("WARNING: image_style_suffix template not found for generation")
-            except ValueError as e:
-                print(f"ERROR rendering style template: {e}")
-            final_prompt += style_suffix
-
-        # Gather reference images for selected characters
-        reference_images = []
-        char_names_with_images = []
-        for character in scene.characters.all():
-            # Check for reference_image first (manually uploaded), then generated_image
-            if character.reference_image:
-                # Get the full path to the manually uploaded image
-                image_path = character.reference_image.path
-                reference_images.append(image_path)
-                char_names_with_images.append(character.name)
-            elif character.generated_image:
-                # Get the full path to the AI-generated image
-                image_path = character.generated_image.path
-                reference_images.append(image_path)
-                char_names_with_images.append(character.name)
-
-        # Add a single, clear instruction for all characters with images
-        if char_names_with_images:
-            # Use template for reference image instruction
-            try:
-                ref_template = PromptTemplate.objects.get(
-                    template_type='reference_image_instruction',
-                    is_active=True
-                )
-                if len(char_names_with_images) == 1:
-                    ref_instruction = ref_template.render(
-                        character_names=char_names_with_images[0],
-                        plural=''
-                    )
-                else:
-                    names_str = ', '.join(char_names_with_images[:-1]) + f' and {char_names_with_images[-1]}'
-                    ref_instruction = ref_template.render(
-                        character_names=names_str,
-                        plural='s'
-                    )
-                final_prompt += ref_instruction
-            except PromptTemplate.DoesNotExist:
-                # Fallback if template not found
-                if len(char_names_with_images) == 1:
-                    final_prompt += f" Use the exact appearance of {char_names_with_images[0]} from the provided reference image."
-                else:
-                    names_str = ', '.join(char_names_with_images[:-1]) + f' and {char_names_with_images[-1]}'
-                    final_prompt += f" Use the exact appearance of {names_str} from the provided reference images."
+        generator = _image_generator()
+        final_prompt, reference_images = _build_scene_prompt(generator, project, scene)
 
         # Generate image
         filename_base = f"project_{project.pk}_scene_{scene.pk}"
@@ -515,18 +410,27 @@ def generate_image_ajax(request, project_pk, scene_pk):
         # For now, we'll generate synchronously but return progress updates
         response_data['message'] = 'Generating image with Google Nano Banana...'
 
-        image_file = generator.generate(final_prompt, filename_base, reference_images=reference_images, project=project, scene=scene)
+        def generate():
+            image_file = generator.generate(final_prompt, filename_base, reference_images=reference_images, project=project, scene=scene)
 
-        # Save image to scene
-        scene.approved_image = image_file
-        scene.save()
+            # Save image to scene
+            with timed('file_save', operation='generate'):
+                scene.approved_image = image_file
+                scene.save()
 
-        # Return success with image URL
-        response_data = {
-            'status': 'success',
-            'message': 'Image generated successfully!',
-            'image_url': scene.approved_image.url if scene.approved_image else None
-        }
+            # Return success with image URL
+            return {
+                'status': 'success',
+                'message': 'Image generated successfully!',
+                'image_url': scene.approved_image.url if scene.approved_image else None
+            }
+
+        # Duplicate submissions for the same scene and prompt share one upstream call
+        response_data = _run_single_flight(
+            request, 'generate_image',
+            flight_key('scene', scene.pk, final_prompt, *reference_images),
+            generate
+        )
 
     except Exception as e:
         response_data = {
@@ -557,6 +461,23 @@ def delete_project(request, pk):
     return redirect('project_detail', pk=pk)
 
 
+@require_POST
+def clone_project(request, pk):
+    """Fork a project (characters, scenes, images) to try another style or color scheme."""
+    project = get_object_or_404(Project, pk=pk)
+    try:
+        fork = project.clone(
+            name=request.POST.get('name', '').strip() or None,
+            style=request.POST.get('style') or None,
+            color_scheme=request.POST.get('color_scheme') or None,
+        )
+    except ValidationError as e:
+        messages.error(request, f"Cannot clone project: {'; '.join(e.messages)}")
+        return redirect('project_detail', pk=pk)
+    messages.success(request, f"Project cloned as '{fork.name}'!")
+    return redirect('project_detail', pk=fork.pk)
+
+
 def update_style(request, pk):
     if request.method == 'POST':
         project = get_object_or_404(Project, pk=pk)
@@ -608,19 +529,13 @@ def character_edit(request, project_pk, character_pk):
             new_name = form.cleaned_data['name']
 
             # Update placeholders in scenes if name changed and user requested it
-            if old_name != new_name and update_placeholders:
-                scenes = project.scenes.all()
-                for scene in scenes:
-                    # Replace old placeholder with new placeholder
-                    scene.prompt = scene.prompt.replace(f"{{{old_name}}}", f"{{{new_name}}}")
-                    scene.save()
-                messages.info(request, f"Updated character placeholders in {scenes.count()} scenes.")
+            rename_placeholders = old_name != new_name and update_placeholders
 
             # Handle manual image upload
             if form.cleaned_data.get('manual_image'):
                 # Delete old reference image if it exists
                 if character.reference_image:
-                    character.reference_image.delete(save=False)
+                    delete_unshared_file(character.reference_image, character)
                 # Save new reference image
                 character.reference_image = form.cleaned_data['manual_image']
                 messages.success(request, "Character image uploaded successfully!")
@@ -628,15 +543,22 @@ def character_edit(request, project_pk, character_pk):
             # Handle image removal
             if remove_image:
                 if character.reference_image:
-                    character.reference_image.delete(save=False)
+                    delete_unshared_file(character.reference_image, character)
                     character.reference_image = None
                 if character.generated_image:
-                    character.generated_image.delete(save=False)
+                    delete_unshared_file(character.generated_image, character)
                     character.generated_image = None
                 messages.info(request, "Character image removed.")
 
-            # Save character
-            form.save()
+            # Save character; scene placeholders are rewritten by one set-based UPDATE
+            # over prompt and final_prompt in the same transaction
+            with transaction.atomic():
+                form.save()
+                if rename_placeholders:
+                    updated_count = Scene.rename_character_placeholder(project, old_name, new_name)
+
+            if rename_placeholders:
+                messages.info(request, f"Updated character placeholders in {updated_count} scenes.")
             messages.success(request, f"Character '{new_name}' updated successfully!")
             return redirect('project_detail', pk=project.pk)
         else:
@@ -814,6 +736,7 @@ def character_generate(request, project_pk):
             # Generate image if requested
             if generate_image and generation_prompt:
                 try:
+                    from .services.character_generation import CharacterGenerator
                     generator = CharacterGenerator()
                     image_file = generator.generate_character(
                         generation_prompt or description,
@@ -837,13 +760,7 @@ def character_generate(request, project_pk):
 
     context = {
         'project': project,
-        'styles': [
-            "Ghibli-style", "line-art-style", "pixel-art-style",
-            "water-color-style", "Fairy-Tale-style", "Game-RPG-Style",
-            "Game-Zelda-Style", "Manga-style", "Pixar-3d-style",
-            "Anime-style", "Watercolor-style", "Cinematic-style",
-            "wimpy-kid-style"
-        ]
+        'styles': Project.STYLES
     }
     return render(request, 'stories/character_generate.html', context)
 
@@ -867,7 +784,7 @@ def edit_scene_image(request, project_pk, scene_pk):
         return redirect('scene_manager', project_pk=project.pk, scene_pk=scene.pk)
 
     try:
-        generator = ImageGenerator()
+        generator = _image_generator()
 
         # Edit the image - ONLY pass the current image and edit prompt
         filename_base = f"project_{project.pk}_scene_{scene.pk}_edited"
@@ -880,9 +797,10 @@ def edit_scene_image(request, project_pk, scene_pk):
         )
 
         # Save the edited image and the edit prompt
-        scene.approved_image = image_file
-        scene.edit_prompt = edit_prompt
-        scene.save()
+        with timed('file_save', operation='edit'):
+            scene.approved_image = image_file
+            scene.edit_prompt = edit_prompt
+            scene.save()
 
         messages.success(request, "Image edited successfully!")
 
@@ -892,6 +810,233 @@ def edit_scene_image(request, project_pk, scene_pk):
     return redirect('scene_manager', project_pk=project.pk, scene_pk=scene.pk)
 
 
+@require_POST
+def generate_scene_candidates_ajax(request, project_pk, scene_pk):
+    """AJAX endpoint generating several candidate images for a scene in parallel."""
+    project = get_object_or_404(Project, pk=project_pk)
+    scene = get_object_or_404(Scene, pk=scene_pk, project=project)
+
+    try:
+        count = int(request.POST.get('count', 3))
+    except ValueError:
+        count = 3
+
+    try:
+        generator = _image_generator()
+        final_prompt, reference_images = _build_scene_prompt(generator, project, scene)
+
+        def generate():
+            candidates, errors = generate_scene_candidates(
+                generator, scene, final_prompt, reference_images, count=count
+            )
+            if not candidates:
+                raise Exception(errors[0] if errors else "No candidates were generated")
+            return {
+                'status': 'success',
+                'message': f'{len(candidates)} candidate(s) generated',
+                'errors': errors,
+                'candidates': [
+                    {
+                        'id': c.pk,
+                        'image_url': c.image.url,
+                        'thumbnail_url': c.thumbnail.url if c.thumbnail else c.image.url,
+                        'promote_url': reverse('promote_scene_candidate', args=[project.pk, scene.pk, c.pk]),
+                    }
+                    for c in candidates
+                ],
+            }
+
+        response_data = _run_single_flight(
+            request, 'generate_scene_candidates',
+            flight_key('scene_candidates', scene.pk, final_prompt, count, *reference_images),
+            generate
+        )
+
+    except Exception as e:
+        response_data = {
+            'status': 'error',
+            'message': f'Error generating candidates: {str(e)}'
+        }
+
+    return JsonResponse(response_data)
+
+
+@require_POST
+def promote_scene_candidate(request, project_pk, scene_pk, candidate_pk):
+    """Use a generated candidate as the scene's approved image."""
+    project = get_object_or_404(Project, pk=project_pk)
+    scene = get_object_or_404(Scene, pk=scene_pk, project=project)
+    candidate = get_object_or_404(SceneCandidate, pk=candidate_pk, scene=scene)
+
+    candidate.promote()
+
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JsonResponse({
+            'status': 'success',
+            'message': 'Candidate approved',
+            'image_url': candidate.image.url,
+        })
+    messages.success(request, "Candidate image approved for this scene.")
+    return redirect('scene_manager', project_pk=project.pk, scene_pk=scene.pk)
+
+
+@require_POST
+def bulk_edit_scenes_ajax(request, project_pk):
+    """AJAX endpoint applying one edit instruction to several scenes at once."""
+    project = get_object_or_404(Project, pk=project_pk)
+
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Expected a JSON object'
+        })
+    edit_prompt = body.get('edit_prompt') or ''
+    scene_ids = body.get('scene_ids') or []
+    if not isinstance(edit_prompt, str):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'edit_prompt must be a string'
+        })
+    if not isinstance(scene_ids, list) or not all(
+        isinstance(pk, int) and not isinstance(pk, bool) for pk in scene_ids
+    ):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'scene_ids must be a list of scene ids'
+        })
+    edit_prompt = edit_prompt.strip()
+
+    if not edit_prompt:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Please provide edit instructions'
+        })
+
+    scenes = project.scenes.all()
+    if scene_ids:
+        scenes = scenes.filter(pk__in=scene_ids)
+    scenes = list(scenes)
+    if not scenes:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'No scenes selected'
+        })
+
+    try:
+        generator = _image_generator()
+        results = bulk_edit_scenes(generator, project, scenes, edit_prompt)
+    except Exception as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Error editing images: {str(e)}'
+        })
+
+    edited = sum(1 for r in results if r['status'] == 'success')
+    failed = sum(1 for r in results if r['status'] == 'error')
+    return JsonResponse({
+        'status': 'success' if edited or not failed else 'error',
+        'message': f'{edited} of {len(results)} scene(s) edited',
+        'results': results,
+    })
+
+
+@require_POST
+def reorder_scenes_ajax(request, project_pk):
+    """AJAX endpoint applying a full scene ordering (JSON body: scene_ids) in one write."""
+    project = get_object_or_404(Project, pk=project_pk)
+
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Expected a JSON object'
+        }, status=400)
+    scene_ids = body.get('scene_ids') or []
+    if not isinstance(scene_ids, list) or not all(
+        isinstance(pk, int) and not isinstance(pk, bool) for pk in scene_ids
+    ):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'scene_ids must be a list of scene ids'
+        }, status=400)
+
+    try:
+        updated = Scene.reorder(project, scene_ids)
+    except (TypeError, ValueError):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'scene_ids must list every scene of the project exactly once'
+        }, status=400)
+
+    return JsonResponse({
+        'status': 'success',
+        'updated': updated,
+        'scenes': list(project.scenes.values('id', 'order')),
+    })
+
+
+@require_POST
+def insert_scene_ajax(request, project_pk):
+    """AJAX endpoint creating a scene right after another one (JSON body: name, prompt, after_scene_id)."""
+    project = get_object_or_404(Project, pk=project_pk)
+
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Expected a JSON object'
+        }, status=400)
+    prompt = body.get('prompt') or ''
+    name = body.get('name') or ''
+    after_scene_id = body.get('after_scene_id')
+    if not isinstance(prompt, str) or not isinstance(name, str):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'prompt and name must be strings'
+        }, status=400)
+    if after_scene_id is not None and (not isinstance(after_scene_id, int) or isinstance(after_scene_id, bool)):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'after_scene_id must be a scene id'
+        }, status=400)
+    prompt = prompt.strip()
+    if not prompt:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Please provide a scene prompt'
+        }, status=400)
+
+    after = None
+    if after_scene_id:
+        after = get_object_or_404(Scene, pk=after_scene_id, project=project)
+
+    with transaction.atomic():
+        scene = Scene.objects.create(
+            project=project,
+            name=name.strip() or f"Scene {project.scenes.count() + 1}",
+            prompt=prompt,
+            order=Scene.order_after(project, after),
+        )
+
+    return JsonResponse({
+        'status': 'success',
+        'id': scene.pk,
+        'name': scene.name,
+        'order': scene.order,
+        'url': reverse('scene_manager', args=[project.pk, scene.pk]),
+    })
+
+
 @require_POST
 def edit_scene_image_ajax(request, project_pk, scene_pk):
     """AJAX endpoint for editing scene images - completely separate from generation."""
@@ -918,28 +1063,37 @@ def edit_scene_image_ajax(request, project_pk, scene_pk):
                 'message': 'Please provide edit instructions'
             })
 
-        generator = ImageGenerator()
+        generator = _image_generator()
 
-        # Edit the image - ONLY pass the current image and edit prompt
-        filename_base = f"project_{project.pk}_scene_{scene.pk}_edited"
-        image_file = generator.edit_image(
-            scene.approved_image.path,
-            edit_prompt,
-            filename_base,
-            project=project,
-            scene=scene
-        )
+        def edit():
+            # Edit the image - ONLY pass the current image and edit prompt
+            filename_base = f"project_{project.pk}_scene_{scene.pk}_edited"
+            image_file = generator.edit_image(
+                scene.approved_image.path,
+                edit_prompt,
+                filename_base,
+                project=project,
+                scene=scene
+            )
 
-        # Save the edited image and the edit prompt
-        scene.approved_image = image_file
-        scene.edit_prompt = edit_prompt
-        scene.save()
+            # Save the edited image and the edit prompt
+            with timed('file_save', operation='edit'):
+                scene.approved_image = image_file
+                scene.edit_prompt = edit_prompt
+                scene.save()
 
-        return JsonResponse({
-            'status': 'success',
-            'message': 'Image edited successfully!',
-            'image_url': scene.approved_image.url if scene.approved_image else None
-        })
+            return {
+                'status': 'success',
+                'message': 'Image edited successfully!',
+                'image_url': scene.approved_image.url if scene.approved_image else None
+            }
+
+        # Keyed by the source image too, so a repeated edit of the new result is a new job
+        return JsonResponse(_run_single_flight(
+            request, 'edit_scene_image',
+            flight_key('scene_edit', scene.pk, scene.approved_image.name, edit_prompt),
+            edit
+        ))
 
     except Exception as e:
         return JsonResponse({
@@ -963,28 +1117,37 @@ def generate_character_image_ajax(request, project_pk, character_pk):
             character.generation_prompt = prompt
             character.save()
 
+        from .services.character_generation import CharacterGenerator
         generator = CharacterGenerator()
 
-        # Generate the character image
-        image_file = generator.generate_character(
-            prompt,
-            character.name,
-            project_style=project.style,
-            project_color_scheme=project.color_scheme,
-            project=project,
-            character=character
-        )
+        def generate():
+            # Generate the character image
+            image_file = generator.generate_character(
+                prompt,
+                character.name,
+                project_style=project.style,
+                project_color_scheme=project.color_scheme,
+                project=project,
+                character=character
+            )
 
-        # Save the generated image
-        character.generated_image = image_file
-        character.save()
+            # Save the generated image
+            with timed('file_save', operation='character'):
+                character.generated_image = image_file
+                character.save()
 
-        # Return success with image URL
-        response_data = {
-            'status': 'success',
-            'message': 'Character image generated successfully!',
-            'image_url': character.generated_image.url if character.generated_image else None
-        }
+            # Return success with image URL
+            return {
+                'status': 'success',
+                'message': 'Character image generated successfully!',
+                'image_url': character.generated_image.url if character.generated_image else None
+            }
+
+        response_data = _run_single_flight(
+            request, 'generate_character_image',
+            flight_key('character', character.pk, prompt, project.style, project.color_scheme),
+            generate
+        )
 
     except Exception as e:
         response_data = {
@@ -1056,7 +1219,8 @@ def generation_settings(request):
         'google': {
             'is_set': bool(google_key),
             'source': settings.get_api_key_source('google'),
-            'masked': settings.mask_api_key(google_key) if google_key else 'Not configured'
+            'masked': settings.mask_api_key(google_key) if google_key else 'Not configured',
+            'pool_size': len(settings.get_google_api_keys())
         },
         'artemox': {
             'is_set': bool(artemox_key),
@@ -1081,4 +1245,12 @@ def generation_settings(request):
         'effective_ai_provider': settings.get_current_provider()
     }
 
-    return render(request, 'stories/generation_settings.html', context)
\ No newline at end of file
+    return render(request, 'stories/generation_settings.html', context)
+
+
+def metrics(request):
+    """Generation pipeline metrics in Prometheus text exposition format."""
+    return HttpResponse(
+        render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -140,3 +140,77 @@ OPENAI_KEY = os.getenv('OPENAI_KEY')
 GOOGLE_API = os.getenv('GOOGLE_API')
 STABILITY_API_KEY = os.getenv('STABILITY_API_KEY')
 FAL_KEY = os.getenv('FAL_KEY')
+
+# Extra Gemini keys for the key pool (comma separated), pooled with GOOGLE_API
+GOOGLE_API_KEYS = [k.strip() for k in os.getenv('GOOGLE_API_KEYS', '').split(',') if k.strip()]
+
+# Per-key Gemini scheduling. Quota errors always back a key off; a per-key
+# token bucket is opt-in: set GEMINI_KEY_RATE_PER_MINUTE > 0 (and GEMINI_KEY_BURST)
+GEMINI_KEY_RATE_PER_MINUTE = float(os.getenv('GEMINI_KEY_RATE_PER_MINUTE', '0'))
+GEMINI_KEY_BURST = int(os.getenv('GEMINI_KEY_BURST', '2'))
+GEMINI_KEY_COOLDOWN_SECONDS = float(os.getenv('GEMINI_KEY_COOLDOWN_SECONDS', '60'))
+GEMINI_KEY_WAIT_TIMEOUT = float(os.getenv('GEMINI_KEY_WAIT_TIMEOUT', '30'))
+
+# Media storage: files are named by content hash so identical bytes are stored once
+STORAGES = {
+    'default': {
+        'BACKEND': 'stories.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Orphaned media garbage collection. Off by default; MEDIA_GC_INTERVAL=86400 makes the
+# web workers run a daily pass (one worker per pass, coordinated through the shared cache)
+MEDIA_GC_INTERVAL = int(os.getenv('MEDIA_GC_INTERVAL', '0'))
+MEDIA_GC_MIN_AGE = int(os.getenv('MEDIA_GC_MIN_AGE', '3600'))
+
+# Lossless recompression of stored images at save time: '' (off), 'webp' or 'png';
+# existing files are converted with `manage.py recompress_media`
+MEDIA_RECOMPRESS = os.getenv('MEDIA_RECOMPRESS', '')
+MEDIA_RECOMPRESS_EFFORT = int(os.getenv('MEDIA_RECOMPRESS_EFFORT', '4'))
+
+# Duplicate generation requests: in-flight lock lifetime and idempotency replay window (seconds)
+SINGLE_FLIGHT_LOCK_TIMEOUT = int(os.getenv('SINGLE_FLIGHT_LOCK_TIMEOUT', '300'))
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '600'))
+
+# Parallel candidate generation: most candidates per request, and how long unchosen ones are kept (seconds)
+SCENE_CANDIDATE_MAX = int(os.getenv('SCENE_CANDIDATE_MAX', '5'))
+SCENE_CANDIDATE_RETENTION = int(os.getenv('SCENE_CANDIDATE_RETENTION', str(7 * 24 * 3600)))
+
+# Concurrent upstream edits for one bulk edit request
+BULK_EDIT_MAX_WORKERS = int(os.getenv('BULK_EDIT_MAX_WORKERS', '4'))
+
+# Cache shared by all worker processes on the host (prompt templates, single-flight
+# locks, key cooldowns). CACHE_BACKEND=locmem falls back to a per-process cache.
+CACHE_LOCATION = os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache.sqlite3'))
+CACHES = {
+    'default': {
+        'BACKEND': 'stories.cache.SQLiteCache',
+        'LOCATION': CACHE_LOCATION,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000')),
+        },
+    },
+}
+if os.getenv('CACHE_BACKEND', 'sqlite') == 'locmem':
+    CACHES['default'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+# Application logging; `stories.metrics` emits one logfmt line per pipeline stage
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'stories': {
+            'handlers': ['console'],
+            'level': os.getenv('STORIES_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
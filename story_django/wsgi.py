@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'story_django.settings')
 
 application = get_wsgi_application()
+
+# Reclaim unreferenced media files in the background when MEDIA_GC_INTERVAL is set (opt-in)
+from stories.services.media_gc import start_periodic_media_gc  # noqa: E402
+
+start_periodic_media_gc()
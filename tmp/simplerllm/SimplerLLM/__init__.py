@@ -1,130 +1,132 @@
 # SimplerLLM - Simplified interface for LLMs and Voice APIs
 
-# Language module exports
-from .language import (
-    LLM,
-    LLMProvider,
-    ReliableLLM,
-    OpenAILLM,
-    GeminiLLM,
-    AnthropicLLM,
-    OllamaLLM,
-    DeepSeekLLM,
-    MiniAgent,
-    StepResult,
-    FlowResult,
-    LLMJudge,
-    JudgeMode,
-    JudgeResult,
-    ProviderResponse,
-    ProviderEvaluation,
-    EvaluationReport,
-    LLMFeedbackLoop,
-    FeedbackResult,
-    IterationResult,
-    Critique,
-    LLMProviderRouter,
-    ProviderConfig,
-    RoutingResult,
-    QueryClassification,
-    LLMClusterer,
-    Cluster,
-    ClusterMetadata,
-    ChunkReference,
-    ClusterTree,
-    ClusteringResult,
-    ClusteringConfig,
-    TreeConfig,
-    save_clustering_result,
-    load_clustering_result,
-    save_cluster_tree,
-    load_cluster_tree,
-    get_clustering_stats,
-    LLMRetriever,
-    RetrievalResult,
-    HierarchicalRetrievalResponse,
-    RetrievalConfig,
-    GuardrailsLLM,
-    GuardrailAction,
-    GuardrailResult,
-    InputGuardrail,
-    OutputGuardrail,
-    CompositeGuardrail,
-    GuardrailException,
-    GuardrailBlockedException,
-    GuardrailValidationException,
-    GuardrailConfigurationException,
-    GuardrailTimeoutException,
-    PromptInjectionGuardrail,
-    TopicFilterGuardrail,
-    InputPIIDetectionGuardrail,
-    FormatValidatorGuardrail,
-    OutputPIIDetectionGuardrail,
-    ContentSafetyGuardrail,
-    LengthValidatorGuardrail,
-)
+import importlib
 
-# Voice module exports
-from .voice import (
-    TTS,
-    TTSProvider,
-    OpenAITTS,
-    ElevenLabsTTS,
-    TTSFullResponse,
-    STT,
-    STTProvider,
-    OpenAISTT,
-    STTFullResponse,
-    VoiceChat,
-    VoiceChatConfig,
-    ConversationMessage,
-    ConversationRole,
-    VoiceTurnResult,
-    VoiceChatSession,
-    ConversationManager,
-    LiveVoiceChat,
-    LiveVoiceChatConfig,
-    AudioRecorder,
-    AudioPlayer,
-    DialogueGenerator,
-    Dialogue,
-    DialogueLine,
-    SpeakerConfig,
-    DialogueGenerationConfig,
-    AudioDialogueResult,
-    DialogueStyle,
-    VideoTranscriber,
-    MultiLanguageCaptionGenerator,
-    VideoTranscriptionResult,
-    CaptionSegment,
-    LanguageCaptions,
-    MultiLanguageCaptionsResult,
-    VideoDubber,
-    DubbedSegment,
-    DubbingConfig,
-    VideoDubbingResult,
-    RealtimeVoice,
-    RealtimeVoiceProvider,
-    RealtimeSessionConfig,
-    OpenAIRealtimeVoice,
-    TurnDetectionType,
-    Voice,
-    AudioFormat,
-    Modality,
-    RealtimeVoiceChat,
-    RealtimeVoiceChatConfig,
-)
-
-# Image module exports
-from .image import (
-    ImageGenerator,
-    ImageProvider,
-    ImageSize,
-    OpenAIImageGenerator,
-    StabilityImageGenerator,
-    GoogleImageGenerator,
-    ImageGenerationResponse,
-)
+# Submodule -> public names it provides. Nothing is imported until a name
+# is first accessed (PEP 562), so `import SimplerLLM` stays cheap.
+_LAZY_EXPORTS = {
+    '.language': (
+        'LLM',
+        'LLMProvider',
+        'ReliableLLM',
+        'OpenAILLM',
+        'GeminiLLM',
+        'AnthropicLLM',
+        'OllamaLLM',
+        'DeepSeekLLM',
+        'MiniAgent',
+        'StepResult',
+        'FlowResult',
+        'LLMJudge',
+        'JudgeMode',
+        'JudgeResult',
+        'ProviderResponse',
+        'ProviderEvaluation',
+        'EvaluationReport',
+        'LLMFeedbackLoop',
+        'FeedbackResult',
+        'IterationResult',
+        'Critique',
+        'LLMProviderRouter',
+        'ProviderConfig',
+        'RoutingResult',
+        'QueryClassification',
+        'LLMClusterer',
+        'Cluster',
+        'ClusterMetadata',
+        'ChunkReference',
+        'ClusterTree',
+        'ClusteringResult',
+        'ClusteringConfig',
+        'TreeConfig',
+        'save_clustering_result',
+        'load_clustering_result',
+        'save_cluster_tree',
+        'load_cluster_tree',
+        'get_clustering_stats',
+        'LLMRetriever',
+        'RetrievalResult',
+        'HierarchicalRetrievalResponse',
+        'RetrievalConfig',
+        'GuardrailsLLM',
+        'GuardrailAction',
+        'GuardrailResult',
+        'InputGuardrail',
+        'OutputGuardrail',
+        'CompositeGuardrail',
+        'GuardrailException',
+        'GuardrailBlockedException',
+        'GuardrailValidationException',
+        'GuardrailConfigurationException',
+        'GuardrailTimeoutException',
+        'PromptInjectionGuardrail',
+        'TopicFilterGuardrail',
+        'InputPIIDetectionGuardrail',
+        'FormatValidatorGuardrail',
+        'OutputPIIDetectionGuardrail',
+        'ContentSafetyGuardrail',
+        'LengthValidatorGuardrail',
+    ),
+    '.voice': (
+        'TTS',
+        'TTSProvider',
+        'OpenAITTS',
+        'ElevenLabsTTS',
+        'TTSFullResponse',
+        'STT',
+        'STTProvider',
+        'OpenAISTT',
+        'STTFullResponse',
+        'VoiceChat',
+        'VoiceChatConfig',
+        'ConversationMessage',
+        'ConversationRole',
+        'VoiceTurnResult',
+        'VoiceChatSession',
+        'ConversationManager',
+        'LiveVoiceChat',
+        'LiveVoiceChatConfig',
+        'AudioRecorder',
+        'AudioPlayer',
+        'DialogueGenerator',
+        'Dialogue',
+        'DialogueLine',
+        'SpeakerConfig',
+        'DialogueGenerationConfig',
+        'AudioDialogueResult',
+        'DialogueStyle',
+        'VideoTranscriber',
+        'MultiLanguageCaptionGenerator',
+        'VideoTranscriptionResult',
+        'CaptionSegment',
+        'LanguageCaptions',
+        'MultiLanguageCaptionsResult',
+        'VideoDubber',
+        'DubbedSegment',
+        'DubbingConfig',
+        'VideoDubbingResult',
+        'RealtimeVoice',
+        'RealtimeVoiceProvider',
+        'RealtimeSessionConfig',
+        'OpenAIRealtimeVoice',
+        'TurnDetectionType',
+        'Voice',
+        'AudioFormat',
+        'Modality',
+        'RealtimeVoiceChat',
+        'RealtimeVoiceChatConfig',
+    ),
+    '.image': (
+        'ImageGenerator',
+        'ImageProvider',
+        'ImageSize',
+        'OpenAIImageGenerator',
+        'StabilityImageGenerator',
+        'GoogleImageGenerator',
+        'ImageGenerationResponse',
+    ),
+}
+_EXPORT_MODULES = {name: module for module, names in _LAZY_EXPORTS.items() for name in names}
 
 __all__ = [
     # Language module
@@ -253,3 +255,16 @@ __all__ = [
     'GoogleImageGenerator',
     'ImageGenerationResponse',
 ]
+
+
+def __getattr__(name):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,57 +1,84 @@
-from .llm.base import LLM, LLMProvider
-from .llm.reliable import ReliableLLM
-from .llm.wrappers import OpenAILLM, GeminiLLM, AnthropicLLM, OllamaLLM, DeepSeekLLM
-from .flow import MiniAgent, StepResult, FlowResult
-from .llm_judge import LLMJudge, JudgeMode, JudgeResult, ProviderResponse, ProviderEvaluation, EvaluationReport
-from .llm_feedback import LLMFeedbackLoop, FeedbackResult, IterationResult, Critique
-from .llm_provider_router import LLMProviderRouter, ProviderConfig, RoutingResult, QueryClassification
-from .llm_clustering import (
-    LLMClusterer,
-    Cluster,
-    ClusterMetadata,
-    ChunkReference,
-    ClusterTree,
-    ClusteringResult,
-    ClusteringConfig,
-    TreeConfig,
-    save_clustering_result,
-    load_clustering_result,
-    save_cluster_tree,
-    load_cluster_tree,
-    get_clustering_stats,
-    save_clustering_result_optimized,
-    load_clustering_result_optimized,
-    ChunkStore,
-    InMemoryChunkStore,
-    SQLiteChunkStore,
-    create_chunk_store
-)
-from .llm_retrieval import (
-    LLMRetriever,
-    RetrievalResult,
-    HierarchicalRetrievalResponse,
-    RetrievalConfig
-)
-from .guardrails import (
-    GuardrailsLLM,
-    GuardrailAction,
-    GuardrailResult,
-    InputGuardrail,
-    OutputGuardrail,
-    CompositeGuardrail,
-    GuardrailException,
-    GuardrailBlockedException,
-    GuardrailValidationException,
-    GuardrailConfigurationException,
-    GuardrailTimeoutException,
-    PromptInjectionGuardrail,
-    TopicFilterGuardrail,
-    InputPIIDetectionGuardrail,
-    FormatValidatorGuardrail,
-    OutputPIIDetectionGuardrail,
-    ContentSafetyGuardrail,
-    LengthValidatorGuardrail,
-)
+import importlib
+
+# Submodule -> public names; each submodule is imported on first use (PEP 562)
+_LAZY_EXPORTS = {
+    '.llm.base': ('LLM', 'LLMProvider'),
+    '.llm.reliable': ('ReliableLLM',),
+    '.llm.wrappers.openai_wrapper': ('OpenAILLM',),
+    '.llm.wrappers.gemini_wrapper': ('GeminiLLM',),
+    '.llm.wrappers.anthropic_wrapper': ('AnthropicLLM',),
+    '.llm.wrappers.ollama_wrapper': ('OllamaLLM',),
+    '.llm.wrappers.deepseek_wrapper': ('DeepSeekLLM',),
+    '.flow': ('MiniAgent', 'StepResult', 'FlowResult'),
+    '.llm_judge': (
+        'LLMJudge',
+        'JudgeMode',
+        'JudgeResult',
+        'ProviderResponse',
+        'ProviderEvaluation',
+        'EvaluationReport',
+    ),
+    '.llm_feedback': (
+        'LLMFeedbackLoop',
+        'FeedbackResult',
+        'IterationResult',
+        'Critique',
+    ),
+    '.llm_provider_router': (
+        'LLMProviderRouter',
+        'ProviderConfig',
+        'RoutingResult',
+        'QueryClassification',
+    ),
+    '.llm_clustering': (
+        'LLMClusterer',
+        'Cluster',
+        'ClusterMetadata',
+        'ChunkReference',
+        'ClusterTree',
+        'ClusteringResult',
+        'ClusteringConfig',
+        'TreeConfig',
+        'save_clustering_result',
+        'load_clustering_result',
+        'save_cluster_tree',
+        'load_cluster_tree',
+        'get_clustering_stats',
+        'save_clustering_result_optimized',
+        'load_clustering_result_optimized',
+        'ChunkStore',
+        'InMemoryChunkStore',
+        'SQLiteChunkStore',
+        'create_chunk_store',
+    ),
+    '.llm_retrieval': (
+        'LLMRetriever',
+        'RetrievalResult',
+        'HierarchicalRetrievalResponse',
+        'RetrievalConfig',
+    ),
+    '.guardrails': (
+        'GuardrailsLLM',
+        'GuardrailAction',
+        'GuardrailResult',
+        'InputGuardrail',
+        'OutputGuardrail',
+        'CompositeGuardrail',
+        'GuardrailException',
+        'GuardrailBlockedException',
+        'GuardrailValidationException',
+        'GuardrailConfigurationException',
+        'GuardrailTimeoutException',
+        'PromptInjectionGuardrail',
+        'TopicFilterGuardrail',
+        'InputPIIDetectionGuardrail',
+        'FormatValidatorGuardrail',
+        'OutputPIIDetectionGuardrail',
+        'ContentSafetyGuardrail',
+        'LengthValidatorGuardrail',
+    ),
+}
+_EXPORT_MODULES = {name: module for module, names in _LAZY_EXPORTS.items() for name in names}
 
 __all__ = [
     'LLM',
@@ -124,3 +151,16 @@ __all__ = [
     'ContentSafetyGuardrail',
     'LengthValidatorGuardrail',
 ]
+
+
+def __getattr__(name):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
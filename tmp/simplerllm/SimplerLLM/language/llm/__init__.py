@@ -1,19 +1,47 @@
-from .base import LLM, LLMProvider
-from .reliable import ReliableLLM
-from .wrappers.openai_wrapper import OpenAILLM
-from .wrappers.gemini_wrapper import GeminiLLM
-from .wrappers.anthropic_wrapper import AnthropicLLM
-from .wrappers.ollama_wrapper import OllamaLLM
-from .wrappers.deepseek_wrapper import DeepSeekLLM
+import importlib
+
+# Loaded on first access (PEP 562) so using one wrapper doesn't import the others
+_LAZY_EXPORTS = {
+    '.base': ('LLM', 'LLMProvider'),
+    '.reliable': ('ReliableLLM',),
+    '.cache': (
+        'CachedLLM',
+        'CacheBackend',
+        'MemoryCacheBackend',
+        'SQLiteCacheBackend',
+    ),
+    '.wrappers.openai_wrapper': ('OpenAILLM',),
+    '.wrappers.gemini_wrapper': ('GeminiLLM',),
+    '.wrappers.anthropic_wrapper': ('AnthropicLLM',),
+    '.wrappers.ollama_wrapper': ('OllamaLLM',),
+    '.wrappers.deepseek_wrapper': ('DeepSeekLLM',),
+}
+_EXPORT_MODULES = {name: module for module, names in _LAZY_EXPORTS.items() for name in names}
 
 __all__ = [
     'LLM',
     'LLMProvider',
     'ReliableLLM',
-    'Message',
+    'CachedLLM',
+    'CacheBackend',
+    'MemoryCacheBackend',
+    'SQLiteCacheBackend',
     'OpenAILLM',
     'GeminiLLM',
     'AnthropicLLM',
     'OllamaLLM',
     'DeepSeekLLM',
 ]
+
+
+def __getattr__(name):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
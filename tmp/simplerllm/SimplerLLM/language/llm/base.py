@@ -12,6 +12,11 @@ from SimplerLLM.tools.json_helpers import (
     validate_json_with_pydantic_model,
     generate_json_example_from_pydantic,
 )
+from SimplerLLM.language.llm_providers.llm_response_models import (
+    LLMBatchItem,
+    LLMBatchResponse,
+    LLMStreamChunk,
+)
 
 class LLMProvider(Enum):
     OPENAI = 1
@@ -91,3 +96,139 @@ class LLM:
             "temperature": temperature if temperature else self.temperature,
             "top_p": top_p if top_p else self.top_p,
         }
+
+    def _chunks_from_response(self, response):
+        """Turn a full response into the delta + final chunk pair a stream would produce."""
+        yield LLMStreamChunk(text=response.generated_text, model=response.model)
+        yield LLMStreamChunk(
+            done=True,
+            model=response.model,
+            generated_text=response.generated_text,
+            input_token_count=response.input_token_count,
+            output_token_count=response.output_token_count,
+            time_to_first_token=response.process_time,
+            process_time=response.process_time,
+        )
+
+    def generate_response_stream(self, **kwargs):
+        """
+        Stream a response as `LLMStreamChunk` objects.
+
+        Wrappers for providers with a streaming API override this. The fallback
+        makes one blocking call and yields the whole text as a single delta
+        followed by the final chunk, so callers can use one code path everywhere.
+        """
+        kwargs["full_response"] = True
+        yield from self._chunks_from_response(self.generate_response(**kwargs))
+
+    async def generate_response_stream_async(self, **kwargs):
+        """Async variant of `generate_response_stream`."""
+        kwargs["full_response"] = True
+        for chunk in self._chunks_from_response(await self.generate_response_async(**kwargs)):
+            yield chunk
+
+    async def generate_batch_async(
+        self,
+        prompts: list,
+        max_concurrency: int = 8,
+        rate_limit: float = None,
+        **kwargs,
+    ) -> LLMBatchResponse:
+        """
+        Generate responses for many prompts concurrently.
+
+        Args:
+            prompts (list): Prompt strings, or dicts of `generate_response_async`
+                arguments (e.g. {"messages": [...]}) for per-item settings.
+            max_concurrency (int, optional): Requests in flight at once. Defaults to 8.
+            rate_limit (float, optional): Maximum requests started per second. Defaults to no limit.
+            **kwargs: Arguments shared by every request (model_name, max_tokens, ...).
+
+        Returns:
+            LLMBatchResponse: One item per prompt, in input order. A failed request
+            sets the item's `error` instead of failing the batch.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        kwargs.pop("full_response", None)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        interval = 1.0 / rate_limit if rate_limit else 0.0
+        pacing_lock = asyncio.Lock()
+        next_start = time.monotonic()
+
+        async def wait_for_slot():
+            nonlocal next_start
+            async with pacing_lock:
+                now = time.monotonic()
+                delay = next_start - now
+                next_start = max(now, next_start) + interval
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        async def run(index, prompt):
+            request = dict(kwargs)
+            request.update(prompt if isinstance(prompt, dict) else {"prompt": prompt})
+            async with semaphore:
+                if interval:
+                    await wait_for_slot()
+                start = time.time()
+                try:
+                    response = await self.generate_response_async(full_response=True, **request)
+                except Exception as e:
+                    if self.verbose:
+                        verbose_print(f"Batch item {index} failed: {e}", "error")
+                    return LLMBatchItem(index=index, prompt=prompt, error=f"{type(e).__name__}: {e}",
+                                        process_time=time.time() - start)
+                return LLMBatchItem(index=index, prompt=prompt, response=response,
+                                    process_time=time.time() - start)
+
+        if self.verbose:
+            verbose_print(f"Generating batch of {len(prompts)} prompts (concurrency {max_concurrency})", "info")
+
+        start = time.time()
+        items = await asyncio.gather(*(run(index, prompt) for index, prompt in enumerate(prompts)))
+        total_time = time.time() - start
+
+        responses = [item.response for item in items if item.response is not None]
+        latencies = [item.process_time for item in items]
+        return LLMBatchResponse(
+            items=items,
+            succeeded=len(responses),
+            failed=len(items) - len(responses),
+            total_time=total_time,
+            mean_latency=sum(latencies) / len(latencies) if latencies else 0.0,
+            max_latency=max(latencies, default=0.0),
+            input_token_count=sum(r.input_token_count or 0 for r in responses),
+            output_token_count=sum(r.output_token_count or 0 for r in responses),
+        )
+
+    def generate_batch(
+        self,
+        prompts: list,
+        max_concurrency: int = 8,
+        rate_limit: float = None,
+        **kwargs,
+    ) -> LLMBatchResponse:
+        """
+        Synchronous entry point for `generate_batch_async`.
+
+        Runs the batch on a private event loop and closes that loop's pooled
+        connections afterwards. Use `generate_batch_async` from async code.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("generate_batch cannot run inside an event loop; await generate_batch_async instead")
+
+        from SimplerLLM.language.llm_providers.http_clients import aclose_clients
+
+        async def run_batch():
+            try:
+                return await self.generate_batch_async(prompts, max_concurrency, rate_limit, **kwargs)
+            finally:
+                await aclose_clients()
+
+        return asyncio.run(run_batch())
@@ -0,0 +1,395 @@
+"""
+Response caching for LLM calls.
+
+`CachedLLM` wraps any `LLM` instance and serves repeated calls from a cache
+instead of the provider. The key is a SHA-256 of the canonical JSON of
+(provider, model, prompt/messages, system prompt, sampling params, json_mode
+and any other arguments), so only identical requests share an entry.
+Only deterministic calls (effective temperature 0) are cached by default, so
+repeated sampling calls still return fresh text; pass
+`deterministic_only=False` to cache those too.
+
+    llm = CachedLLM(LLM.create(LLMProvider.OPENAI, model_name="gpt-4o-mini", temperature=0),
+                    backend=SQLiteCacheBackend("llm_cache.sqlite3"), ttl=86400)
+    llm.generate_response(prompt="Classify: ...", temperature=0)
+    print(llm.stats)
+
+Backends evict least-recently-used entries past `max_entries` / `max_bytes`
+and drop entries older than their TTL:
+
+- `MemoryCacheBackend`: per process, an OrderedDict behind a lock
+- `SQLiteCacheBackend`: one file shared by every process on the host
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from .base import LLM
+from SimplerLLM.utils.custom_verbose import verbose_print
+from SimplerLLM.language.llm_providers.llm_response_models import LLMFullResponse
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class CacheBackend:
+    """Interface for `CachedLLM` storage. Values are opaque bytes."""
+
+    # Entries dropped by LRU, size or TTL eviction so far
+    evictions = 0
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value: bytes, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with optional TTL and entry/byte limits."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, expires)
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self.total_bytes -= len(value)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self.total_bytes += len(value)
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes and self.total_bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    LRU cache in a SQLite file (WAL mode), shared by every process that opens it.
+
+    Reads bump `last_used`; writes evict the least recently used rows once the
+    table exceeds `max_entries` or `max_bytes`.
+    """
+
+    def __init__(self, path: str = "simplerllm_cache.sqlite3", max_entries: int = 100_000, max_bytes: int = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, expires REAL, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value FROM llm_cache WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+        return bytes(row[0])
+
+    def set(self, key, value, ttl=None):
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, expires, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), now + ttl if ttl else None, now),
+            )
+            self._evict(conn, now)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _evict(self, conn, now):
+        removed = conn.execute("DELETE FROM llm_cache WHERE expires IS NOT NULL AND expires <= ?", (now,)).rowcount
+        count, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if count > self.max_entries:
+            removed += conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+            total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if self.max_bytes:
+            while total_bytes > self.max_bytes:
+                row = conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used LIMIT 1").fetchone()
+                if row is None:
+                    break
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (row[0],))
+                total_bytes -= row[1]
+                removed += 1
+        self.evictions += removed
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM llm_cache")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+def _canonical(value):
+    """JSON-compatible form of a request argument with a stable ordering."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, "model_dump"):
+        return _canonical(value.model_dump())
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+class CachedLLM(LLM):
+    """
+    Wraps an `LLM` and caches its responses.
+
+    `generate_response`, `generate_response_async`, the streaming methods and
+    `generate_batch` are served from the cache; everything else is forwarded
+    to the wrapped instance.
+    """
+
+    def __init__(
+        self,
+        llm: LLM,
+        backend: CacheBackend = None,
+        ttl: float = None,
+        deterministic_only: bool = True,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            llm (LLM): The instance whose calls are cached.
+            backend (CacheBackend, optional): Storage. Defaults to a MemoryCacheBackend.
+            ttl (float, optional): Seconds an entry stays valid. Defaults to no expiry.
+            deterministic_only (bool, optional): Only cache calls whose effective temperature
+                is 0. Defaults to True; set False to also cache sampled calls.
+        """
+        self.llm = llm
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.deterministic_only = deterministic_only
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        super().__init__(
+            llm.provider, llm.model_name, llm.temperature, llm.top_p, llm.api_key, llm.user_id, verbose=verbose
+        )
+
+    def __getattr__(self, name):
+        # Only reached for attributes CachedLLM doesn't define
+        llm = self.__dict__.get("llm")
+        if llm is None:
+            raise AttributeError(name)
+        return getattr(llm, name)
+
+    def cache_key(self, **kwargs) -> str:
+        """Return the cache key for a `generate_response` call with these arguments."""
+        kwargs.pop("full_response", None)
+        request = {
+            "provider": self.llm.provider.name,
+            "model_name": kwargs.pop("model_name", None) or self.llm.model_name,
+            "instance_temperature": self.llm.temperature,
+            "instance_top_p": self.llm.top_p,
+            **kwargs,
+        }
+        encoded = json.dumps(_canonical(request), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _effective_temperature(self, method, kwargs):
+        """
+        Temperature the wrapped call will sample at.
+
+        An omitted argument takes the wrapped method's default, and
+        `prepare_params` replaces a falsy value with the instance temperature.
+        """
+        temperature = kwargs.get("temperature")
+        if temperature is None:
+            parameter = inspect.signature(getattr(self.llm, method)).parameters.get("temperature")
+            if parameter is not None and parameter.default is not inspect.Parameter.empty:
+                temperature = parameter.default
+        return temperature if temperature else self.llm.temperature
+
+    def _cacheable(self, method, kwargs):
+        return not self.deterministic_only or self._effective_temperature(method, kwargs) == 0
+
+    def _count(self, field, amount=1):
+        with self._stats_lock:
+            setattr(self.stats, field, getattr(self.stats, field) + amount)
+
+    def _lookup(self, key):
+        raw = self.backend.get(key)
+        if raw is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        if self.verbose:
+            verbose_print(f"Cache hit {key[:12]}", "debug")
+        return pickle.loads(raw)
+
+    def _store(self, key, response):
+        evictions_before = self.backend.evictions
+        self.backend.set(key, pickle.dumps(response, pickle.HIGHEST_PROTOCOL), ttl=self.ttl)
+        self._count("writes")
+        self._count("evictions", self.backend.evictions - evictions_before)
+
+    @staticmethod
+    def _result(response, full_response):
+        return response if full_response else response.generated_text
+
+    def generate_response(self, full_response: bool = False, **kwargs):
+        """Cached `generate_response`; takes the wrapped instance's arguments."""
+        if not self._cacheable("generate_response", kwargs):
+            return self.llm.generate_response(full_response=full_response, **kwargs)
+        key = self.cache_key(**kwargs)
+        response = self._lookup(key)
+        if response is None:
+            response = self.llm.generate_response(full_response=True, **kwargs)
+            if response is None:
+                return None
+            self._store(key, response)
+        return self._result(response, full_response)
+
+    async def generate_response_async(self, full_response: bool = False, **kwargs):
+        """Cached `generate_response_async`; takes the wrapped instance's arguments."""
+        if not self._cacheable("generate_response_async", kwargs):
+            return await self.llm.generate_response_async(full_response=full_response, **kwargs)
+        key = self.cache_key(**kwargs)
+        response = self._lookup(key)
+        if response is None:
+            response = await self.llm.generate_response_async(full_response=True, **kwargs)
+            if response is None:
+                return None
+            self._store(key, response)
+        return self._result(response, full_response)
+
+    @staticmethod
+    def _response_from_stream(final):
+        return LLMFullResponse(
+            generated_text=final.generated_text,
+            model=final.model,
+            process_time=final.process_time,
+            input_token_count=final.input_token_count,
+            output_token_count=final.output_token_count,
+            llm_provider_response=None,
+        )
+
+    def generate_response_stream(self, **kwargs):
+        """Stream from the wrapped instance, or replay a cached response as one delta."""
+        if not self._cacheable("generate_response_stream", kwargs):
+            yield from self.llm.generate_response_stream(**kwargs)
+            return
+        key = self.cache_key(**kwargs)
+        response = self._lookup(key)
+        if response is not None:
+            yield from self._chunks_from_response(response)
+            return
+        for chunk in self.llm.generate_response_stream(**kwargs):
+            if chunk.done:
+                self._store(key, self._response_from_stream(chunk))
+            yield chunk
+
+    async def generate_response_stream_async(self, **kwargs):
+        """Async variant of `generate_response_stream`."""
+        if not self._cacheable("generate_response_stream_async", kwargs):
+            async for chunk in self.llm.generate_response_stream_async(**kwargs):
+                yield chunk
+            return
+        key = self.cache_key(**kwargs)
+        response = self._lookup(key)
+        if response is not None:
+            for chunk in self._chunks_from_response(response):
+                yield chunk
+            return
+        async for chunk in self.llm.generate_response_stream_async(**kwargs):
+            if chunk.done:
+                self._store(key, self._response_from_stream(chunk))
+            yield chunk
@@ -14,7 +14,7 @@ class DeepSeekLLM(LLM):
             model_messages.extend(messages)
         return model_messages
 
-    def generate_response(
+    def _prepare_request(
         self,
         model_name: str = None,
         prompt: str = None,
@@ -23,28 +23,9 @@ class DeepSeekLLM(LLM):
         temperature: float = 0.7,
         max_tokens: int = 300,
         top_p: float = 1.0,
-        full_response: bool = False,
         json_mode=False,
     ):
-        """
-        Generate a response using the DeepSeek language model.
-
-        Args:
-            model_name (str, optional): The name of the model to use. Defaults to the instance's model_name.
-            prompt (str, optional): A single prompt string to generate a response for.
-            messages (list, optional): A list of message dictionaries for chat-based interactions.
-            system_prompt (str, optional): The system prompt to set the context. Defaults to "You are a helpful AI Assistant".
-            temperature (float, optional): Controls randomness in output. Defaults to 0.7.
-            max_tokens (int, optional): The maximum number of tokens to generate. Defaults to 300.
-            top_p (float, optional): Controls diversity of output. Defaults to 1.0.
-            full_response (bool, optional): If True, returns the full API response. If False, returns only the generated text. Defaults to False.
-
-        Returns:
-            str or dict: The generated response as a string, or the full API response as a dictionary if full_response is True.
-
-        Raises:
-            ValueError: If both prompt and messages are provided, or if neither is provided.
-        """
+        """Validate the input and build the keyword arguments for the DeepSeek provider call."""
         params = self.prepare_params(model_name, temperature, top_p)
 
         # Validate inputs
@@ -78,11 +59,54 @@ class DeepSeekLLM(LLM):
                 "api_key": self.api_key,
                 "messages": model_messages,
                 "max_tokens": max_tokens,
-                "full_response": full_response,
                 "json_mode": json_mode
             }
         )
-        
+        return params
+
+    def generate_response(
+        self,
+        model_name: str = None,
+        prompt: str = None,
+        messages: list = None,
+        system_prompt: str = "You are a helpful AI Assistant",
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        top_p: float = 1.0,
+        full_response: bool = False,
+        json_mode=False,
+    ):
+        """
+        Generate a response using the DeepSeek language model.
+
+        Args:
+            model_name (str, optional): The name of the model to use. Defaults to the instance's model_name.
+            prompt (str, optional): A single prompt string to generate a response for.
+            messages (list, optional): A list of message dictionaries for chat-based interactions.
+            system_prompt (str, optional): The system prompt to set the context. Defaults to "You are a helpful AI Assistant".
+            temperature (float, optional): Controls randomness in output. Defaults to 0.7.
+            max_tokens (int, optional): The maximum number of tokens to generate. Defaults to 300.
+            top_p (float, optional): Controls diversity of output. Defaults to 1.0.
+            full_response (bool, optional): If True, returns the full API response. If False, returns only the generated text. Defaults to False.
+
+        Returns:
+            str or dict: The generated response as a string, or the full API response as a dictionary if full_response is True.
+
+        Raises:
+            ValueError: If both prompt and messages are provided, or if neither is provided.
+        """
+        params = self._prepare_request(
+            model_name=model_name,
+            prompt=prompt,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            json_mode=json_mode,
+        )
+        params["full_response"] = full_response
+
         if self.verbose:
             verbose_print("Generating response with DeepSeek...", "info")
             
@@ -127,44 +151,18 @@ class DeepSeekLLM(LLM):
         Raises:
             ValueError: If both prompt and messages are provided, or if neither is provided.
         """
-        params = self.prepare_params(model_name, temperature, top_p)
-
-        # Validate inputs
-        if prompt and messages:
-            if self.verbose:
-                verbose_print("Error: Both prompt and messages provided", "error")
-            raise ValueError("Only one of 'prompt' or 'messages' should be provided.")
-        if not prompt and not messages:
-            if self.verbose:
-                verbose_print("Error: Neither prompt nor messages provided", "error")
-            raise ValueError("Either 'prompt' or 'messages' must be provided.")
-
-        # Prepare messages based on input type
-        if prompt:
-            if self.verbose:
-                verbose_print("Preparing single prompt message", "debug")
-                verbose_print(f"System prompt: {system_prompt}", "debug")
-                verbose_print(f"User prompt: {prompt}", "debug")
-            model_messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt},
-            ]
-
-        if messages:
-            if self.verbose:
-                verbose_print("Preparing chat messages", "debug")
-            model_messages = self.append_messages(system_prompt, messages)
-
-        params.update(
-            {
-                "api_key": self.api_key,
-                "messages": model_messages,
-                "max_tokens": max_tokens,
-                "full_response": full_response,
-                "json_mode": json_mode
-            }
+        params = self._prepare_request(
+            model_name=model_name,
+            prompt=prompt,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            json_mode=json_mode,
         )
-        
+        params["full_response"] = full_response
+
         if self.verbose:
             verbose_print("Generating response with DeepSeek (async)...", "info")
             
@@ -177,3 +175,67 @@ class DeepSeekLLM(LLM):
             if self.verbose:
                 verbose_print(f"Error generating response: {str(e)}", "error")
             raise
+
+
+    def generate_response_stream(
+        self,
+        model_name: str = None,
+        prompt: str = None,
+        messages: list = None,
+        system_prompt: str = "You are a helpful AI Assistant",
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        top_p: float = 1.0,
+        json_mode=False,
+    ):
+        """
+        Stream a response from DeepSeek as it is generated.
+
+        Takes the same arguments as `generate_response` except `full_response`.
+        Yields `LLMStreamChunk` objects: one per text delta, then a final chunk
+        with `done=True`, the full text, token usage and time to first token.
+        """
+        params = self._prepare_request(
+            model_name=model_name,
+            prompt=prompt,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            json_mode=json_mode,
+        )
+
+        if self.verbose:
+            verbose_print("Streaming response with DeepSeek...", "info")
+
+        yield from deepseek_llm.generate_response_stream(**params)
+
+    async def generate_response_stream_async(
+        self,
+        model_name: str = None,
+        prompt: str = None,
+        messages: list = None,
+        system_prompt: str = "You are a helpful AI Assistant",
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        top_p: float = 1.0,
+        json_mode=False,
+    ):
+        """Async variant of `generate_response_stream`."""
+        params = self._prepare_request(
+            model_name=model_name,
+            prompt=prompt,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            json_mode=json_mode,
+        )
+
+        if self.verbose:
+            verbose_print("Streaming response with DeepSeek (async)...", "info")
+
+        async for chunk in deepseek_llm.generate_response_stream_async(**params):
+            yield chunk
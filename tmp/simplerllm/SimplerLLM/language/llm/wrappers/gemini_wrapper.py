@@ -1,7 +1,7 @@
 import SimplerLLM.language.llm_providers.gemini_llm as gemini_llm
 import os
 import base64
-import requests
+from SimplerLLM.language.llm_providers.http_clients import get_session
 import json
 from ..base import LLM
 from SimplerLLM.utils.custom_verbose import verbose_print
@@ -50,12 +50,12 @@ class GeminiLLM(LLM):
             "ttl": f"{ttl}s"
         }
         
-        response = requests.post(cache_url, headers=headers, data=json.dumps(cache_payload))
+        response = get_session("gemini").post(cache_url, headers=headers, data=json.dumps(cache_payload))
         response.raise_for_status()
 
         return response.json()["name"]
 
-    def generate_response(
+    def _prepare_request(
         self,
         model_name: str = None,
         prompt: str = None,
@@ -64,32 +64,11 @@ class GeminiLLM(LLM):
         temperature: float = 0.7,
         max_tokens: int = 300,
         top_p: float = 1.0,
-        full_response: bool = False,
         prompt_caching: bool = False,
         cache_id: str = None,
         json_mode=False,
     ):
-        """
-        Generate a response using the Gemini model.
-
-        Args:
-            model_name (str, optional): The name of the model to use. Defaults to the instance's model_name.
-            prompt (str, optional): A single prompt string to generate a response for.
-            messages (list, optional): A list of message dictionaries for chat-based interactions.
-            system_prompt (str, optional): The system prompt to set the context. Defaults to "You are a helpful AI Assistant".
-            temperature (float, optional): Controls randomness in output. Defaults to 0.7.
-            max_tokens (int, optional): The maximum number of tokens to generate. Defaults to 300.
-            top_p (float, optional): Controls diversity of output. Defaults to 1.0.
-            full_response (bool, optional): If True, returns the full API response. If False, returns only the generated text. Defaults to False.
-            prompt_caching (bool, optional): Whether to use prompt caching. Defaults to False.
-            cache_id (str, optional): The cache ID to use if prompt_caching is True.
-
-        Returns:
-            str or dict: The generated response text, or the full API response if full_response is True.
-
-        Raises:
-            ValueError: If both prompt and messages are provided, or if neither is provided.
-        """
+        """Validate the input and build the keyword arguments for the Gemini provider call."""
         params = self.prepare_params(model_name, temperature, top_p)
 
         # Validate inputs
@@ -124,12 +103,61 @@ class GeminiLLM(LLM):
                 "system_prompt": system_prompt,
                 "messages": model_messages,
                 "max_tokens": max_tokens,
-                "full_response": full_response,
                 "prompt_caching": prompt_caching,
                 "cache_id": cache_id,
-                "json_mode" : json_mode     
+                "json_mode" : json_mode
             }
         )
+        return params
+
+    def generate_response(
+        self,
+        model_name: str = None,
+        prompt: str = None,
+        messages: list = None,
+        system_prompt: str = "You are a helpful AI Assistant",
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        top_p: float = 1.0,
+        full_response: bool = False,
+        prompt_caching: bool = False,
+        cache_id: str = None,
+        json_mode=False,
+    ):
+        """
+        Generate a response using the Gemini model.
+
+        Args:
+            model_name (str, optional): The name of the model to use. Defaults to the instance's model_name.
+            prompt (str, optional): A single prompt string to generate a response for.
+            messages (list, optional): A list of message dictionaries for chat-based interactions.
+            system_prompt (str, optional): The system prompt to set the context. Defaults to "You are a helpful AI Assistant".
+            temperature (float, optional): Controls randomness in output. Defaults to 0.7.
+            max_tokens (int, optional): The maximum number of tokens to generate. Defaults to 300.
+            top_p (float, optional): Controls diversity of output. Defaults to 1.0.
+            full_response (bool, optional): If True, returns the full API response. If False, returns only the generated text. Defaults to False.
+            prompt_caching (bool, optional): Whether to use prompt caching. Defaults to False.
+            cache_id (str, optional): The cache ID to use if prompt_caching is True.
+
+        Returns:
+            str or dict: The generated response text, or the full API response if full_response is True.
+
+        Raises:
+            ValueError: If both prompt and messages are provided, or if neither is provided.
+        """
+        params = self._prepare_request(
+            model_name=model_name,
+            prompt=prompt,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            prompt_caching=prompt_caching,
+            cache_id=cache_id,
+            json_mode=json_mode,
+        )
+        params["full_response"] = full_response
 
         if self.verbose:
             verbose_print("Generating response with Gemini...", "info")
@@ -181,46 +209,19 @@ class GeminiLLM(LLM):
         Raises:
             ValueError: If both prompt and messages are provided, or if neither is provided.
         """
-        params = self.prepare_params(model_name, temperature, top_p)
-
-        # Validate inputs
-        if prompt and messages:
-            if self.verbose:
-                verbose_print("Error: Both prompt and messages provided", "error")
-            raise ValueError("Only one of 'prompt' or 'messages' should be provided.")
-        if not prompt and not messages:
-            if self.verbose:
-                verbose_print("Error: Neither prompt nor messages provided", "error")
-            raise ValueError("Either 'prompt' or 'messages' must be provided.")
-
-        if prompt:
-            if self.verbose:
-                verbose_print("Preparing single prompt message", "debug")
-                verbose_print(f"System prompt: {system_prompt}", "debug")
-                verbose_print(f"User prompt: {prompt}", "debug")
-            model_messages = [
-                {"role": "user", "parts": [{"text": system_prompt}]},
-                {"role": "model", "parts": [{"text": "ok, confirmed."}]},
-                {"role": "user", "parts": [{"text": prompt}]}
-            ]
-
-        if messages:
-            if self.verbose:
-                verbose_print("Preparing chat messages", "debug")
-            model_messages = self.append_messages(system_prompt, messages)
-
-        params.update(
-            {
-                "api_key": self.api_key,
-                "system_prompt": system_prompt,
-                "messages": model_messages,
-                "max_tokens": max_tokens,
-                "full_response": full_response,
-                "prompt_caching": prompt_caching,
-                "cache_id": cache_id,
-                "json_mode" : json_mode     
-            }
+        params = self._prepare_request(
+            model_name=model_name,
+            prompt=prompt,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            prompt_caching=prompt_caching,
+            cache_id=cache_id,
+            json_mode=json_mode,
         )
+        params["full_response"] = full_response
 
         if self.verbose:
             verbose_print("Generating response with Gemini (async)...", "info")
@@ -236,3 +237,75 @@ class GeminiLLM(LLM):
             if self.verbose:
                 verbose_print(f"Error generating response: {str(e)}", "error")
             raise
+
+
+    def generate_response_stream(
+        self,
+        model_name: str = None,
+        prompt: str = None,
+        messages: list = None,
+        system_prompt: str = "You are a helpful AI Assistant",
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        top_p: float = 1.0,
+        prompt_caching: bool = False,
+        cache_id: str = None,
+        json_mode=False,
+    ):
+        """
+        Stream a response from Gemini as it is generated.
+
+        Takes the same arguments as `generate_response` except `full_response`.
+        Yields `LLMStreamChunk` objects: one per text delta, then a final chunk
+        with `done=True`, the full text, token usage and time to first token.
+        """
+        params = self._prepare_request(
+            model_name=model_name,
+            prompt=prompt,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            prompt_caching=prompt_caching,
+            cache_id=cache_id,
+            json_mode=json_mode,
+        )
+
+        if self.verbose:
+            verbose_print("Streaming response with Gemini...", "info")
+
+        yield from gemini_llm.generate_response_stream(**params)
+
+    async def generate_response_stream_async(
+        self,
+        model_name: str = None,
+        prompt: str = None,
+        messages: list = None,
+        system_prompt: str = "You are a helpful AI Assistant",
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        top_p: float = 1.0,
+        prompt_caching: bool = False,
+        cache_id: str = None,
+        json_mode=False,
+    ):
+        """Async variant of `generate_response_stream`."""
+        params = self._prepare_request(
+            model_name=model_name,
+            prompt=prompt,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            prompt_caching=prompt_caching,
+            cache_id=cache_id,
+            json_mode=json_mode,
+        )
+
+        if self.verbose:
+            verbose_print("Streaming response with Gemini (async)...", "info")
+
+        async for chunk in gemini_llm.generate_response_stream_async(**params):
+            yield chunk
@@ -1,11 +1,11 @@
 from typing import Dict, Optional
 import os
 from dotenv import load_dotenv
-import aiohttp
 import asyncio
 import time
-import requests
+from .http_clients import get_async_session, get_session
 from .llm_response_models import LLMFullResponse
+from .streaming import StreamState, aiter_sse_events, iter_sse_events
 
 # Load environment variables
 load_dotenv(override=True)
@@ -13,6 +13,7 @@ load_dotenv(override=True)
 # Constants
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
 RETRY_DELAY = int(os.getenv("RETRY_DELAY", 2))
+ANTHROPIC_URL = "https://api.anthropic.com/v1/messages"
 
 
 def generate_response(
@@ -38,7 +39,7 @@ def generate_response(
     retry_delay = 1  # initial delay between retries in seconds
 
     # Define the URL and headers
-    url = "https://api.anthropic.com/v1/messages"
+    url = ANTHROPIC_URL
     headers = {
         "x-api-key": api_key,
         "anthropic-version": "2023-06-01",
@@ -75,7 +76,7 @@ def generate_response(
 
     for attempt in range(retry_attempts):
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = get_session("anthropic").post(url, headers=headers, json=payload)
             response.raise_for_status()  # Raises HTTPError for bad requests (4XX or 5XX)
 
             if full_response:
@@ -124,7 +125,7 @@ async def generate_response_async(
     retry_delay = 1  # initial delay between retries in seconds
 
     # Define the URL and headers
-    url = "https://api.anthropic.com/v1/messages"
+    url = ANTHROPIC_URL
     headers = {
         "x-api-key": api_key,
         "anthropic-version": "2023-06-01",
@@ -159,29 +160,131 @@ async def generate_response_async(
     else:
         payload["system"] = system_prompt
 
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(retry_attempts):
-            try:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    response.raise_for_status()
-                    json_response = await response.json()
-                    if full_response:
-                        return LLMFullResponse(
-                            generated_text=json_response["content"][0]["text"],
-                            model=model_name,
-                            process_time=time.time() - start_time,
-                            input_token_count=json_response["usage"]["input_tokens"],
-                            output_token_count=json_response["usage"]["output_tokens"],
-                            llm_provider_response=json_response,
-                        )
-                    else:
-                        return json_response["content"][0]["text"]
-
-            except Exception as e:
-                if attempt < retry_attempts - 1:
-                    print(f"Attempt {attempt + 1} failed: {e}")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 2  # Double the delay each retry
+    session = get_async_session("anthropic")
+    for attempt in range(retry_attempts):
+        try:
+            async with session.post(url, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                json_response = await response.json()
+                if full_response:
+                    return LLMFullResponse(
+                        generated_text=json_response["content"][0]["text"],
+                        model=model_name,
+                        process_time=time.time() - start_time,
+                        input_token_count=json_response["usage"]["input_tokens"],
+                        output_token_count=json_response["usage"]["output_tokens"],
+                        llm_provider_response=json_response,
+                    )
                 else:
-                    error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
-                    raise Exception(error_msg)
+                    return json_response["content"][0]["text"]
+
+        except Exception as e:
+            if attempt < retry_attempts - 1:
+                print(f"Attempt {attempt + 1} failed: {e}")
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 2  # Double the delay each retry
+            else:
+                error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
+                raise Exception(error_msg)
+
+
+def _stream_request(model_name, system_prompt, messages, temperature, max_tokens, top_p,
+                    prompt_caching, cached_input, cache_control_type, api_key):
+    headers = {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json",
+    }
+    if prompt_caching:
+        headers["anthropic-beta"] = "prompt-caching-2024-07-31"
+
+    payload = {
+        "model": model_name,
+        "max_tokens": max_tokens,
+        "messages": messages,
+        "temperature": temperature,
+        "top_p": top_p,
+        "stream": True,
+    }
+    if prompt_caching:
+        payload["system"] = [
+            {"type": "text", "text": system_prompt},
+            {"type": "text", "text": cached_input, "cache_control": {"type": cache_control_type}},
+        ]
+    else:
+        payload["system"] = system_prompt
+    return headers, payload
+
+
+def _apply_event(state, event):
+    """Return the text delta of an Anthropic stream event, recording usage on the way."""
+    event_type = event.get("type")
+    if event_type == "message_start":
+        state.usage(input_tokens=event["message"].get("usage", {}).get("input_tokens"))
+    elif event_type == "message_delta":
+        state.usage(output_tokens=event.get("usage", {}).get("output_tokens"))
+    elif event_type == "content_block_delta" and event["delta"].get("type") == "text_delta":
+        return event["delta"]["text"]
+    elif event_type == "error":
+        raise Exception(f"Anthropic stream error: {event.get('error')}")
+    return None
+
+
+def generate_response_stream(
+    model_name: str,
+    system_prompt: str = "You are a helpful AI Assistant",
+    messages=None,
+    temperature: float = 0.7,
+    max_tokens: int = 300,
+    top_p: float = 1.0,
+    prompt_caching: bool = False,
+    cached_input: str = "",
+    cache_control_type: str = "ephemeral",
+    api_key=None,
+    json_mode=False,
+):
+    """
+    Stream a message from the Anthropic API, yielding LLMStreamChunk text deltas
+    and a final chunk with the full text and token usage.
+    """
+    state = StreamState(model_name)
+    headers, payload = _stream_request(
+        model_name, system_prompt, messages, temperature, max_tokens, top_p,
+        prompt_caching, cached_input, cache_control_type, api_key,
+    )
+    with get_session("anthropic").post(ANTHROPIC_URL, headers=headers, json=payload, stream=True) as response:
+        response.raise_for_status()
+        for event in iter_sse_events(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
+
+
+async def generate_response_stream_async(
+    model_name: str,
+    system_prompt: str = "You are a helpful AI Assistant",
+    messages=None,
+    temperature: float = 0.7,
+    max_tokens: int = 300,
+    top_p: float = 1.0,
+    prompt_caching: bool = False,
+    cached_input: str = "",
+    cache_control_type: str = "ephemeral",
+    api_key=None,
+    json_mode=False,
+):
+    """Async variant of `generate_response_stream`."""
+    state = StreamState(model_name)
+    headers, payload = _stream_request(
+        model_name, system_prompt, messages, temperature, max_tokens, top_p,
+        prompt_caching, cached_input, cache_control_type, api_key,
+    )
+    session = get_async_session("anthropic")
+    async with session.post(ANTHROPIC_URL, headers=headers, json=payload) as response:
+        response.raise_for_status()
+        async for event in aiter_sse_events(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
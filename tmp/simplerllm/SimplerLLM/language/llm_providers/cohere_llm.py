@@ -1,11 +1,11 @@
 from typing import Dict, Optional
 import os
 from dotenv import load_dotenv
-import aiohttp
 import asyncio
 import time
-import requests
+from .http_clients import get_async_session, get_session
 from .llm_response_models import LLMFullResponse
+from .streaming import StreamState, aiter_json_lines, iter_json_lines
 
 # Load environment variables
 load_dotenv(override=True)
@@ -13,6 +13,7 @@ load_dotenv(override=True)
 # Constants
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
 RETRY_DELAY = int(os.getenv("RETRY_DELAY", 2))
+COHERE_CHAT_URL = "https://api.cohere.com/v1/chat"
 
 
 def generate_response(
@@ -35,7 +36,7 @@ def generate_response(
     retry_delay = 1  # initial delay between retries in seconds
 
     # Define the URL and headers
-    url = "https://api.cohere.com/v1/chat"
+    url = COHERE_CHAT_URL
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
@@ -76,7 +77,7 @@ def generate_response(
 
     for attempt in range(retry_attempts):
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = get_session("cohere").post(url, headers=headers, json=payload)
             response.raise_for_status()  # Raises HTTPError for bad requests (4XX or 5XX)
 
             response_json = response.json()
@@ -123,7 +124,7 @@ async def generate_response_async(
     retry_delay = 1  # initial delay between retries in seconds
 
     # Define the URL and headers
-    url = "https://api.cohere.com/v1/chat"
+    url = COHERE_CHAT_URL
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
@@ -162,33 +163,33 @@ async def generate_response_async(
     if json_mode:
         payload["response_format"] = {"type": "json_object"}
 
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(retry_attempts):
-            try:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    response.raise_for_status()
-                    json_response = await response.json()
+    session = get_async_session("cohere")
+    for attempt in range(retry_attempts):
+        try:
+            async with session.post(url, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                json_response = await response.json()
                     
-                    if full_response:
-                        return LLMFullResponse(
-                            generated_text=json_response["text"],
-                            model=model_name,
-                            process_time=time.time() - start_time,
-                            input_token_count=json_response.get("meta", {}).get("tokens", {}).get("input_tokens"),
-                            output_token_count=json_response.get("meta", {}).get("tokens", {}).get("output_tokens"),
-                            llm_provider_response=json_response,
-                        )
-                    else:
-                        return json_response["text"]
-
-            except Exception as e:
-                if attempt < retry_attempts - 1:
-                    print(f"Attempt {attempt + 1} failed: {e}")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 2  # Double the delay each retry
+                if full_response:
+                    return LLMFullResponse(
+                        generated_text=json_response["text"],
+                        model=model_name,
+                        process_time=time.time() - start_time,
+                        input_token_count=json_response.get("meta", {}).get("tokens", {}).get("input_tokens"),
+                        output_token_count=json_response.get("meta", {}).get("tokens", {}).get("output_tokens"),
+                        llm_provider_response=json_response,
+                    )
                 else:
-                    error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
-                    raise Exception(error_msg)
+                    return json_response["text"]
+
+        except Exception as e:
+            if attempt < retry_attempts - 1:
+                print(f"Attempt {attempt + 1} failed: {e}")
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 2  # Double the delay each retry
+            else:
+                error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
+                raise Exception(error_msg)
 
 
 def generate_embeddings(
@@ -244,7 +245,7 @@ def generate_embeddings(
 
     for attempt in range(retry_attempts):
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = get_session("cohere").post(url, headers=headers, json=payload)
             response.raise_for_status()
 
             response_json = response.json()
@@ -325,34 +326,125 @@ async def generate_embeddings_async(
     if embedding_types:
         payload["embedding_types"] = embedding_types
 
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(retry_attempts):
-            try:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    response.raise_for_status()
-                    json_response = await response.json()
+    session = get_async_session("cohere")
+    for attempt in range(retry_attempts):
+        try:
+            async with session.post(url, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                json_response = await response.json()
                     
-                    embeddings = json_response["embeddings"]
+                embeddings = json_response["embeddings"]
                     
-                    # Return single embedding if single input was provided
-                    if isinstance(user_input, str):
-                        embeddings = embeddings[0]
-
-                    if full_response:
-                        return LLMEmbeddingsResponse(
-                            generated_embedding=embeddings,
-                            model=model_name,
-                            process_time=time.time() - start_time,
-                            llm_provider_response=json_response,
-                        )
-                    else:
-                        return embeddings
-
-            except Exception as e:
-                if attempt < retry_attempts - 1:
-                    print(f"Attempt {attempt + 1} failed: {e}")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 2
+                # Return single embedding if single input was provided
+                if isinstance(user_input, str):
+                    embeddings = embeddings[0]
+
+                if full_response:
+                    return LLMEmbeddingsResponse(
+                        generated_embedding=embeddings,
+                        model=model_name,
+                        process_time=time.time() - start_time,
+                        llm_provider_response=json_response,
+                    )
                 else:
-                    error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
-                    raise Exception(error_msg)
\ No newline at end of file
+                    return embeddings
+
+        except Exception as e:
+            if attempt < retry_attempts - 1:
+                print(f"Attempt {attempt + 1} failed: {e}")
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 2
+            else:
+                error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
+                raise Exception(error_msg)
+
+
+def _stream_request(model_name, system_prompt, messages, temperature, max_tokens, top_p, api_key, json_mode):
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+
+    chat_history = []
+    user_message = ""
+    for message in messages or []:
+        if message["role"] == "user":
+            user_message = message["content"]
+        elif message["role"] == "assistant":
+            chat_history.append({"role": "CHATBOT", "message": message["content"]})
+        elif message["role"] == "system":
+            system_prompt = message["content"]
+
+    payload = {
+        "model": model_name,
+        "message": user_message,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "p": top_p,
+        "preamble": system_prompt,
+        "stream": True,
+    }
+    if chat_history:
+        payload["chat_history"] = chat_history
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    return headers, payload
+
+
+def _apply_event(state, event):
+    """Return the text of a Cohere stream event; "stream-end" carries the token counts."""
+    event_type = event.get("event_type")
+    if event_type == "text-generation":
+        return event.get("text")
+    if event_type == "stream-end":
+        tokens = (event.get("response") or {}).get("meta", {}).get("tokens", {})
+        state.usage(tokens.get("input_tokens"), tokens.get("output_tokens"))
+    return None
+
+
+def generate_response_stream(
+    model_name: str,
+    system_prompt: str = "You are a helpful AI Assistant",
+    messages=None,
+    temperature: float = 0.7,
+    max_tokens: int = 300,
+    top_p: float = 1.0,
+    api_key=None,
+    json_mode=False,
+):
+    """
+    Stream a chat response from the Cohere API, yielding LLMStreamChunk text
+    deltas and a final chunk with the full text and token usage.
+    """
+    state = StreamState(model_name)
+    headers, payload = _stream_request(model_name, system_prompt, messages, temperature, max_tokens, top_p, api_key, json_mode)
+    with get_session("cohere").post(COHERE_CHAT_URL, headers=headers, json=payload, stream=True) as response:
+        response.raise_for_status()
+        for event in iter_json_lines(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
+
+
+async def generate_response_stream_async(
+    model_name: str,
+    system_prompt: str = "You are a helpful AI Assistant",
+    messages=None,
+    temperature: float = 0.7,
+    max_tokens: int = 300,
+    top_p: float = 1.0,
+    api_key=None,
+    json_mode=False,
+):
+    """Async variant of `generate_response_stream`."""
+    state = StreamState(model_name)
+    headers, payload = _stream_request(model_name, system_prompt, messages, temperature, max_tokens, top_p, api_key, json_mode)
+    session = get_async_session("cohere")
+    async with session.post(COHERE_CHAT_URL, headers=headers, json=payload) as response:
+        response.raise_for_status()
+        async for event in aiter_json_lines(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
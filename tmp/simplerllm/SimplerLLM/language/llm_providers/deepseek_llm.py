@@ -2,15 +2,16 @@ from dotenv import load_dotenv
 import asyncio
 import os
 import time
-import requests
-import aiohttp
+from .http_clients import get_async_session, get_session
 from .llm_response_models import LLMFullResponse
+from .streaming import StreamState, aiter_sse_events, iter_sse_events
 
 # Load environment variables
 load_dotenv(override=True)
 
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
 RETRY_DELAY = int(os.getenv("RETRY_DELAY", 2))
+DEEPSEEK_URL = "https://api.deepseek.com/chat/completions"
 
 def generate_response(
     model_name,
@@ -43,8 +44,8 @@ def generate_response(
     
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.post(
-                "https://api.deepseek.com/chat/completions",
+            response = get_session("deepseek").post(
+                DEEPSEEK_URL,
                 headers=headers,
                 json=data
             )
@@ -103,28 +104,28 @@ async def generate_response_async(
     
     for attempt in range(MAX_RETRIES):
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.deepseek.com/chat/completions",
-                    headers=headers,
-                    json=data
-                ) as response:
-                    response.raise_for_status()
-                    result = await response.json()
-                    generated_text = result["choices"][0]["message"]["content"]
-
-                    if full_response:
-                        end_time = time.time()
-                        process_time = end_time - start_time
-                        return LLMFullResponse(
-                            generated_text=generated_text,
-                            model=model_name,
-                            process_time=process_time,
-                            input_token_count=result["usage"]["prompt_tokens"],
-                            output_token_count=result["usage"]["completion_tokens"],
-                            llm_provider_response=result,
-                        )
-                    return generated_text
+            session = get_async_session("deepseek")
+            async with session.post(
+                DEEPSEEK_URL,
+                headers=headers,
+                json=data
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
+                generated_text = result["choices"][0]["message"]["content"]
+
+                if full_response:
+                    end_time = time.time()
+                    process_time = end_time - start_time
+                    return LLMFullResponse(
+                        generated_text=generated_text,
+                        model=model_name,
+                        process_time=process_time,
+                        input_token_count=result["usage"]["prompt_tokens"],
+                        output_token_count=result["usage"]["completion_tokens"],
+                        llm_provider_response=result,
+                    )
+                return generated_text
 
         except Exception as e:
             if attempt < MAX_RETRIES - 1:
@@ -132,3 +133,79 @@ async def generate_response_async(
             else:
                 error_msg = f"Failed after {MAX_RETRIES} attempts due to: {e}"
                 raise Exception(error_msg)
+
+
+def _stream_request(model_name, messages, temperature, max_tokens, top_p, api_key, json_mode):
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "text/event-stream",
+        "Authorization": f"Bearer {api_key}"
+    }
+    data = {
+        "messages": messages,
+        "model": model_name,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "top_p": top_p,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    if json_mode:
+        data["response_format"] = {"type": "json_object"}
+    return headers, data
+
+
+def _apply_event(state, event):
+    """Return the text delta of an OpenAI-style stream event, recording usage on the way."""
+    if event.get("usage"):
+        state.usage(event["usage"].get("prompt_tokens"), event["usage"].get("completion_tokens"))
+    choices = event.get("choices") or []
+    if choices:
+        return (choices[0].get("delta") or {}).get("content")
+    return None
+
+
+def generate_response_stream(
+    model_name,
+    messages=None,
+    temperature=0.7,
+    max_tokens=300,
+    top_p=1.0,
+    api_key=None,
+    json_mode=False,
+):
+    """
+    Stream a chat completion, yielding LLMStreamChunk text deltas and a final
+    chunk with the full text and token usage.
+    """
+    state = StreamState(model_name)
+    headers, data = _stream_request(model_name, messages, temperature, max_tokens, top_p, api_key, json_mode)
+    with get_session("deepseek").post(DEEPSEEK_URL, headers=headers, json=data, stream=True) as response:
+        response.raise_for_status()
+        for event in iter_sse_events(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
+
+
+async def generate_response_stream_async(
+    model_name,
+    messages=None,
+    temperature=0.7,
+    max_tokens=300,
+    top_p=1.0,
+    api_key=None,
+    json_mode=False,
+):
+    """Async variant of `generate_response_stream`."""
+    state = StreamState(model_name)
+    headers, data = _stream_request(model_name, messages, temperature, max_tokens, top_p, api_key, json_mode)
+    session = get_async_session("deepseek")
+    async with session.post(DEEPSEEK_URL, headers=headers, json=data) as response:
+        response.raise_for_status()
+        async for event in aiter_sse_events(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
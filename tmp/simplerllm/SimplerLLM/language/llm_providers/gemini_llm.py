@@ -1,11 +1,11 @@
 from typing import Dict, Optional
 import os
 from dotenv import load_dotenv
-import aiohttp
 import asyncio
 import time
-import requests
+from .http_clients import get_async_session, get_session
 from .llm_response_models import LLMFullResponse
+from .streaming import StreamState, aiter_sse_events, iter_sse_events
 from typing import Optional, Dict, List
 import json
 
@@ -62,7 +62,7 @@ def generate_response(
 
     for attempt in range(retry_attempts):
         try:
-            response = requests.post(url, headers=headers, data=json.dumps(payload))
+            response = get_session("gemini").post(url, headers=headers, data=json.dumps(payload))
             response.raise_for_status()
             if full_response:
                 response_json = response.json()
@@ -132,22 +132,22 @@ async def generate_response_async(
 
     for attempt in range(retry_attempts):
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    response.raise_for_status()
-                    json_response = await response.json()
-
-                    if full_response:
-                        return LLMFullResponse(
-                            generated_text=json_response["candidates"][0]["content"]["parts"][0]["text"],
-                            model=model_name,
-                            process_time=time.time() - start_time,
-                            input_token_count=json_response["usageMetadata"]["promptTokenCount"],
-                            output_token_count=json_response["usageMetadata"]["candidatesTokenCount"],
-                            llm_provider_response=json_response,
-                        )
-                    else:
-                        return json_response["candidates"][0]["content"]["parts"][0]["text"]
+            session = get_async_session("gemini")
+            async with session.post(url, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                json_response = await response.json()
+
+                if full_response:
+                    return LLMFullResponse(
+                        generated_text=json_response["candidates"][0]["content"]["parts"][0]["text"],
+                        model=model_name,
+                        process_time=time.time() - start_time,
+                        input_token_count=json_response["usageMetadata"]["promptTokenCount"],
+                        output_token_count=json_response["usageMetadata"]["candidatesTokenCount"],
+                        llm_provider_response=json_response,
+                    )
+                else:
+                    return json_response["candidates"][0]["content"]["parts"][0]["text"]
 
         except Exception as e:
             if attempt < retry_attempts - 1:
@@ -157,3 +157,82 @@ async def generate_response_async(
             else:
                 error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
                 raise Exception(error_msg)
+
+
+def _stream_request(model_name, messages, temperature, max_tokens, top_p, prompt_caching, cache_id, api_key):
+    payload = {
+        "contents": messages,
+        "generationConfig": {
+            "temperature": temperature,
+            "maxOutputTokens": max_tokens,
+            "topP": top_p,
+        },
+    }
+    if prompt_caching:
+        payload["cachedContent"] = cache_id
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:streamGenerateContent?alt=sse&key={api_key}"
+    return url, payload
+
+
+def _apply_event(state, event):
+    """Return the text in a Gemini stream event, recording usage on the way."""
+    usage = event.get("usageMetadata")
+    if usage:
+        state.usage(usage.get("promptTokenCount"), usage.get("candidatesTokenCount"))
+    candidates = event.get("candidates") or []
+    if not candidates:
+        return None
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts)
+
+
+def generate_response_stream(
+    model_name: str,
+    system_prompt: str = "You are a helpful AI Assistant",
+    messages: Optional[List[Dict]] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 300,
+    top_p: float = 1.0,
+    prompt_caching: bool = False,
+    cache_id: str = None,
+    api_key=None,
+    json_mode=False,
+):
+    """
+    Stream content from the Gemini API, yielding LLMStreamChunk text deltas
+    and a final chunk with the full text and token usage.
+    """
+    state = StreamState(model_name)
+    url, payload = _stream_request(model_name, messages, temperature, max_tokens, top_p, prompt_caching, cache_id, api_key)
+    with get_session("gemini").post(url, headers={"Content-Type": "application/json"}, json=payload, stream=True) as response:
+        response.raise_for_status()
+        for event in iter_sse_events(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
+
+
+async def generate_response_stream_async(
+    model_name: str,
+    system_prompt: str = "You are a helpful AI Assistant",
+    messages: Optional[List[Dict]] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 300,
+    top_p: float = 1.0,
+    prompt_caching: bool = False,
+    cache_id: str = None,
+    api_key=None,
+    json_mode=False,
+):
+    """Async variant of `generate_response_stream`."""
+    state = StreamState(model_name)
+    url, payload = _stream_request(model_name, messages, temperature, max_tokens, top_p, prompt_caching, cache_id, api_key)
+    session = get_async_session("gemini")
+    async with session.post(url, headers={"Content-Type": "application/json"}, json=payload) as response:
+        response.raise_for_status()
+        async for event in aiter_sse_events(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
@@ -0,0 +1,207 @@
+"""
+Shared, pooled HTTP clients for the LLM providers.
+
+Every provider module used to build a fresh `OpenAI(...)` client, call a bare
+`requests.post` or open a new `aiohttp.ClientSession()` per request, paying a
+TCP + TLS handshake each time. The helpers below hand out long-lived clients
+instead:
+
+- `get_session(provider)`: a `requests.Session` with a keep-alive pool per provider
+- `get_async_session(provider)`: an `aiohttp.ClientSession` per provider and event loop
+- `get_openai_client(api_key, base_url)` / `get_async_openai_client(...)`: OpenAI SDK
+  clients per key, sharing one httpx pool (HTTP/2 when `h2` is installed) per base URL
+
+Pool sizes are configured through the environment:
+
+    SIMPLERLLM_HTTP_POOL_SIZE   connections kept per provider (default 20)
+    SIMPLERLLM_HTTP_KEEPALIVE   idle keep-alive in seconds (default 30)
+    SIMPLERLLM_HTTP2            "false" disables HTTP/2 for the OpenAI SDK clients
+
+Async clients are closed when their event loop shuts down: `asyncio.run()` (and
+any loop that awaits `loop.shutdown_asyncgens()` before closing) releases them
+automatically. `aclose_clients()` closes them earlier.
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+
+POOL_SIZE = int(os.getenv("SIMPLERLLM_HTTP_POOL_SIZE", 20))
+KEEPALIVE_SECONDS = float(os.getenv("SIMPLERLLM_HTTP_KEEPALIVE", 30))
+HTTP2 = (
+    os.getenv("SIMPLERLLM_HTTP2", "true").lower() == "true"
+    and importlib.util.find_spec("h2") is not None
+)
+
+_lock = threading.Lock()
+_pid = os.getpid()
+_sessions = {}
+_httpx_clients = {}
+_openai_clients = {}
+# Async clients are bound to the event loop that created them
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _reset_after_fork():
+    """Drop clients inherited from a parent process; their sockets are shared with it."""
+    global _pid
+    if _pid != os.getpid():
+        _pid = os.getpid()
+        _sessions.clear()
+        _httpx_clients.clear()
+        _openai_clients.clear()
+        _async_clients.clear()
+
+
+def get_session(provider):
+    """Return the process-wide `requests.Session` for a provider."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _lock:
+        _reset_after_fork()
+        session = _sessions.get(provider)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[provider] = session
+        return session
+
+
+async def _close_at_shutdown():
+    """
+    Parked async generator that owns the running loop's clients.
+
+    The loop tracks it like any other async generator, so
+    `loop.shutdown_asyncgens()` resumes it and the `finally` closes the clients.
+    """
+    try:
+        yield
+    finally:
+        with _lock:
+            clients = _async_clients.pop(asyncio.get_running_loop(), {})
+        for key, client in clients.items():
+            if key[0] == "aiohttp":
+                await client.close()
+            elif key[0] == "httpx":
+                await client.aclose()
+
+
+def _loop_clients():
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.get(loop)
+    if clients is None:
+        shutdown = _close_at_shutdown()
+        try:
+            # Run to the first yield; this registers it with the loop's asyncgen hooks
+            shutdown.asend(None).send(None)
+        except StopIteration:
+            pass
+        clients = {("shutdown",): shutdown}
+        _async_clients[loop] = clients
+    return clients
+
+
+def get_async_session(provider):
+    """
+    Return the `aiohttp.ClientSession` for a provider on the running event loop.
+
+    Must be called from inside a coroutine. The session stays open for the
+    life of the loop and is closed when the loop shuts down.
+    """
+    import aiohttp
+
+    with _lock:
+        _reset_after_fork()
+        clients = _loop_clients()
+        session = clients.get(("aiohttp", provider))
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=POOL_SIZE, keepalive_timeout=KEEPALIVE_SECONDS)
+            session = aiohttp.ClientSession(connector=connector)
+            clients[("aiohttp", provider)] = session
+        return session
+
+
+def _httpx_limits():
+    import httpx
+
+    return httpx.Limits(
+        max_connections=POOL_SIZE,
+        max_keepalive_connections=POOL_SIZE,
+        keepalive_expiry=KEEPALIVE_SECONDS,
+    )
+
+
+def _resolve_base_url(base_url):
+    """
+    The endpoint a new client would use. The SDK only reads OPENAI_BASE_URL when a
+    client is created, so it must be part of the cache key to follow later changes.
+    """
+    return base_url or os.environ.get("OPENAI_BASE_URL")
+
+
+def get_openai_client(api_key=None, base_url=None, **kwargs):
+    """
+    Return a cached `OpenAI` client for (api_key, base_url).
+
+    Clients for different keys share one httpx connection pool per base URL.
+    Extra keyword arguments are passed to `OpenAI` on first creation.
+    """
+    from openai import DefaultHttpxClient, OpenAI
+
+    base_url = _resolve_base_url(base_url)
+    with _lock:
+        _reset_after_fork()
+        client = _openai_clients.get((api_key, base_url))
+        if client is None:
+            http_client = _httpx_clients.get(base_url)
+            if http_client is None:
+                http_client = DefaultHttpxClient(limits=_httpx_limits(), http2=HTTP2)
+                _httpx_clients[base_url] = http_client
+            client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, **kwargs)
+            _openai_clients[(api_key, base_url)] = client
+        return client
+
+
+def get_async_openai_client(api_key=None, base_url=None, **kwargs):
+    """Return a cached `AsyncOpenAI` client for (api_key, base_url) on the running event loop."""
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    base_url = _resolve_base_url(base_url)
+    with _lock:
+        _reset_after_fork()
+        clients = _loop_clients()
+        client = clients.get(("openai", api_key, base_url))
+        if client is None:
+            http_client = clients.get(("httpx", base_url))
+            if http_client is None:
+                http_client = DefaultAsyncHttpxClient(limits=_httpx_limits(), http2=HTTP2)
+                clients[("httpx", base_url)] = http_client
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client, **kwargs)
+            clients[("openai", api_key, base_url)] = client
+        return client
+
+
+async def aclose_clients():
+    """Close the async clients bound to the running event loop now rather than at loop shutdown."""
+    with _lock:
+        clients = _async_clients.get(asyncio.get_running_loop())
+    if clients is not None:
+        await clients[("shutdown",)].aclose()
+
+
+def close_clients():
+    """Close every pooled synchronous client in this process."""
+    with _lock:
+        sessions = list(_sessions.values())
+        http_clients = list(_httpx_clients.values())
+        _sessions.clear()
+        _httpx_clients.clear()
+        _openai_clients.clear()
+    for session in sessions:
+        session.close()
+    for http_client in http_clients:
+        http_client.close()
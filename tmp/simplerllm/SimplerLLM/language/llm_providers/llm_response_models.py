@@ -16,6 +16,51 @@ class LLMFullResponse(BaseModel):
     guardrails_metadata: Optional[Dict[str, Any]] = None
 
 
+class LLMStreamChunk(BaseModel):
+    """One event of a streamed completion.
+
+    Intermediate chunks carry a text delta in `text`. The last chunk has
+    `done=True`, the full `generated_text` and the token usage reported by
+    the provider.
+    """
+    text: str = ""
+    done: bool = False
+    model: Optional[str] = None
+    generated_text: Optional[str] = None
+    input_token_count: Optional[int] = None
+    output_token_count: Optional[int] = None
+    time_to_first_token: Optional[float] = None
+    process_time: Optional[float] = None
+
+
+class LLMBatchItem(BaseModel):
+    """Outcome of one prompt in `LLM.generate_batch`; exactly one of `response` / `error` is set."""
+    index: int
+    prompt: Any
+    response: Optional[LLMFullResponse] = None
+    error: Optional[str] = None
+    process_time: float = 0.0
+
+
+class LLMBatchResponse(BaseModel):
+    """Results of `LLM.generate_batch` in input order, with aggregate latency and usage."""
+    items: List[LLMBatchItem]
+    succeeded: int
+    failed: int
+    total_time: float
+    """Wall-clock time for the whole batch"""
+    mean_latency: float
+    """Average per-request time"""
+    max_latency: float
+    input_token_count: int = 0
+    output_token_count: int = 0
+
+    @property
+    def texts(self) -> List[Optional[str]]:
+        """Generated text per prompt, None where the request failed."""
+        return [item.response.generated_text if item.response else None for item in self.items]
+
+
 class LLMEmbeddingsResponse(BaseModel):
     generated_embedding: Any
     model: str
@@ -1,12 +1,12 @@
 from typing import Dict, Optional
 import os
 from dotenv import load_dotenv
-import aiohttp
 import asyncio
 import time
 import json
-import requests
+from .http_clients import get_async_session, get_session
 from .llm_response_models import LLMFullResponse
+from .streaming import StreamState, aiter_json_lines, iter_json_lines
 
 # Load environment variables
 load_dotenv(override=True)
@@ -52,7 +52,7 @@ def generate_response(
 
     for attempt in range(retry_attempts):
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = get_session("ollama").post(url, headers=headers, json=payload)
             response.raise_for_status()  # Raises HTTPError for bad requests (4XX or 5XX)
 
             if full_response:
@@ -113,30 +113,92 @@ async def generate_response_async(
     }
 
 
-    async with aiohttp.ClientSession() as session:
-        for attempt in range(retry_attempts):
-            try:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    response.raise_for_status()  # Raises HTTPError for bad requests (4XX or 5XX)
-                    data = await response.json()
-                    if full_response:
-                        return LLMFullResponse(
-                            generated_text=data["message"]["content"],
-                            model=model_name,
-                            process_time=time.time() - start_time,
-                            input_token_count=data["prompt_eval_count"],
-                            output_token_count=data["eval_count"],
-                            llm_provider_response=data,
-                        )
-
-                    else:
-                        return data["message"]["content"]
-
-            except Exception as e:
-                if attempt < retry_attempts - 1:
-                    print(f"Attempt {attempt + 1} failed: {e}")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 2  # Double the delay each retry
+    session = get_async_session("ollama")
+    for attempt in range(retry_attempts):
+        try:
+            async with session.post(url, headers=headers, json=payload) as response:
+                response.raise_for_status()  # Raises HTTPError for bad requests (4XX or 5XX)
+                data = await response.json()
+                if full_response:
+                    return LLMFullResponse(
+                        generated_text=data["message"]["content"],
+                        model=model_name,
+                        process_time=time.time() - start_time,
+                        input_token_count=data["prompt_eval_count"],
+                        output_token_count=data["eval_count"],
+                        llm_provider_response=data,
+                    )
+
                 else:
-                    error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
-                    raise Exception(error_msg)
+                    return data["message"]["content"]
+
+        except Exception as e:
+            if attempt < retry_attempts - 1:
+                print(f"Attempt {attempt + 1} failed: {e}")
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 2  # Double the delay each retry
+            else:
+                error_msg = f"Failed after {retry_attempts} attempts due to: {e}"
+                raise Exception(error_msg)
+
+
+def _stream_payload(model_name, messages, temperature, max_tokens, top_p):
+    return {
+        "model": model_name,
+        "messages": messages,
+        "temperature": temperature,
+        "top_p": top_p,
+        "num_predict": max_tokens,
+        "stream": True,
+    }
+
+
+def _apply_event(state, event):
+    """Return the text of an Ollama stream line; the last line carries the token counts."""
+    if event.get("done"):
+        state.usage(event.get("prompt_eval_count"), event.get("eval_count"))
+    return (event.get("message") or {}).get("content")
+
+
+def generate_response_stream(
+    model_name: str,
+    messages=None,
+    temperature: float = 0.7,
+    max_tokens: int = 300,
+    top_p: float = 1.0,
+    json_mode=False,
+):
+    """
+    Stream a chat completion from Ollama, yielding LLMStreamChunk text deltas
+    and a final chunk with the full text and token usage.
+    """
+    state = StreamState(model_name)
+    payload = _stream_payload(model_name, messages, temperature, max_tokens, top_p)
+    with get_session("ollama").post(OLLAMA_URL, json=payload, stream=True) as response:
+        response.raise_for_status()
+        for event in iter_json_lines(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
+
+
+async def generate_response_stream_async(
+    model_name: str,
+    messages=None,
+    temperature: float = 0.7,
+    max_tokens: int = 300,
+    top_p: float = 1.0,
+    json_mode=False,
+):
+    """Async variant of `generate_response_stream`."""
+    state = StreamState(model_name)
+    payload = _stream_payload(model_name, messages, temperature, max_tokens, top_p)
+    session = get_async_session("ollama")
+    async with session.post(OLLAMA_URL, json=payload) as response:
+        response.raise_for_status()
+        async for event in aiter_json_lines(response):
+            text = _apply_event(state, event)
+            if text:
+                yield state.delta(text)
+    yield state.final()
@@ -1,12 +1,11 @@
-# add streaming
-from openai import AsyncOpenAI
-from openai import OpenAI
 from dotenv import load_dotenv
 import asyncio
 import os
 import time
 import json
+from .http_clients import get_async_openai_client, get_openai_client
 from .llm_response_models import LLMFullResponse,LLMEmbeddingsResponse
+from .streaming import StreamState
 
 # Load environment variables
 load_dotenv(override=True)
@@ -16,6 +15,36 @@ RETRY_DELAY = int(os.getenv("RETRY_DELAY", 2))
 DEBUG_GPT5 = os.getenv("DEBUG_GPT5", "false").lower() == "true"
 
 
+def _completion_params(model_name, messages, temperature, max_tokens, top_p, json_mode):
+    """Build chat.completions.create arguments, applying the GPT-5 token and temperature rules."""
+    params = {
+        "model": model_name,
+        "messages": messages,
+        "top_p": top_p,
+    }
+
+    # Check if it's a GPT-5 model and apply specific settings
+    if "gpt-5" in model_name.lower():
+        # Smart default: Use 4000 tokens for GPT-5 if user hasn't changed from default
+        # This ensures enough tokens for both reasoning and output
+        if max_tokens == 300:  # Function's default parameter value
+            actual_max_tokens = 4000
+        else:
+            actual_max_tokens = max_tokens  # Respect user's explicit choice
+
+        params["max_completion_tokens"] = actual_max_tokens
+
+        # GPT-5 models only support temperature=1 (default)
+        params["temperature"] = 1
+    else:
+        params["max_tokens"] = max_tokens
+        params["temperature"] = temperature
+
+    if json_mode:
+        params["response_format"] = {"type": "json_object"}
+    return params
+
+
 def generate_response(
     model_name,
     messages=None,
@@ -27,41 +56,14 @@ def generate_response(
     json_mode=False,
 ):
     start_time = time.time() if full_response else None
-    openai_client = OpenAI(api_key=api_key)
+    openai_client = get_openai_client(api_key)
 
     # Check if it's a GPT-5 model
     is_gpt5 = "gpt-5" in model_name.lower()
 
     for attempt in range(MAX_RETRIES):
         try:
-            params = {
-                "model": model_name,
-                "messages": messages,
-                "top_p": top_p,
-            }
-
-            # Check if it's a GPT-5 model and apply specific settings
-            if is_gpt5:
-                # Smart default: Use 4000 tokens for GPT-5 if user hasn't changed from default
-                # This ensures enough tokens for both reasoning and output
-                if max_tokens == 300:  # Function's default parameter value
-                    actual_max_tokens = 4000
-                else:
-                    actual_max_tokens = max_tokens  # Respect user's explicit choice
-
-                params["max_completion_tokens"] = actual_max_tokens
-
-                # GPT-5 models only support temperature=1 (default)
-                if temperature != 1:
-                    params["temperature"] = 1
-                else:
-                    params["temperature"] = temperature
-            else:
-                params["max_tokens"] = max_tokens
-                params["temperature"] = temperature
-
-            if json_mode:
-                params["response_format"] = {"type": "json_object"}
+            params = _completion_params(model_name, messages, temperature, max_tokens, top_p, json_mode)
 
             completion = openai_client.chat.completions.create(**params)
 
@@ -136,41 +138,14 @@ async def generate_response_async(
     json_mode=False,
 ):
     start_time = time.time() if full_response else None
-    async_openai_client = AsyncOpenAI(api_key=api_key)
+    async_openai_client = get_async_openai_client(api_key)
 
     # Check if it's a GPT-5 model
     is_gpt5 = "gpt-5" in model_name.lower()
 
     for attempt in range(MAX_RETRIES):
         try:
-            params = {
-                "model": model_name,
-                "messages": messages,
-                "top_p": top_p,
-            }
-
-            # Check if it's a GPT-5 model and apply specific settings
-            if is_gpt5:
-                # Smart default: Use 4000 tokens for GPT-5 if user hasn't changed from default
-                # This ensures enough tokens for both reasoning and output
-                if max_tokens == 300:  # Function's default parameter value
-                    actual_max_tokens = 4000
-                else:
-                    actual_max_tokens = max_tokens  # Respect user's explicit choice
-
-                params["max_completion_tokens"] = actual_max_tokens
-
-                # GPT-5 models only support temperature=1 (default)
-                if temperature != 1:
-                    params["temperature"] = 1
-                else:
-                    params["temperature"] = temperature
-            else:
-                params["max_tokens"] = max_tokens
-                params["temperature"] = temperature
-
-            if json_mode:
-                params["response_format"] = {"type": "json_object"}
+            params = _completion_params(model_name, messages, temperature, max_tokens, top_p, json_mode)
 
             completion = await async_openai_client.chat.completions.create(**params)
 
@@ -234,6 +209,55 @@ async def generate_response_async(
                 error_msg = f"Failed after {MAX_RETRIES} attempts due to: {e}"
                 raise Exception(error_msg)
 
+def generate_response_stream(
+    model_name,
+    messages=None,
+    temperature=0.7,
+    max_tokens=300,
+    top_p=1.0,
+    api_key=None,
+    json_mode=False,
+):
+    """
+    Stream a chat completion, yielding LLMStreamChunk text deltas and a final
+    chunk with the full text and token usage.
+    """
+    state = StreamState(model_name)
+    openai_client = get_openai_client(api_key)
+    params = _completion_params(model_name, messages, temperature, max_tokens, top_p, json_mode)
+    stream = openai_client.chat.completions.create(
+        stream=True, stream_options={"include_usage": True}, **params
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield state.delta(chunk.choices[0].delta.content)
+        if chunk.usage:
+            state.usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+    yield state.final()
+
+async def generate_response_stream_async(
+    model_name,
+    messages=None,
+    temperature=0.7,
+    max_tokens=300,
+    top_p=1.0,
+    api_key=None,
+    json_mode=False,
+):
+    """Async variant of `generate_response_stream`."""
+    state = StreamState(model_name)
+    async_openai_client = get_async_openai_client(api_key)
+    params = _completion_params(model_name, messages, temperature, max_tokens, top_p, json_mode)
+    stream = await async_openai_client.chat.completions.create(
+        stream=True, stream_options={"include_usage": True}, **params
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield state.delta(chunk.choices[0].delta.content)
+        if chunk.usage:
+            state.usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+    yield state.final()
+
 def generate_embeddings(
     model_name,
     user_input=None,
@@ -246,7 +270,7 @@ def generate_embeddings(
     
     start_time = time.time() if full_response else None
 
-    openai_client = OpenAI(api_key=api_key)
+    openai_client = get_openai_client(api_key)
 
     for attempt in range(MAX_RETRIES):
         try:
@@ -289,7 +313,7 @@ async def generate_embeddings_async(
     full_response = False,
     api_key = None,
 ):
-    async_openai_client = AsyncOpenAI(api_key=api_key)
+    async_openai_client = get_async_openai_client(api_key)
     if not user_input:
         raise ValueError("user_input must be provided.")
     
@@ -1,10 +1,10 @@
-from openai import AsyncOpenAI
-from openai import OpenAI
 from dotenv import load_dotenv
 import asyncio
 import os
 import time
+from .http_clients import get_async_openai_client, get_openai_client
 from .llm_response_models import LLMFullResponse,LLMEmbeddingsResponse
+from .streaming import StreamState
 
 # Load environment variables
 load_dotenv(override=True)
@@ -29,10 +29,7 @@ def generate_response(
     start_time = time.time() if full_response else None
     
     # Configure OpenAI client with OpenRouter base URL
-    openrouter_client = OpenAI(
-        api_key=api_key,
-        base_url=OPENROUTER_BASE_URL
-    )
+    openrouter_client = get_openai_client(api_key, OPENROUTER_BASE_URL)
     
     for attempt in range(MAX_RETRIES):
         try:
@@ -96,10 +93,7 @@ async def generate_response_async(
     start_time = time.time() if full_response else None
     
     # Configure async OpenAI client with OpenRouter base URL
-    async_openrouter_client = AsyncOpenAI(
-        api_key=api_key,
-        base_url=OPENROUTER_BASE_URL
-    )
+    async_openrouter_client = get_async_openai_client(api_key, OPENROUTER_BASE_URL)
    
     for attempt in range(MAX_RETRIES):
         try:
@@ -148,6 +142,82 @@ async def generate_response_async(
                 raise Exception(error_msg)
 
 
+def _stream_request(model_name, messages, temperature, max_tokens, top_p, json_mode, site_url, site_name):
+    params = {
+        "model": model_name,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "top_p": top_p,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    if json_mode:
+        params["response_format"] = {"type": "json_object"}
+
+    # Add OpenRouter-specific headers for site tracking
+    extra_headers = {}
+    if site_url:
+        extra_headers["HTTP-Referer"] = site_url
+    if site_name:
+        extra_headers["X-Title"] = site_name
+    params["extra_headers"] = extra_headers
+    return params
+
+
+def generate_response_stream(
+    model_name,
+    messages=None,
+    temperature=0.7,
+    max_tokens=300,
+    top_p=1.0,
+    api_key=None,
+    json_mode=False,
+    site_url=None,
+    site_name=None,
+):
+    """
+    Stream a chat completion, yielding LLMStreamChunk text deltas and a final
+    chunk with the full text and token usage.
+    """
+    state = StreamState(model_name)
+    openrouter_client = get_openai_client(api_key, OPENROUTER_BASE_URL)
+    stream = openrouter_client.chat.completions.create(
+        **_stream_request(model_name, messages, temperature, max_tokens, top_p, json_mode, site_url, site_name)
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield state.delta(chunk.choices[0].delta.content)
+        if chunk.usage:
+            state.usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+    yield state.final()
+
+
+async def generate_response_stream_async(
+    model_name,
+    messages=None,
+    temperature=0.7,
+    max_tokens=300,
+    top_p=1.0,
+    api_key=None,
+    json_mode=False,
+    site_url=None,
+    site_name=None,
+):
+    """Async variant of `generate_response_stream`."""
+    state = StreamState(model_name)
+    async_openrouter_client = get_async_openai_client(api_key, OPENROUTER_BASE_URL)
+    stream = await async_openrouter_client.chat.completions.create(
+        **_stream_request(model_name, messages, temperature, max_tokens, top_p, json_mode, site_url, site_name)
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield state.delta(chunk.choices[0].delta.content)
+        if chunk.usage:
+            state.usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+    yield state.final()
+
+
 def generate_embeddings(
     model_name,
     user_input=None,
@@ -161,10 +231,7 @@ def generate_embeddings(
     start_time = time.time() if full_response else None
 
     # Configure OpenAI client with OpenRouter base URL
-    openrouter_client = OpenAI(
-        api_key=api_key,
-        base_url=OPENROUTER_BASE_URL
-    )
+    openrouter_client = get_openai_client(api_key, OPENROUTER_BASE_URL)
 
     for attempt in range(MAX_RETRIES):
         try:
@@ -214,10 +281,7 @@ async def generate_embeddings_async(
     start_time = time.time() if full_response else None
     
     # Configure async OpenAI client with OpenRouter base URL
-    async_openrouter_client = AsyncOpenAI(
-        api_key=api_key,
-        base_url=OPENROUTER_BASE_URL
-    )
+    async_openrouter_client = get_async_openai_client(api_key, OPENROUTER_BASE_URL)
     
     for attempt in range(MAX_RETRIES):
         try:
@@ -0,0 +1,97 @@
+"""
+Helpers shared by the providers' `generate_response_stream` functions.
+
+Providers stream either Server-Sent Events (OpenAI-compatible APIs, Anthropic,
+Gemini) or newline-delimited JSON (Ollama, Cohere). The iterators below turn a
+`requests` or `aiohttp` response into decoded JSON events, and `StreamState`
+turns provider deltas into `LLMStreamChunk` objects with timing and usage.
+"""
+import json
+import time
+
+from .llm_response_models import LLMStreamChunk
+
+
+class StreamState:
+    """Accumulates a streamed completion and builds the chunks yielded to callers."""
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.start_time = time.time()
+        self.first_token_time = None
+        self.parts = []
+        self.input_token_count = None
+        self.output_token_count = None
+
+    def delta(self, text):
+        if self.first_token_time is None:
+            self.first_token_time = time.time()
+        self.parts.append(text)
+        return LLMStreamChunk(text=text, model=self.model_name)
+
+    def usage(self, input_tokens=None, output_tokens=None):
+        if input_tokens is not None:
+            self.input_token_count = input_tokens
+        if output_tokens is not None:
+            self.output_token_count = output_tokens
+
+    def final(self):
+        now = time.time()
+        return LLMStreamChunk(
+            done=True,
+            model=self.model_name,
+            generated_text="".join(self.parts),
+            input_token_count=self.input_token_count,
+            output_token_count=self.output_token_count,
+            time_to_first_token=(self.first_token_time - self.start_time) if self.first_token_time else None,
+            process_time=now - self.start_time,
+        )
+
+
+def _sse_payload(line):
+    """Return the decoded JSON of an SSE `data:` line, None for other lines, or False at [DONE]."""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    line = line.strip()
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return False
+    if not data:
+        return None
+    return json.loads(data)
+
+
+def iter_sse_events(response):
+    """Yield JSON payloads of an SSE `requests` response opened with stream=True."""
+    for line in response.iter_lines():
+        event = _sse_payload(line)
+        if event is False:
+            return
+        if event is not None:
+            yield event
+
+
+async def aiter_sse_events(response):
+    """Yield JSON payloads of an SSE `aiohttp` response."""
+    async for line in response.content:
+        event = _sse_payload(line)
+        if event is False:
+            return
+        if event is not None:
+            yield event
+
+
+def iter_json_lines(response):
+    """Yield objects of a newline-delimited JSON `requests` response opened with stream=True."""
+    for line in response.iter_lines():
+        if line and line.strip():
+            yield json.loads(line)
+
+
+async def aiter_json_lines(response):
+    """Yield objects of a newline-delimited JSON `aiohttp` response."""
+    async for line in response.content:
+        if line.strip():
+            yield json.loads(line)
@@ -0,0 +1,76 @@
+"""
+Recall-vs-latency benchmark for the local IVF-Flat index.
+
+Builds a SimplerVectors collection of clustered random vectors, takes the
+exact brute-force results as ground truth, then times the indexed search at
+several `nprobe` settings and reports recall@k for each:
+
+    python -m SimplerLLM.utils.ann_benchmark --rows 200000 --dim 384 --nprobe 1 4 16 64
+
+The exit status is 1 when `--min-recall` is given and the largest nprobe
+falls below it.
+"""
+import argparse
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from SimplerLLM.vectors.simpler_vector import SimplerVectors
+
+
+def clustered_vectors(rows, dim, clusters, seed=0):
+    """Gaussian blobs around random centres, closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(clusters, size=rows)
+    return centres[labels] + 0.5 * rng.standard_normal((rows, dim)).astype(np.float32)
+
+
+def timed_search(db, queries, k):
+    start = time.perf_counter()
+    results = [db.top_cosine_similarity(query, k) for query in queries]
+    per_query = (time.perf_counter() - start) / len(queries)
+    return [[vector_id for vector_id, _, _ in result] for result in results], per_query * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000, help="Vectors in the collection (default: 100000)")
+    parser.add_argument("--dim", type=int, default=128, help="Vector dimension (default: 128)")
+    parser.add_argument("--queries", type=int, default=200, help="Queries timed per setting (default: 200)")
+    parser.add_argument("--k", type=int, default=10, help="Results per query (default: 10)")
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default: 4 * sqrt(rows))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32], help="nprobe values to try")
+    parser.add_argument("--min-recall", type=float, default=None, help="Fail when recall at the largest nprobe is lower")
+    args = parser.parse_args(argv)
+
+    data = clustered_vectors(args.rows + args.queries, args.dim, clusters=max(1, args.rows // 1000))
+    vectors, queries = data[:args.rows], data[args.rows:]
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = SimplerVectors(folder, dimension=args.dim)
+        db.add_vectors_batch([(vector, None, str(i)) for i, vector in enumerate(vectors)], normalize=True)
+
+        truth, exact_ms = timed_search(db, queries, args.k)
+        print(f"{'exact':<14} {exact_ms:8.2f} ms/query  recall@{args.k} 1.000")
+
+        start = time.perf_counter()
+        index = db.build_ann_index(args.lists)
+        print(f"built {index.n_lists} lists in {time.perf_counter() - start:.2f} s")
+
+        recall = 1.0
+        for nprobe in sorted(args.nprobe):
+            index.nprobe = nprobe
+            found, ann_ms = timed_search(db, queries, args.k)
+            hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+            recall = hits / sum(len(t) for t in truth)
+            print(f"nprobe={nprobe:<7} {ann_ms:8.2f} ms/query  recall@{args.k} {recall:.3f}  "
+                  f"speedup {exact_ms / ann_ms:5.1f}x")
+
+    return 1 if args.min_recall is not None and recall < args.min_recall else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
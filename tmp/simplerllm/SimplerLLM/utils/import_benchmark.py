@@ -0,0 +1,81 @@
+"""
+Import-time regression benchmark for the lazy package exports.
+
+Each scenario runs in a fresh interpreter, so nothing is already cached in
+sys.modules. The report gives the median wall time per scenario, how many
+modules were loaded, and any heavy dependency that got pulled in anyway:
+
+    python -m SimplerLLM.utils.import_benchmark --runs 7 --max-ms 400
+
+The exit status is 1 when a scenario goes over `--max-ms`. It is also 1
+when `import SimplerLLM` loads any module listed in HEAVY_MODULES, so the
+script can run as a CI check.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Third-party packages a bare `import SimplerLLM` must not load
+HEAVY_MODULES = ("openai", "anthropic", "aiohttp", "numpy", "sounddevice", "pynput", "PIL")
+
+SCENARIOS = {
+    "import SimplerLLM": "import SimplerLLM",
+    "from SimplerLLM import LLM": "from SimplerLLM import LLM",
+    "LLM.create(OPENAI)": (
+        "from SimplerLLM import LLM, LLMProvider\n"
+        "LLM.create(LLMProvider.OPENAI, model_name='gpt-4o-mini', api_key='benchmark')"
+    ),
+}
+
+_PROBE = """
+import sys, time, json
+before = set(sys.modules)
+start = time.perf_counter()
+exec(compile({code!r}, "<scenario>", "exec"))
+elapsed = time.perf_counter() - start
+loaded = set(sys.modules) - before
+heavy = sorted(name for name in {heavy!r} if name in loaded)
+print(json.dumps({{"seconds": elapsed, "modules": len(loaded), "heavy": heavy}}))
+"""
+
+
+def measure(code, runs=5):
+    """Run `code` in `runs` fresh interpreters; return the median time, module count and heavy modules."""
+    samples = []
+    for _ in range(runs):
+        probe = _PROBE.format(code=code, heavy=HEAVY_MODULES)
+        output = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        samples.append(json.loads(output))
+    return {
+        "ms": statistics.median(sample["seconds"] for sample in samples) * 1000,
+        "modules": samples[-1]["modules"],
+        "heavy": samples[-1]["heavy"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario (default: 5)")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail when a scenario's median exceeds this")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, code in SCENARIOS.items():
+        result = measure(code, args.runs)
+        line = f"{name:<28} {result['ms']:8.1f} ms  {result['modules']:5d} modules"
+        if result["heavy"]:
+            line += f"  heavy: {', '.join(result['heavy'])}"
+        print(line)
+        if args.max_ms is not None and result["ms"] > args.max_ms:
+            failed = True
+        if name == "import SimplerLLM" and result["heavy"]:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import os
+import numpy as np
+
+
+class IVFFlatIndex:
+    """
+    Inverted-file (IVF-Flat) approximate nearest-neighbour index for cosine search.
+
+    Rows are grouped by their nearest of `n_lists` centroids, found with
+    spherical k-means. A search scores the query against the centroids, then
+    scores exactly only the rows in the `nprobe` closest lists. Raising
+    `nprobe` trades latency for recall; `nprobe == n_lists` is an exact search.
+
+    The index stores row numbers, not vectors: candidates are scored against
+    the owning SimplerVectors matrix, so results carry true similarities.
+    """
+
+    def __init__(self, centroids, nprobe=8):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nprobe = nprobe
+        # assignments[row] is the list that row was filed under
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._lists = [[] for _ in range(self.n_lists)]
+        # Set when a row was moved to another list; its old entry is left
+        # behind, so candidates must be de-duplicated
+        self._stale = False
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @property
+    def indexed_rows(self):
+        return len(self.assignments)
+
+    @staticmethod
+    def _normalized(rows):
+        rows = np.array(rows, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        np.divide(rows, norms, out=rows, where=norms != 0)
+        return rows
+
+    @classmethod
+    def train(cls, matrix, n_lists, nprobe=8, iterations=10, sample_size=None, seed=0):
+        """
+        Fit `n_lists` centroids on (a sample of) `matrix` with spherical k-means.
+
+        Parameters:
+            matrix (array-like): (rows, dimension) training vectors
+            n_lists (int): Number of inverted lists (clusters)
+            nprobe (int): Lists scanned per query by default
+            iterations (int): k-means iterations
+            sample_size (int): Rows used for training, default 64 per list
+            seed (int): Random seed for sampling and initialization
+
+        Returns:
+            IVFFlatIndex: An empty index with trained centroids
+        """
+        rng = np.random.default_rng(seed)
+        n_lists = max(1, min(n_lists, len(matrix)))
+        sample_size = sample_size or 64 * n_lists
+        if len(matrix) > sample_size:
+            sample = np.sort(rng.choice(len(matrix), sample_size, replace=False))
+            data = cls._normalized(matrix[sample])
+        else:
+            data = cls._normalized(matrix)
+
+        centroids = data[rng.choice(len(data), n_lists, replace=False)]
+        for _ in range(iterations):
+            labels = cls._nearest(data, centroids)
+            order = np.argsort(labels, kind='stable')
+            present, starts = np.unique(labels[order], return_index=True)
+            sums = np.add.reduceat(data[order], starts, axis=0)
+            updated = centroids.copy()
+            updated[present] = sums
+            # Re-seed clusters that lost all their points
+            empty = np.setdiff1d(np.arange(n_lists), present)
+            if len(empty):
+                updated[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+            updated = cls._normalized(updated)
+            if np.allclose(updated, centroids, atol=1e-5):
+                centroids = updated
+                break
+            centroids = updated
+        return cls(centroids, nprobe)
+
+    @staticmethod
+    def _nearest(rows, centroids, block=65536):
+        """Index of the closest centroid for every row, in blocks to bound memory."""
+        labels = np.empty(len(rows), dtype=np.int32)
+        for start in range(0, len(rows), block):
+            chunk = np.asarray(rows[start:start + block], dtype=np.float32)
+            labels[start:start + block] = np.argmax(chunk @ centroids.T, axis=1)
+        return labels
+
+    def _file(self, rows, labels):
+        order = np.argsort(labels, kind='stable')
+        present, starts = np.unique(labels[order], return_index=True)
+        for label, chunk in zip(present, np.split(rows[order], starts[1:])):
+            self._lists[label].append(chunk)
+
+    def add(self, matrix, stop):
+        """File rows `indexed_rows:stop` of `matrix` under their nearest centroid."""
+        start = self.indexed_rows
+        if stop <= start:
+            return
+        labels = self._nearest(matrix[start:stop], self.centroids)
+        self.assignments = np.concatenate([self.assignments, labels])
+        self._file(np.arange(start, stop, dtype=np.int64), labels)
+
+    def reassign(self, row, vector):
+        """Move an already indexed row whose vector changed."""
+        if row >= self.indexed_rows:
+            return
+        label = int(self._nearest(np.asarray(vector, dtype=np.float32)[None, :], self.centroids)[0])
+        if label != self.assignments[row]:
+            self.assignments[row] = label
+            self._lists[label].append(np.array([row], dtype=np.int64))
+            self._stale = True
+
+    def remap(self, keep):
+        """Renumber rows after the owner compacted down to the old rows in `keep` (sorted)."""
+        keep = np.asarray(keep, dtype=np.int64)
+        # Rows past indexed_rows were never filed; they are the tail of `keep`
+        self.assignments = self.assignments[keep[keep < self.indexed_rows]]
+        self._lists = [[] for _ in range(self.n_lists)]
+        self._stale = False
+        self._file(np.arange(self.indexed_rows, dtype=np.int64), self.assignments)
+
+    def _list_rows(self, label):
+        chunks = self._lists[label]
+        if len(chunks) > 1:
+            chunks[:] = [np.concatenate(chunks)]
+        return chunks[0] if chunks else np.zeros(0, dtype=np.int64)
+
+    def candidates(self, query, nprobe=None):
+        """Rows filed under the `nprobe` lists closest to a normalized query."""
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        scores = self.centroids @ np.asarray(query, dtype=np.float32)
+        if nprobe < self.n_lists:
+            probe = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        else:
+            probe = np.arange(self.n_lists)
+        rows = np.concatenate([self._list_rows(label) for label in probe])
+        if self._stale:
+            # Drop entries left behind by reassign(); the row now lives elsewhere
+            rows = rows[np.isin(self.assignments[rows], probe)]
+            rows = np.unique(rows)
+        return rows
+
+    def save(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, centroids=self.centroids, assignments=self.assignments, nprobe=self.nprobe)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            index = cls(data['centroids'], int(data['nprobe']))
+            index.assignments = data['assignments'].astype(np.int32)
+        index._file(np.arange(index.indexed_rows, dtype=np.int64), index.assignments)
+        return index
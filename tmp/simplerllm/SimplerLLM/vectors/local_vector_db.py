@@ -93,6 +93,20 @@ class LocalVectorDB(VectorDB, VectorDBOptional):
         """
         return self._vector_db.top_cosine_similarity(target_vector, top_n, filter_func)
 
+    def search_batch(self, query_matrix, top_n=3, filter_func=None):
+        """
+        Run many similarity searches at once with a single matrix multiply.
+
+        Parameters:
+            query_matrix (array-like): (n_queries, dimension) query vectors
+            top_n (int): The number of top results to return per query
+            filter_func (callable): Optional filter function that takes (id, metadata) and returns bool
+
+        Returns:
+            list: One list per query of (id, metadata, similarity) tuples, best first
+        """
+        return self._vector_db.search_batch(query_matrix, top_n, filter_func)
+
     def search_by_text(self, query_text, embeddings_llm_instance, top_n=3, filter_func=None):
         """
         Search using text query - converts to embedding internally
@@ -177,13 +191,34 @@ class LocalVectorDB(VectorDB, VectorDBOptional):
         """
         return self._vector_db.compress_vectors(bits)
 
+    def build_ann_index(self, n_lists=None, nprobe=8):
+        """
+        Build an IVF-Flat approximate index so searches scan only nearby clusters.
+
+        Parameters:
+            n_lists (int): Number of clusters, default 4 * sqrt(vector count)
+            nprobe (int): Clusters scanned per query; higher is slower but more accurate
+
+        Returns:
+            IVFFlatIndex: The index; set its `nprobe` to tune recall against latency
+        """
+        return self._vector_db.build_ann_index(n_lists, nprobe)
+
+    def drop_ann_index(self):
+        """
+        Remove the approximate index; searches go back to exact brute force.
+        """
+        return self._vector_db.drop_ann_index()
+
     def save_to_disk(self, collection_name, serialization_format=None):
         """
         Save the vector database to disk.
         
         Parameters:
             collection_name (str): Name of the collection to save
-            serialization_format: Serialization format (optional)
+            serialization_format: Serialization format (optional). The default,
+                SerializationFormat.MMAP, stores metadata as JSON (tuples load as
+                lists, dict keys as strings); BINARY pickles it unchanged.
         """
         if serialization_format is None:
             return self._vector_db.save_to_disk(collection_name)
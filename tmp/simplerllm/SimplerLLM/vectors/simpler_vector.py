@@ -1,28 +1,59 @@
 import numpy as np
 import os
+import json
 import pickle
+import sqlite3
 import enum
 import uuid
 from collections import defaultdict
 from .vector_db import VectorDB, VectorDBOptional, VectorDBError, DimensionMismatchError, VectorDBOperationError, VectorNotFoundError
 from .vector_providers import VectorProvider
+from .ivf_index import IVFFlatIndex
 
 
 class SerializationFormat(enum.Enum):
     BINARY = 'pickle'
+    # <collection>.svcol/: vectors-NNNNN.npy segments (memory-mapped on load)
+    # plus collection.sqlite3 holding ids, JSON metadata and tombstones.
+    # Published segment files are never modified; updated vectors go to patch files
+    MMAP = 'mmap'
 
 
 class SimplerVectors(VectorDB, VectorDBOptional):
+    # Rows allocated by the first insert; capacity doubles from there
+    initial_capacity = 1024
+    # Upper bound on the (queries x vectors) score block search_batch holds at once
+    search_block_elements = 16 * 1024 * 1024
+    # Deleted rows are only flagged; compact() runs once they exceed this share of the rows
+    compact_threshold = 0.25
+    # An MMAP save merges the segment and patch files into one once they grow past this
+    max_segments = 8
+
     def __init__(self, db_folder, dimension=None):
         # Initialize base class
         super().__init__(provider=VectorProvider.LOCAL, db_folder=db_folder, dimension=dimension)
 
         self.db_folder = db_folder
-        self.vectors = []  # Initialize the vectors list
+        # Vectors live in the first `_count` rows of a preallocated 2-D matrix
+        # that grows geometrically; row i belongs to ids[i] / metadata[i].
+        # Deleted rows stay in place with _alive[i] False until compact().
+        self._matrix = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._count = 0
+        self._deleted = 0
+        self._rows = {}  # vector id -> row of its live entry
         self.metadata = []  # Initialize the metadata list
         self.ids = []  # Store unique IDs for each vector
         self.dimension = dimension  # Store expected dimension for validation
-        self._index = defaultdict(list)  # Simple index for metadata lookup
+        self._index = defaultdict(set)  # Simple index for metadata lookup
+        # MMAP persistence: the collection folder these rows were last saved to,
+        # how many rows it holds, rows whose entry changed since then and the
+        # subset whose vector changed
+        self._saved_path = None
+        self._saved_rows = 0
+        self._dirty_rows = set()
+        self._dirty_vectors = set()
+        self._ann = None  # Optional IVFFlatIndex, see build_ann_index()
 
         try:
             if not os.path.exists(self.db_folder):
@@ -30,15 +61,61 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         except Exception as e:
             raise VectorDBOperationError(f"Failed to create database folder: {e}")
 
-    def load_from_disk(self, collection_name, serialization_format=SerializationFormat.BINARY):
+    def load_from_disk(self, collection_name, serialization_format=SerializationFormat.MMAP):
+        """
+        Load a collection saved by `save_to_disk`.
+
+        With the MMAP format the vectors are memory-mapped copy-on-write, so
+        opening is fast and pages are shared between processes until written.
+        A collection only available as a legacy pickle (.svdb) is loaded from that.
+        """
         file_path = os.path.join(self.db_folder, collection_name + '.svdb')
-        if serialization_format == SerializationFormat.BINARY:
+        collection_path = os.path.join(self.db_folder, collection_name + '.svcol')
+        if serialization_format == SerializationFormat.MMAP and (
+            os.path.exists(collection_path) or not os.path.exists(file_path)
+        ):
+            self._load_mmap(collection_path)
+            self._load_ann(os.path.join(collection_path, 'ivf.npz'))
+        else:
             self._load_pickle(file_path)
+            self._load_ann(os.path.join(self.db_folder, collection_name + '.ivf.npz'))
 
-    def save_to_disk(self, collection_name, serialization_format=SerializationFormat.BINARY):
-        file_path = os.path.join(self.db_folder, collection_name + '.svdb')
+    def save_to_disk(self, collection_name, serialization_format=SerializationFormat.MMAP):
+        """
+        Save the collection under `db_folder`.
+
+        MMAP saves are incremental when the collection was loaded from or last
+        saved to the same place: new rows become a new segment file, updated
+        vectors a patch file, and changed metadata and tombstones are rewritten
+        in the SQLite index. Files already written are never modified, so other
+        processes can keep them mapped while this one saves.
+
+        MMAP stores metadata as JSON: it must be JSON serializable, and it
+        round-trips as JSON does (tuples load as lists, dict keys as strings).
+        Use SerializationFormat.BINARY to keep arbitrary picklable metadata.
+        """
         if serialization_format == SerializationFormat.BINARY:
-            self._save_pickle(file_path)
+            self._save_pickle(os.path.join(self.db_folder, collection_name + '.svdb'))
+            self._save_ann(os.path.join(self.db_folder, collection_name + '.ivf.npz'))
+        else:
+            collection_path = os.path.join(self.db_folder, collection_name + '.svcol')
+            self._save_mmap(collection_path)
+            self._save_ann(os.path.join(collection_path, 'ivf.npz'))
+
+    def _load_ann(self, path):
+        self._ann = None
+        if os.path.exists(path):
+            index = IVFFlatIndex.load(path)
+            # An index written for other rows than these cannot be reused
+            if index.indexed_rows <= self._count and index.centroids.shape[1] == self.dimension:
+                self._ann = index
+
+    def _save_ann(self, path):
+        if self._ann is not None:
+            self._sync_ann()
+            self._ann.save(path)
+        elif os.path.exists(path):
+            os.remove(path)
 
     def _load_pickle(self, file_path):
         if os.path.exists(file_path):
@@ -46,30 +123,311 @@ class SimplerVectors(VectorDB, VectorDBOptional):
                 data = pickle.load(file)
                 # Handle both old and new format
                 if len(data) == 2:
-                    self.vectors, self.metadata = data
-                    self.ids = [str(uuid.uuid4()) for _ in range(len(self.vectors))]
+                    vectors, self.metadata = data
+                    self.ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
                 else:
-                    self.vectors, self.metadata, self.ids, self.dimension = data
-                self._rebuild_index()
+                    vectors, self.metadata, self.ids, self.dimension = data
+                self._set_matrix(vectors)
         else:
-            self.vectors, self.metadata, self.ids = [], [], []
+            self.metadata, self.ids = [], []
+            self._set_matrix([])
 
     def _save_pickle(self, file_path):
+        self.compact()
         with open(file_path, 'wb') as file:
-            pickle.dump((self.vectors, self.metadata, self.ids, self.dimension), file)
+            pickle.dump((self.vectors.copy(), self.metadata, self.ids, self.dimension), file)
+
+    @staticmethod
+    def _open_collection_db(collection_path):
+        conn = sqlite3.connect(os.path.join(collection_path, 'collection.sqlite3'))
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(
+            'CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS segments (seq INTEGER PRIMARY KEY, file TEXT NOT NULL, rows INTEGER NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS entries (row INTEGER PRIMARY KEY, id TEXT NOT NULL, '
+            'metadata TEXT, alive INTEGER NOT NULL DEFAULT 1);'
+            'CREATE TABLE IF NOT EXISTS patches (seq INTEGER PRIMARY KEY, file TEXT NOT NULL, rows INTEGER NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS vector_overrides (row INTEGER PRIMARY KEY, seq INTEGER NOT NULL, '
+            'position INTEGER NOT NULL);'
+        )
+        return conn
+
+    def _load_mmap(self, collection_path):
+        if not os.path.exists(os.path.join(collection_path, 'collection.sqlite3')):
+            self.metadata, self.ids = [], []
+            self._set_matrix([])
+            return
+
+        conn = self._open_collection_db(collection_path)
+        try:
+            info = dict(conn.execute('SELECT key, value FROM info'))
+            segments = [
+                np.load(os.path.join(collection_path, file), mmap_mode='c')
+                for file, in conn.execute('SELECT file FROM segments ORDER BY seq')
+            ]
+            ids, metadata, alive = [], [], []
+            for vector_id, meta, is_alive in conn.execute('SELECT id, metadata, alive FROM entries ORDER BY row'):
+                ids.append(vector_id)
+                metadata.append(json.loads(meta) if meta is not None else None)
+                alive.append(bool(is_alive))
+            overrides = defaultdict(list)  # patch file -> [(row, position in file)]
+            for row, file, position in conn.execute(
+                'SELECT o.row, p.file, o.position FROM vector_overrides o JOIN patches p ON p.seq = o.seq'
+            ):
+                overrides[file].append((row, position))
+        finally:
+            conn.close()
+
+        if info.get('dimension'):
+            self.dimension = int(info['dimension'])
+        self.ids, self.metadata = ids, metadata
+        # One segment is used in place; several are merged into memory
+        if len(segments) > 1:
+            matrix = np.concatenate(segments)
+        else:
+            matrix = segments[0] if segments else []
+        # Updated vectors; a copy-on-write map takes the writes privately
+        for file, pairs in overrides.items():
+            rows, positions = (np.array(column) for column in zip(*pairs))
+            matrix[rows] = np.load(os.path.join(collection_path, file))[positions]
+        self._set_matrix(matrix, alive)
+        self._saved_path = collection_path
+        self._saved_rows = self._count
+
+    def _write_segment(self, collection_path, conn, rows, table='segments'):
+        """Write `rows` to a new file and register it in `table` (segments or patches); returns its seq."""
+        # Numbers are never reused, so a full rewrite cannot clobber a file it is replacing
+        row = conn.execute("SELECT value FROM info WHERE key = 'next_segment'").fetchone()
+        seq = int(row[0]) if row else 1
+        conn.execute("INSERT OR REPLACE INTO info (key, value) VALUES ('next_segment', ?)", (str(seq + 1),))
+        file = f'vectors-{seq:05d}.npy'
+        tmp_path = os.path.join(collection_path, file + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(rows))
+        os.replace(tmp_path, os.path.join(collection_path, file))
+        conn.execute(f'INSERT INTO {table} (seq, file, rows) VALUES (?, ?, ?)', (seq, file, len(rows)))
+        return seq
+
+    def _entry_rows(self, start, stop):
+        for row in range(start, stop):
+            meta = self.metadata[row] if self._alive[row] else None
+            try:
+                encoded = json.dumps(meta, ensure_ascii=False) if meta is not None else None
+            except TypeError as e:
+                raise VectorDBOperationError(
+                    f"Metadata of '{self.ids[row]}' is not JSON serializable ({e}); "
+                    f"save with SerializationFormat.BINARY instead"
+                )
+            yield row, self.ids[row], encoded, int(self._alive[row])
+
+    def _save_mmap(self, collection_path):
+        os.makedirs(collection_path, exist_ok=True)
+        conn = self._open_collection_db(collection_path)
+        try:
+            info = dict(conn.execute('SELECT key, value FROM info'))
+            segment_count = conn.execute(
+                'SELECT (SELECT COUNT(*) FROM segments) + (SELECT COUNT(*) FROM patches)'
+            ).fetchone()[0]
+            dtype = str(self.vectors.dtype)
+            incremental = (
+                self._saved_path == collection_path
+                and info.get('dtype', dtype) == dtype
+                and segment_count < self.max_segments
+            )
+            old_files = []
+
+            with conn:
+                if incremental:
+                    # Changed rows that are already on disk: new vectors go to a
+                    # patch file, entries are updated in place
+                    patched = sorted(
+                        row for row in self._dirty_vectors if row < self._saved_rows and self._alive[row]
+                    )
+                    if patched:
+                        seq = self._write_segment(collection_path, conn, self._matrix[patched], table='patches')
+                        conn.executemany(
+                            'INSERT OR REPLACE INTO vector_overrides (row, seq, position) VALUES (?, ?, ?)',
+                            [(row, seq, position) for position, row in enumerate(patched)],
+                        )
+                    changed = sorted(row for row in self._dirty_rows if row < self._saved_rows)
+                    if changed:
+                        conn.executemany(
+                            'UPDATE entries SET metadata = ?, alive = ? WHERE row = ?',
+                            [(meta, alive, row) for row, _, meta, alive in
+                             (next(self._entry_rows(row, row + 1)) for row in changed)],
+                        )
+                    start = self._saved_rows
+                else:
+                    old_files = [
+                        file for file, in conn.execute('SELECT file FROM segments UNION ALL SELECT file FROM patches')
+                    ]
+                    conn.execute('DELETE FROM segments')
+                    conn.execute('DELETE FROM patches')
+                    conn.execute('DELETE FROM vector_overrides')
+                    conn.execute('DELETE FROM entries')
+                    start = 0
+
+                if self._count > start:
+                    entries = list(self._entry_rows(start, self._count))
+                    self._write_segment(collection_path, conn, self.vectors[start:])
+                    conn.executemany('INSERT INTO entries (row, id, metadata, alive) VALUES (?, ?, ?, ?)', entries)
+                conn.executemany('INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)', [
+                    ('format_version', '1'),
+                    ('dimension', str(self.dimension or '')),
+                    ('dtype', dtype),
+                ])
+        finally:
+            conn.close()
+
+        for file in old_files:
+            try:
+                os.remove(os.path.join(collection_path, file))
+            except OSError:
+                pass  # Still mapped (Windows); it is unreferenced and harmless
+        self._saved_path = collection_path
+        self._saved_rows = self._count
+        self._dirty_rows.clear()
+        self._dirty_vectors.clear()
+
+    @property
+    def vectors(self):
+        """The stored vectors as an (n, dimension) view of the backing matrix."""
+        if self._matrix is None:
+            return np.empty((0, self.dimension or 0), dtype=np.float32)
+        return self._matrix[:self._count]
+
+    def _set_matrix(self, vectors, alive=None):
+        """
+        Replace the storage with `vectors` (rows matching self.ids / self.metadata).
+
+        `alive` marks tombstoned rows when restoring a saved collection. The
+        new layout is not the one last saved, so the next MMAP save is a full one.
+        """
+        self._deleted = 0
+        self._saved_path = None
+        self._dirty_rows = set()
+        self._dirty_vectors = set()
+        if len(vectors) == 0:
+            self._matrix, self._count = None, 0
+            self._alive = np.zeros(0, dtype=bool)
+        else:
+            matrix = np.asarray(vectors)
+            if matrix.dtype not in (np.float16, np.float32):
+                matrix = matrix.astype(np.float32)
+            self._matrix = np.ascontiguousarray(matrix)
+            self._count = len(matrix)
+            self._alive = np.ones(self._count, dtype=bool) if alive is None else np.array(alive, dtype=bool)
+            if self.dimension is None:
+                self.dimension = matrix.shape[1]
+
+        self._rows = {}
+        for row, vector_id in enumerate(self.ids):
+            if not self._alive[row]:
+                self.metadata[row] = None
+                self._deleted += 1
+                continue
+            # A later duplicate id wins, as it would have been the latest upsert
+            previous = self._rows.get(vector_id)
+            if previous is not None:
+                self._alive[previous] = False
+                self.metadata[previous] = None
+                self._deleted += 1
+            self._rows[vector_id] = row
+        self._rebuild_index()
+
+    def _reserve(self, extra):
+        """Make room for `extra` more rows, doubling the capacity when it runs out."""
+        needed = self._count + extra
+        if self._matrix is None:
+            self._matrix = np.empty((max(needed, self.initial_capacity), self.dimension), dtype=np.float32)
+        elif needed > len(self._matrix):
+            grown = np.empty((max(needed, 2 * len(self._matrix)), self.dimension), dtype=self._matrix.dtype)
+            grown[:self._count] = self._matrix[:self._count]
+            self._matrix = grown
+        if len(self._alive) < len(self._matrix):
+            alive = np.zeros(len(self._matrix), dtype=bool)
+            alive[:self._count] = self._alive[:self._count]
+            self._alive = alive
+
+    def _append_row_entry(self, row, vector_id, meta):
+        """Record id/metadata for a freshly written row, replacing any live entry with that id."""
+        previous = self._rows.get(vector_id)
+        if previous is not None:
+            self._kill_row(previous)
+        self._rows[vector_id] = row
+        self._alive[row] = True
+        self.metadata.append(meta)
+        self.ids.append(vector_id)
+        self._index_row(row, meta)
+
+    def _kill_row(self, row):
+        """Tombstone a row: hide it from lookups and search, reclaim it at the next compact()."""
+        self._alive[row] = False
+        self._unindex_row(row, self.metadata[row])
+        self.metadata[row] = None
+        self._deleted += 1
+        self._dirty_rows.add(row)
+
+    def compact(self):
+        """
+        Drop tombstoned rows and renumber the rest, keeping insertion order.
+
+        Runs automatically when deleted rows pass `compact_threshold` of the
+        total, and before pickle saves (MMAP saves keep tombstones on disk).
+        Returns the number of rows reclaimed.
+        """
+        if not self._deleted:
+            return 0
+        reclaimed = self._deleted
+        keep = np.flatnonzero(self._alive[:self._count])
+        matrix = self._matrix[keep] if len(keep) else None
+        self.ids = [self.ids[row] for row in keep]
+        self.metadata = [self.metadata[row] for row in keep]
+        self._set_matrix(matrix if matrix is not None else [])
+        if self._ann is not None:
+            self._ann.remap(keep)
+        return reclaimed
+
+    def _maybe_compact(self):
+        if self._deleted > 64 and self._deleted > self.compact_threshold * self._count:
+            self.compact()
+
+    def _live_mask(self, filter_func=None):
+        """Boolean mask of rows a search may return, or None when every row qualifies."""
+        mask = self._alive[:self._count] if self._deleted else None
+        if filter_func:
+            mask = np.array([
+                (mask is None or mask[i]) and bool(filter_func(self.ids[i], self.metadata[i]))
+                for i in range(self._count)
+            ], dtype=bool)
+        return mask
+
+    def _index_row(self, idx, meta):
+        if isinstance(meta, dict):
+            for key, value in meta.items():
+                if isinstance(value, (str, int, float, bool)):
+                    self._index[f"{key}:{value}"].add(idx)
+        else:
+            self._index[str(meta)].add(idx)
+
+    def _unindex_row(self, idx, meta):
+        if isinstance(meta, dict):
+            keys = [f"{key}:{value}" for key, value in meta.items() if isinstance(value, (str, int, float, bool))]
+        else:
+            keys = [str(meta)]
+        for key in keys:
+            rows = self._index.get(key)
+            if rows is not None:
+                rows.discard(idx)
+                if not rows:
+                    del self._index[key]
 
     def _rebuild_index(self):
-        """Rebuild the metadata index after loading from disk"""
-        self._index = defaultdict(list)
+        """Rebuild the metadata index after loading from disk or compacting"""
+        self._index = defaultdict(set)
         for i, meta in enumerate(self.metadata):
-            # Create an index by each metadata field
-            if isinstance(meta, dict):
-                for key, value in meta.items():
-                    if isinstance(value, (str, int, float, bool)):
-                        self._index[f"{key}:{value}"].append(i)
-            else:
-                # For simple metadata
-                self._index[str(meta)].append(i)
+            if self._alive[i]:
+                self._index_row(i, meta)
 
     @staticmethod
     def normalize_vector(vector):
@@ -125,18 +483,11 @@ class SimplerVectors(VectorDB, VectorDBOptional):
             # Generate or use provided ID
             vector_id = id if id is not None else str(uuid.uuid4())
 
-            self.vectors.append(vector)
-            self.metadata.append(meta)
-            self.ids.append(vector_id)
-
-            # Update index
-            idx = len(self.vectors) - 1
-            if isinstance(meta, dict):
-                for key, value in meta.items():
-                    if isinstance(value, (str, int, float, bool)):
-                        self._index[f"{key}:{value}"].append(idx)
-            else:
-                self._index[str(meta)].append(idx)
+            self._reserve(1)
+            idx = self._count
+            self._matrix[idx] = vector
+            self._count += 1
+            self._append_row_entry(idx, vector_id, meta)
 
             return vector_id
         except DimensionMismatchError:
@@ -155,17 +506,36 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         Returns:
             list: The IDs of the added vectors
         """
+        if not vectors_with_meta:
+            return []
+        try:
+            rows = np.asarray([item[0] for item in vectors_with_meta], dtype=np.float32)
+        except ValueError:
+            # Ragged input: let add_vector report the offending dimension
+            return [self.add_vector(item[0], item[1], normalize, item[2] if len(item) > 2 else None)
+                    for item in vectors_with_meta]
+        if rows.ndim != 2:
+            raise VectorDBOperationError("Failed to add vectors: each vector must be one-dimensional")
+        self._validate_dimension(rows[0])
+
+        if normalize:
+            norms = np.linalg.norm(rows, axis=1, keepdims=True)
+            rows = np.divide(rows, norms, out=rows, where=norms != 0)
+
+        # All rows are copied in one slice assignment, then ids and metadata follow
+        self._reserve(len(rows))
+        start = self._count
+        self._matrix[start:start + len(rows)] = rows
+        self._count += len(rows)
+
         added_ids = []
-        for item in vectors_with_meta:
-            if len(item) == 2:
-                vector, meta = item
-                id = None
-            else:
-                vector, meta, id = item
-            
-            added_id = self.add_vector(vector, meta, normalize=normalize, id=id)
-            added_ids.append(added_id)
-            
+        for offset, item in enumerate(vectors_with_meta):
+            meta = item[1]
+            vector_id = item[2] if len(item) > 2 and item[2] is not None else str(uuid.uuid4())
+            self._append_row_entry(start + offset, vector_id, meta)
+            added_ids.append(vector_id)
+
+        self._maybe_compact()
         return added_ids
 
     def delete_vector(self, vector_id):
@@ -178,19 +548,14 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         Returns:
             bool: True if successful, False if vector not found
         """
-        if vector_id in self.ids:
-            idx = self.ids.index(vector_id)
-            
-            # Remove the vector, metadata, and ID
-            self.vectors.pop(idx)
-            self.metadata.pop(idx)
-            self.ids.pop(idx)
-            
-            # Rebuild index as indices have changed
-            self._rebuild_index()
-            return True
-        
-        return False
+        idx = self._rows.pop(vector_id, None)
+        if idx is None:
+            return False
+
+        # Tombstone the row; compaction reclaims it later in one pass
+        self._kill_row(idx)
+        self._maybe_compact()
+        return True
     
     def update_vector(self, vector_id, new_vector=None, new_metadata=None, normalize=True):
         """
@@ -205,9 +570,8 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         Returns:
             bool: True if successful, False if vector not found
         """
-        if vector_id in self.ids:
-            idx = self.ids.index(vector_id)
-            
+        idx = self._rows.get(vector_id)
+        if idx is not None:
             if new_vector is not None:
                 # Ensure vector is a numpy array
                 new_vector = np.array(new_vector, dtype=np.float32)
@@ -218,14 +582,16 @@ class SimplerVectors(VectorDB, VectorDBOptional):
                 if normalize:
                     new_vector = self.normalize_vector(new_vector)
                 
-                self.vectors[idx] = new_vector
+                self._matrix[idx] = new_vector
+                self._dirty_vectors.add(idx)
+                if self._ann is not None:
+                    self._ann.reassign(idx, new_vector)
             
             if new_metadata is not None:
+                self._unindex_row(idx, self.metadata[idx])
                 self.metadata[idx] = new_metadata
-            
-            # Rebuild index if metadata was updated
-            if new_metadata is not None:
-                self._rebuild_index()
+                self._index_row(idx, new_metadata)
+                self._dirty_rows.add(idx)
                 
             return True
         
@@ -234,6 +600,7 @@ class SimplerVectors(VectorDB, VectorDBOptional):
     def top_cosine_similarity(self, target_vector, top_n=3, filter_func=None):
         """
         Calculate the cosine similarity and return the top N most similar vectors.
+        After build_ann_index() only the index's nearest clusters are scored.
 
         Parameters:
             target_vector (array-like): The vector to compare against the database
@@ -253,32 +620,28 @@ class SimplerVectors(VectorDB, VectorDBOptional):
                 raise DimensionMismatchError(f"Query vector dimension mismatch. Expected {self.dimension}, got {len(target_vector)}")
 
             # Return empty list if no vectors in database
-            if not self.vectors:
+            if not self._rows:
                 return []
 
-            # Create mask for filtered vectors if filter provided
-            mask = None
-            if filter_func and self.vectors:
-                mask = np.array([
-                    filter_func(self.ids[i], self.metadata[i])
-                    for i in range(len(self.vectors))
-                ])
+            if self._ann is not None:
+                return self._ann_search(target_vector, top_n, filter_func)
 
-                # Return empty if no vectors match filter
-                if not np.any(mask):
-                    return []
+            # Mask out deleted rows and, if a filter is provided, rows it rejects
+            mask = self._live_mask(filter_func)
+            if mask is not None and not np.any(mask):
+                return []
 
-            # Calculate cosine similarities
-            vectors_array = np.array(self.vectors)
-            similarities = np.dot(vectors_array, target_vector)
+            # Calculate cosine similarities: one matrix-vector product over the stored rows
+            vectors = self.vectors
+            similarities = vectors @ target_vector.astype(vectors.dtype, copy=False)
 
-            # Apply filter if provided
+            # Apply the mask if any
             if mask is not None:
-                # Set similarities to -1 for filtered-out vectors
+                # Set similarities to -1 for masked-out vectors
                 similarities = np.where(mask, similarities, -1)
 
             # Get the indices of the top N similar vectors
-            top_indices = np.argsort(-similarities)[:top_n]
+            top_indices = self._top_indices(similarities, top_n)
 
             # Return ID, metadata and similarity for the top N entries
             return [(self.ids[i], self.metadata[i], similarities[i]) for i in top_indices if similarities[i] > -1]
@@ -287,6 +650,138 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         except Exception as e:
             raise VectorDBOperationError(f"Failed to search vectors: {e}")
 
+    @staticmethod
+    def _top_indices(similarities, top_n):
+        """Indices of the `top_n` highest similarities, best first, via argpartition + a small sort."""
+        if top_n <= 0:
+            return np.empty(0, dtype=np.intp)
+        if top_n >= len(similarities):
+            return np.argsort(-similarities)
+        candidates = np.argpartition(-similarities, top_n - 1)[:top_n]
+        return candidates[np.argsort(-similarities[candidates])]
+
+    def search_batch(self, query_matrix, top_n=3, filter_func=None):
+        """
+        Run many similarity searches at once.
+
+        All queries are scored with one matrix multiply, in blocks of at most
+        `search_block_elements` scores, and each row's top N is picked with
+        argpartition instead of a full sort.
+
+        Parameters:
+            query_matrix (array-like): (n_queries, dimension) query vectors, normalized here
+            top_n (int): The number of top results to return per query
+            filter_func (callable): Optional filter function that takes (id, metadata) and returns bool
+
+        Returns:
+            list: One list per query of (id, metadata, similarity) tuples, best first
+        """
+        try:
+            queries = np.array(query_matrix, dtype=np.float32, ndmin=2)
+            if self.dimension and queries.shape[1] != self.dimension:
+                raise DimensionMismatchError(f"Query vector dimension mismatch. Expected {self.dimension}, got {queries.shape[1]}")
+
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            np.divide(queries, norms, out=queries, where=norms != 0)
+
+            if not self._rows or top_n <= 0:
+                return [[] for _ in range(len(queries))]
+
+            if self._ann is not None:
+                return [self._ann_search(query, top_n, filter_func) for query in queries]
+
+            mask = self._live_mask(filter_func)
+            if mask is not None and not np.any(mask):
+                return [[] for _ in range(len(queries))]
+
+            vectors = self.vectors
+            k = min(top_n, self._count)
+            block = max(1, self.search_block_elements // self._count)
+            results = []
+            for start in range(0, len(queries), block):
+                scores = queries[start:start + block].astype(vectors.dtype, copy=False) @ vectors.T
+                if mask is not None:
+                    scores[:, ~mask] = -1
+                if k < self._count:
+                    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                else:
+                    top = np.broadcast_to(np.arange(self._count), scores.shape)
+                top_scores = np.take_along_axis(scores, top, axis=1)
+                order = np.argsort(-top_scores, axis=1)
+                top = np.take_along_axis(top, order, axis=1)
+                top_scores = np.take_along_axis(top_scores, order, axis=1)
+                for row_indices, row_scores in zip(top, top_scores):
+                    results.append([
+                        (self.ids[i], self.metadata[i], score)
+                        for i, score in zip(row_indices, row_scores) if score > -1
+                    ])
+            return results
+        except DimensionMismatchError:
+            raise
+        except Exception as e:
+            raise VectorDBOperationError(f"Failed to search vectors: {e}")
+
+    def build_ann_index(self, n_lists=None, nprobe=8, iterations=10, sample_size=None):
+        """
+        Build an IVF-Flat approximate index used by all later searches.
+
+        Searches then score only the rows in the `nprobe` clusters nearest to
+        the query instead of every row. Vectors added later are filed into the
+        existing clusters on the next search; rebuild the index if the data
+        drifts far from what it was trained on. It is saved and loaded with
+        the collection.
+
+        Parameters:
+            n_lists (int): Number of clusters, default 4 * sqrt(live vectors)
+            nprobe (int): Clusters scanned per query; higher is slower but more accurate
+            iterations (int): k-means iterations
+            sample_size (int): Vectors used for training, default 64 per cluster
+
+        Returns:
+            IVFFlatIndex: The index; set its `nprobe` to tune recall against latency
+        """
+        live = np.flatnonzero(self._alive[:self._count])
+        if not len(live):
+            raise VectorDBOperationError("Cannot build an index over an empty database")
+        if n_lists is None:
+            n_lists = max(1, int(4 * np.sqrt(len(live))))
+        try:
+            self._ann = IVFFlatIndex.train(
+                self.vectors[live], n_lists, nprobe, iterations=iterations, sample_size=sample_size
+            )
+            self._sync_ann()
+        except Exception as e:
+            self._ann = None
+            raise VectorDBOperationError(f"Failed to build index: {e}")
+        return self._ann
+
+    def drop_ann_index(self):
+        """Remove the approximate index; searches go back to exact brute force."""
+        self._ann = None
+
+    @property
+    def ann_index(self):
+        """The IVFFlatIndex in use, or None for exact search."""
+        return self._ann
+
+    def _sync_ann(self):
+        # File rows added since the last search (incremental insert)
+        self._ann.add(self._matrix, self._count)
+
+    def _ann_search(self, query, top_n, filter_func=None):
+        """Score only the index's candidate rows for one normalized query."""
+        self._sync_ann()
+        rows = self._ann.candidates(query)
+        if self._deleted:
+            rows = rows[self._alive[rows]]
+        if filter_func and len(rows):
+            rows = rows[np.array([bool(filter_func(self.ids[i], self.metadata[i])) for i in rows], dtype=bool)]
+        if not len(rows):
+            return []
+        similarities = self._matrix[rows] @ query.astype(self._matrix.dtype, copy=False)
+        top_indices = self._top_indices(similarities, top_n)
+        return [(self.ids[rows[i]], self.metadata[rows[i]], similarities[i]) for i in top_indices]
+
     def search_by_text(self, query_text, embeddings_llm_instance, top_n=3, filter_func=None):
         """
         Search using text query - converts to embedding internally
@@ -344,7 +839,7 @@ class SimplerVectors(VectorDB, VectorDBOptional):
                 # Intersection with previous matches (AND logic)
                 matching_indices &= indices
                 
-        return [(self.ids[i], self.vectors[i], self.metadata[i]) for i in matching_indices]
+        return [(self.ids[i], self.vectors[i].copy(), self.metadata[i]) for i in matching_indices]
     
     def get_stats(self):
         """
@@ -356,11 +851,13 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         try:
             return {
                 # Required fields
-                "total_vectors": len(self.vectors),
+                "total_vectors": len(self._rows),
                 "dimension": self.dimension,
                 "provider": "local",
                 # Local-specific fields
-                "size_in_memory_mb": sum(v.nbytes for v in self.vectors) / (1024 * 1024) if self.vectors else 0,
+                "size_in_memory_mb": self.vectors.nbytes / (1024 * 1024),
+                "deleted_rows": self._deleted,
+                "ann_lists": self._ann.n_lists if self._ann is not None else None,
                 "metadata_keys": self._get_metadata_keys(),
             }
         except Exception as e:
@@ -370,6 +867,7 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         """Get unique metadata keys across all entries"""
         keys = set()
         for meta in self.metadata:
+            # Deleted rows hold None
             if isinstance(meta, dict):
                 keys.update(meta.keys())
         return list(keys)
@@ -384,11 +882,11 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         Returns:
             float: Compression ratio
         """
-        if not self.vectors:
+        if not self._count:
             return 1.0
             
         # Calculate size before compression
-        original_size = sum(v.nbytes for v in self.vectors)
+        original_size = self.vectors.nbytes
         
         # Choose dtype based on bits
         if bits == 16:
@@ -396,12 +894,14 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         else:
             dtype = np.float32
             
-        # Convert vectors to the lower precision
-        for i in range(len(self.vectors)):
-            self.vectors[i] = np.array(self.vectors[i], dtype=dtype)
+        # Convert the stored rows only; the spare capacity is uninitialized
+        # memory, so it is allocated afresh rather than cast
+        matrix = np.empty(self._matrix.shape, dtype=dtype)
+        matrix[:self._count] = self._matrix[:self._count]
+        self._matrix = matrix
             
         # Calculate size after compression
-        new_size = sum(v.nbytes for v in self.vectors)
+        new_size = self.vectors.nbytes
         
         return original_size / new_size if new_size > 0 else 1.0
 
@@ -441,9 +941,9 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         Returns:
             tuple: (vector, metadata) if found, None if not found
         """
-        if vector_id in self.ids:
-            idx = self.ids.index(vector_id)
-            return (self.vectors[idx], self.metadata[idx])
+        idx = self._rows.get(vector_id)
+        if idx is not None:
+            return (self.vectors[idx].copy(), self.metadata[idx])
         return None
 
     def list_all_ids(self):
@@ -453,7 +953,7 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         Returns:
             list: List of all vector IDs
         """
-        return self.ids.copy()
+        return list(self._rows)
 
     def get_vector_count(self):
         """
@@ -462,14 +962,14 @@ class SimplerVectors(VectorDB, VectorDBOptional):
         Returns:
             int: Number of vectors
         """
-        return len(self.vectors)
+        return len(self._rows)
 
     def clear_database(self):
         """
         Remove all vectors from the database
         """
-        self.vectors.clear()
         self.metadata.clear()
         self.ids.clear()
-        self._index.clear()
+        self._set_matrix([])
+        self._ann = None
         self.dimension = None
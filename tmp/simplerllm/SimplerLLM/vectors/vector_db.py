@@ -40,7 +40,7 @@ class VectorDB(ABC):
 
     Core Operations:
     - CRUD: add_vector, add_vectors_batch, add_text_with_embedding, delete_vector, update_vector
-    - Search: top_cosine_similarity, search_by_text, query_by_metadata
+    - Search: top_cosine_similarity, search_batch, search_by_text, query_by_metadata
     - Retrieval: get_vector_by_id, list_all_ids, get_vector_count
     - Utility: clear_database, get_stats
 
@@ -233,6 +233,28 @@ class VectorDB(ABC):
         """
         pass
 
+    def search_batch(self, query_matrix: np.ndarray, top_n: int = 3,
+                     filter_func: Optional[Callable] = None) -> List[List[Tuple[str, Any, float]]]:
+        """
+        Run `top_cosine_similarity` for many query vectors.
+
+        Providers with a native batch search override this; the default runs
+        the queries one after another.
+
+        Args:
+            query_matrix: Array of shape (n_queries, dimension)
+            top_n: Number of top results to return per query (default: 3)
+            filter_func: Optional function to filter results by metadata
+
+        Returns:
+            One list of (id, metadata, similarity_score) tuples per query, in query order
+
+        Raises:
+            DimensionMismatchError: If the query dimension doesn't match
+            VectorDBOperationError: If the operation fails
+        """
+        return [self.top_cosine_similarity(query, top_n, filter_func) for query in np.atleast_2d(query_matrix)]
+
     @abstractmethod
     def search_by_text(self, query_text: str, embeddings_llm_instance: Any, top_n: int = 3,
                       filter_func: Optional[Callable] = None) -> List[Tuple[str, Any, float]]:
@@ -372,6 +394,37 @@ class VectorDBOptional(ABC):
             f"This feature is only available for local vector databases."
         )
 
+    def build_ann_index(self, n_lists: Optional[int] = None, nprobe: int = 8) -> Any:
+        """
+        Build an approximate nearest-neighbour index (provider-specific feature).
+
+        Args:
+            n_lists: Number of clusters the vectors are partitioned into
+            nprobe: Clusters scanned per query
+
+        Returns:
+            The index object, whose `nprobe` tunes recall against latency
+
+        Raises:
+            NotImplementedError: If provider doesn't support a client-side index
+        """
+        raise NotImplementedError(
+            f"Building an ANN index is not supported by {self.provider.value} provider. "
+            f"This provider manages its own index."
+        )
+
+    def drop_ann_index(self) -> None:
+        """
+        Remove the approximate index and go back to exact search (provider-specific feature).
+
+        Raises:
+            NotImplementedError: If provider doesn't support a client-side index
+        """
+        raise NotImplementedError(
+            f"Dropping an ANN index is not supported by {self.provider.value} provider. "
+            f"This provider manages its own index."
+        )
+
     def save_to_disk(self, collection_name: str, serialization_format: Optional[str] = None) -> None:
         """
         Manually save the database to disk (provider-specific feature).
@@ -1,55 +1,73 @@
-from .tts import TTS, TTSProvider, OpenAITTS, ElevenLabsTTS, TTSFullResponse
-from .stt import STT, STTProvider, OpenAISTT, STTFullResponse
-from .voice_chat import (
-    VoiceChat,
-    VoiceChatConfig,
-    ConversationMessage,
-    ConversationRole,
-    VoiceTurnResult,
-    VoiceChatSession,
-    ConversationManager
-)
-from .live_voice_chat import (
-    LiveVoiceChat,
-    LiveVoiceChatConfig,
-    AudioRecorder,
-    AudioPlayer
-)
-from .dialogue_generator import (
-    DialogueGenerator,
-    Dialogue,
-    DialogueLine,
-    SpeakerConfig,
-    DialogueGenerationConfig,
-    AudioDialogueResult,
-    DialogueStyle
-)
-from .video_transcription import (
-    VideoTranscriber,
-    MultiLanguageCaptionGenerator,
-    VideoTranscriptionResult,
-    CaptionSegment,
-    LanguageCaptions,
-    MultiLanguageCaptionsResult
-)
-from .video_dubbing import (
-    VideoDubber,
-    DubbedSegment,
-    DubbingConfig,
-    VideoDubbingResult
-)
-from .realtime_voice import (
-    RealtimeVoice,
-    RealtimeVoiceProvider,
-    RealtimeSessionConfig,
-    OpenAIRealtimeVoice,
-    TurnDetectionType,
-    Voice,
-    AudioFormat,
-    Modality,
-    RealtimeVoiceChat,
-    RealtimeVoiceChatConfig
-)
+import importlib
+
+# Loaded on first access (PEP 562): the audio modules need sounddevice/pynput,
+# which text-only users may not have installed
+_LAZY_EXPORTS = {
+    '.tts': (
+        'TTS',
+        'TTSProvider',
+        'OpenAITTS',
+        'ElevenLabsTTS',
+        'TTSFullResponse',
+    ),
+    '.stt': (
+        'STT',
+        'STTProvider',
+        'OpenAISTT',
+        'STTFullResponse',
+    ),
+    '.voice_chat': (
+        'VoiceChat',
+        'VoiceChatConfig',
+        'ConversationMessage',
+        'ConversationRole',
+        'VoiceTurnResult',
+        'VoiceChatSession',
+        'ConversationManager',
+    ),
+    '.live_voice_chat': (
+        'LiveVoiceChat',
+        'LiveVoiceChatConfig',
+        'AudioRecorder',
+        'AudioPlayer',
+    ),
+    '.dialogue_generator': (
+        'DialogueGenerator',
+        'Dialogue',
+        'DialogueLine',
+        'SpeakerConfig',
+        'DialogueGenerationConfig',
+        'AudioDialogueResult',
+        'DialogueStyle',
+    ),
+    '.video_transcription': (
+        'VideoTranscriber',
+        'MultiLanguageCaptionGenerator',
+        'VideoTranscriptionResult',
+        'CaptionSegment',
+        'LanguageCaptions',
+        'MultiLanguageCaptionsResult',
+    ),
+    '.video_dubbing': (
+        'VideoDubber',
+        'DubbedSegment',
+        'DubbingConfig',
+        'VideoDubbingResult',
+    ),
+    '.realtime_voice': (
+        'RealtimeVoice',
+        'RealtimeVoiceProvider',
+        'RealtimeSessionConfig',
+        'OpenAIRealtimeVoice',
+        'TurnDetectionType',
+        'Voice',
+        'AudioFormat',
+        'Modality',
+        'RealtimeVoiceChat',
+        'RealtimeVoiceChatConfig',
+    ),
+}
+_EXPORT_MODULES = {name: module for module, names in _LAZY_EXPORTS.items() for name in names}
 
 __all__ = [
     # TTS
@@ -108,3 +126,16 @@ __all__ = [
     'RealtimeVoiceChat',
     'RealtimeVoiceChatConfig',
 ]
+
+
+def __getattr__(name):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
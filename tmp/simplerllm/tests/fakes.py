@@ -0,0 +1,106 @@
+"""
+Offline stand-ins for the LLM providers used by the tests.
+
+`FakeLLM` answers from a script instead of calling an API, and
+`stream_server` serves a canned streaming body over real HTTP on localhost,
+so the provider modules' request, parsing and pooling code runs unchanged.
+"""
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from SimplerLLM.language.llm.base import LLM, LLMProvider
+from SimplerLLM.language.llm_providers.llm_response_models import LLMFullResponse
+
+
+class FakeLLM(LLM):
+    """
+    LLM whose replies are "<prompt>#<call number>", so every call is distinguishable.
+
+    `delays` maps a prompt to seconds the async call sleeps, `failures` is a
+    set of prompts that raise. Calls are recorded in `calls` with their start
+    time, and `max_in_flight` tracks the highest async concurrency seen.
+    """
+
+    def __init__(self, temperature=0.7, delays=None, failures=(), verbose=False):
+        super().__init__(LLMProvider.OPENAI, "fake-model", temperature, 1.0, "fake-key", verbose=verbose)
+        self.delays = delays or {}
+        self.failures = set(failures)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _reply(self, prompt, messages, kwargs):
+        key = prompt if prompt is not None else json.dumps(messages)
+        with self._lock:
+            self.calls.append({"prompt": prompt, "messages": messages, "start": time.monotonic(), **kwargs})
+            number = len(self.calls)
+        if key in self.failures:
+            raise RuntimeError(f"upstream failed for {key}")
+        return LLMFullResponse(
+            generated_text=f"{key}#{number}",
+            model=self.model_name,
+            process_time=0.0,
+            input_token_count=len(key),
+            output_token_count=number,
+            llm_provider_response=None,
+        )
+
+    def generate_response(self, prompt=None, messages=None, temperature=0.7, full_response=False, **kwargs):
+        response = self._reply(prompt, messages, {"temperature": temperature, **kwargs})
+        return response if full_response else response.generated_text
+
+    async def generate_response_async(self, prompt=None, messages=None, temperature=0.7, full_response=False,
+                                      **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(prompt, 0))
+            response = self._reply(prompt, messages, {"temperature": temperature, **kwargs})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return response if full_response else response.generated_text
+
+
+@contextmanager
+def stream_server(lines, content_type="text/event-stream"):
+    """
+    Serve `lines` (str) as a chunked streaming response to every POST.
+
+    Yields a dict with the base `url` and the decoded JSON `requests` received.
+    """
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            received.append(json.loads(self.rfile.read(length) or b"null"))
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for line in lines:
+                data = (line + "\n").encode("utf-8")
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield {"url": f"http://127.0.0.1:{server.server_address[1]}", "requests": received}
+    finally:
+        server.shutdown()
+        server.server_close()
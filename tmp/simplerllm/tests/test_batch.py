@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+
+from .fakes import FakeLLM
+
+
+class GenerateBatchTests(unittest.TestCase):
+
+    def test_results_keep_input_order_whatever_finishes_first(self):
+        llm = FakeLLM(delays={"slow": 0.05, "medium": 0.02})
+        batch = llm.generate_batch(["slow", "medium", "fast"])
+
+        self.assertEqual([item.index for item in batch.items], [0, 1, 2])
+        self.assertEqual([item.prompt for item in batch.items], ["slow", "medium", "fast"])
+        self.assertEqual([text.split("#")[0] for text in batch.texts], ["slow", "medium", "fast"])
+        # The fast prompt was answered first
+        self.assertEqual(batch.items[2].response.generated_text, "fast#1")
+
+    def test_a_failed_item_does_not_fail_the_batch(self):
+        batch = FakeLLM(failures={"bad"}).generate_batch(["good", "bad", "also good"])
+
+        self.assertEqual((batch.succeeded, batch.failed), (2, 1))
+        self.assertIsNone(batch.items[1].response)
+        self.assertEqual(batch.items[1].error, "RuntimeError: upstream failed for bad")
+        self.assertIsNone(batch.texts[1])
+        self.assertIsNotNone(batch.items[0].response)
+
+    def test_usage_and_latency_are_aggregated(self):
+        batch = FakeLLM(delays={"ab": 0.02}).generate_batch(["ab", "cde"])
+        self.assertEqual(batch.input_token_count, 5)
+        self.assertEqual(batch.output_token_count, 3)
+        self.assertGreaterEqual(batch.max_latency, 0.02)
+        self.assertLessEqual(batch.mean_latency, batch.max_latency)
+
+    def test_shared_and_per_item_arguments(self):
+        llm = FakeLLM()
+        messages = [{"role": "user", "content": "hi"}]
+        llm.generate_batch(["plain", {"messages": messages, "max_tokens": 5}], max_tokens=50,
+                           full_response=False)
+
+        calls = sorted(llm.calls, key=lambda call: call["prompt"] is None)
+        self.assertEqual((calls[0]["prompt"], calls[0]["max_tokens"]), ("plain", 50))
+        self.assertEqual((calls[1]["messages"], calls[1]["max_tokens"]), (messages, 5))
+
+    def test_concurrency_is_bounded(self):
+        llm = FakeLLM(delays={str(i): 0.01 for i in range(12)})
+        batch = llm.generate_batch([str(i) for i in range(12)], max_concurrency=3)
+        self.assertEqual(batch.succeeded, 12)
+        self.assertEqual(llm.max_in_flight, 3)
+
+    def test_rate_limit_spaces_out_request_starts(self):
+        llm = FakeLLM()
+        llm.generate_batch([str(i) for i in range(5)], rate_limit=50)
+        starts = sorted(call["start"] for call in llm.calls)
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        self.assertGreaterEqual(min(gaps), 0.015)
+
+    def test_invalid_concurrency_is_rejected(self):
+        with self.assertRaises(ValueError):
+            FakeLLM().generate_batch(["a"], max_concurrency=0)
+
+    def test_sync_entry_point_refuses_to_run_inside_a_loop(self):
+        async def main():
+            FakeLLM().generate_batch(["a"])
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(main())
+
+    def test_async_entry_point(self):
+        batch = asyncio.run(FakeLLM().generate_batch_async(["a", "b"]))
+        self.assertEqual(batch.texts, ["a#1", "b#2"])
+
+    def test_empty_batch(self):
+        batch = FakeLLM().generate_batch([])
+        self.assertEqual((batch.items, batch.succeeded, batch.failed, batch.mean_latency), ([], 0, 0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
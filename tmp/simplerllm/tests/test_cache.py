@@ -0,0 +1,223 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from SimplerLLM.language.llm import CachedLLM, MemoryCacheBackend, SQLiteCacheBackend
+from SimplerLLM.language.llm_providers.llm_response_models import LLMFullResponse
+
+from .fakes import FakeLLM
+
+
+class CacheKeyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.llm = CachedLLM(FakeLLM(temperature=0))
+
+    def test_argument_order_and_full_response_do_not_matter(self):
+        key = self.llm.cache_key(prompt="p", temperature=0, max_tokens=10)
+        self.assertEqual(self.llm.cache_key(max_tokens=10, temperature=0, prompt="p", full_response=True), key)
+        self.assertEqual(
+            self.llm.cache_key(messages=[{"role": "user", "content": "p"}]),
+            self.llm.cache_key(messages=[{"content": "p", "role": "user"}]),
+        )
+
+    def test_every_request_field_is_part_of_the_key(self):
+        base = self.llm.cache_key(prompt="p", temperature=0)
+        self.assertNotEqual(self.llm.cache_key(prompt="q", temperature=0), base)
+        self.assertNotEqual(self.llm.cache_key(prompt="p", temperature=0, model_name="other"), base)
+        self.assertNotEqual(self.llm.cache_key(prompt="p", temperature=0, json_mode=True), base)
+        self.assertEqual(self.llm.cache_key(prompt="p", temperature=0, model_name="fake-model"), base)
+
+    def test_wrapped_instance_settings_are_part_of_the_key(self):
+        other = CachedLLM(FakeLLM(temperature=0.3))
+        self.assertNotEqual(other.cache_key(prompt="p"), self.llm.cache_key(prompt="p"))
+
+
+class DeterministicOnlyTests(unittest.TestCase):
+
+    def test_deterministic_calls_are_cached(self):
+        fake = FakeLLM(temperature=0)
+        llm = CachedLLM(fake)
+        first = llm.generate_response(prompt="classify", temperature=0)
+        self.assertEqual(llm.generate_response(prompt="classify", temperature=0), first)
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual((llm.stats.hits, llm.stats.misses, llm.stats.writes), (1, 1, 1))
+
+    def test_sampled_calls_are_not_cached_by_default(self):
+        fake = FakeLLM(temperature=0)
+        llm = CachedLLM(fake)
+        self.assertNotEqual(
+            llm.generate_response(prompt="variant", temperature=0.7),
+            llm.generate_response(prompt="variant", temperature=0.7),
+        )
+        self.assertEqual(llm.stats.hits + llm.stats.misses, 0)
+
+    def test_omitted_temperature_uses_the_wrapped_method_default(self):
+        # FakeLLM.generate_response defaults to temperature 0.7
+        llm = CachedLLM(FakeLLM(temperature=0))
+        self.assertNotEqual(llm.generate_response(prompt="p"), llm.generate_response(prompt="p"))
+
+    def test_zero_falls_back_to_the_instance_temperature(self):
+        # prepare_params turns a falsy temperature into the instance's 0.7
+        llm = CachedLLM(FakeLLM(temperature=0.7))
+        self.assertNotEqual(
+            llm.generate_response(prompt="p", temperature=0),
+            llm.generate_response(prompt="p", temperature=0),
+        )
+
+    def test_sampled_calls_are_cached_when_opted_in(self):
+        llm = CachedLLM(FakeLLM(), deterministic_only=False)
+        self.assertEqual(llm.generate_response(prompt="p"), llm.generate_response(prompt="p"))
+
+
+class CachedLLMTests(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeLLM(temperature=0)
+        self.llm = CachedLLM(self.fake)
+
+    def test_full_response_from_a_cache_hit(self):
+        text = self.llm.generate_response(prompt="p", temperature=0)
+        response = self.llm.generate_response(prompt="p", temperature=0, full_response=True)
+        self.assertIsInstance(response, LLMFullResponse)
+        self.assertEqual(response.generated_text, text)
+
+    def test_none_responses_are_not_stored(self):
+        self.fake.generate_response = lambda **kwargs: None
+        self.assertIsNone(self.llm.generate_response(prompt="p", temperature=0))
+        self.assertEqual(len(self.llm.backend), 0)
+
+    def test_async_calls_share_the_cache(self):
+        text = self.llm.generate_response(prompt="p", temperature=0)
+        self.assertEqual(asyncio.run(self.llm.generate_response_async(prompt="p", temperature=0)), text)
+        self.assertEqual(len(self.fake.calls), 1)
+
+    def test_stream_is_stored_then_replayed(self):
+        first = list(self.llm.generate_response_stream(prompt="p", temperature=0))
+        replay = list(self.llm.generate_response_stream(prompt="p", temperature=0))
+        self.assertEqual(len(self.fake.calls), 1)
+        self.assertEqual([c.text for c in replay], [c.text for c in first])
+        self.assertTrue(replay[-1].done)
+        self.assertEqual(replay[-1].generated_text, first[-1].generated_text)
+        # A stored stream also serves plain calls
+        self.assertEqual(self.llm.generate_response(prompt="p", temperature=0), first[-1].generated_text)
+
+    def test_async_stream_replay(self):
+        async def collect():
+            return [chunk async for chunk in self.llm.generate_response_stream_async(prompt="p", temperature=0)]
+
+        first, replay = asyncio.run(collect()), asyncio.run(collect())
+        self.assertEqual(replay[-1].generated_text, first[-1].generated_text)
+        self.assertEqual(len(self.fake.calls), 1)
+
+    def test_other_attributes_are_forwarded(self):
+        self.fake.custom_setting = "x"
+        self.assertEqual(self.llm.custom_setting, "x")
+        with self.assertRaises(AttributeError):
+            self.llm.missing_attribute
+
+    def test_batch_uses_the_cache(self):
+        self.llm.generate_response(prompt="a", temperature=0)
+        batch = self.llm.generate_batch(["a", "b"], temperature=0)
+        self.assertEqual(batch.succeeded, 2)
+        self.assertEqual(len(self.fake.calls), 2)
+
+
+class MemoryCacheBackendTests(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", b"1")
+        backend.set("b", b"2")
+        backend.get("a")
+        backend.set("c", b"3")
+        self.assertEqual((backend.get("a"), backend.get("b"), backend.get("c")), (b"1", None, b"3"))
+        self.assertEqual(backend.evictions, 1)
+
+    def test_byte_limit(self):
+        backend = MemoryCacheBackend(max_bytes=10)
+        backend.set("a", b"x" * 6)
+        backend.set("b", b"y" * 6)
+        self.assertEqual((len(backend), backend.total_bytes), (1, 6))
+        self.assertIsNone(backend.get("a"))
+
+    def test_ttl_and_replace(self):
+        backend = MemoryCacheBackend()
+        backend.set("a", b"old", ttl=0.01)
+        backend.set("a", b"new", ttl=0.05)
+        self.assertEqual((backend.get("a"), backend.total_bytes), (b"new", 3))
+        time.sleep(0.06)
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.total_bytes, 0)
+
+    def test_delete_and_clear(self):
+        backend = MemoryCacheBackend()
+        backend.set("a", b"1")
+        backend.set("b", b"2")
+        backend.delete("a")
+        backend.delete("missing")
+        self.assertEqual(len(backend), 1)
+        backend.clear()
+        self.assertEqual((len(backend), backend.total_bytes), (0, 0))
+
+
+class SQLiteCacheBackendTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.path = os.path.join(self.directory, "nested", "llm_cache.sqlite3")
+
+    def test_entries_are_shared_through_the_file(self):
+        SQLiteCacheBackend(self.path).set("k", b"value")
+        self.assertEqual(SQLiteCacheBackend(self.path).get("k"), b"value")
+
+    def test_least_recently_used_entries_are_evicted(self):
+        backend = SQLiteCacheBackend(self.path, max_entries=2)
+        backend.set("a", b"1")
+        time.sleep(0.01)
+        backend.set("b", b"2")
+        time.sleep(0.01)
+        backend.get("a")
+        time.sleep(0.01)
+        backend.set("c", b"3")
+        self.assertEqual((backend.get("a"), backend.get("b"), backend.get("c")), (b"1", None, b"3"))
+        self.assertEqual(backend.evictions, 1)
+
+    def test_byte_limit(self):
+        backend = SQLiteCacheBackend(self.path, max_bytes=10)
+        backend.set("a", b"x" * 6)
+        time.sleep(0.01)
+        backend.set("b", b"y" * 6)
+        self.assertEqual(len(backend), 1)
+        self.assertEqual(backend.get("b"), b"y" * 6)
+
+    def test_ttl(self):
+        backend = SQLiteCacheBackend(self.path)
+        backend.set("a", b"1", ttl=0.05)
+        self.assertEqual(backend.get("a"), b"1")
+        time.sleep(0.06)
+        self.assertIsNone(backend.get("a"))
+
+    def test_delete_and_clear(self):
+        backend = SQLiteCacheBackend(self.path)
+        backend.set("a", b"1")
+        backend.set("b", b"2")
+        backend.delete("a")
+        self.assertEqual(len(backend), 1)
+        backend.clear()
+        self.assertEqual(len(backend), 0)
+
+    def test_cached_llm_on_sqlite(self):
+        fake = FakeLLM(temperature=0)
+        text = CachedLLM(fake, backend=SQLiteCacheBackend(self.path)).generate_response(prompt="p", temperature=0)
+        again = CachedLLM(fake, backend=SQLiteCacheBackend(self.path)).generate_response(prompt="p", temperature=0)
+        self.assertEqual(again, text)
+        self.assertEqual(len(fake.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import gc
+import os
+import unittest
+import warnings
+from unittest import mock
+
+from SimplerLLM.language.llm_providers import http_clients
+
+
+class SyncClientPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        http_clients.close_clients()
+        self.addCleanup(http_clients.close_clients)
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop("OPENAI_BASE_URL", None)
+
+    def test_one_session_per_provider(self):
+        first = http_clients.get_session("ollama")
+        self.assertIs(http_clients.get_session("ollama"), first)
+        self.assertIsNot(http_clients.get_session("anthropic"), first)
+
+    def test_openai_clients_share_one_pool_per_base_url(self):
+        a = http_clients.get_openai_client("key-a")
+        b = http_clients.get_openai_client("key-b")
+        self.assertIs(http_clients.get_openai_client("key-a"), a)
+        self.assertIsNot(a, b)
+        self.assertIs(a._client, b._client)
+
+    def test_openai_base_url_from_environment_is_part_of_the_key(self):
+        os.environ["OPENAI_BASE_URL"] = "http://first.example/v1"
+        first = http_clients.get_openai_client("key")
+        os.environ["OPENAI_BASE_URL"] = "http://second.example/v1"
+        second = http_clients.get_openai_client("key")
+        self.assertIsNot(first, second)
+        self.assertEqual(str(second.base_url), "http://second.example/v1/")
+        self.assertIs(http_clients.get_openai_client("key", "http://first.example/v1"), first)
+
+    def test_clients_inherited_over_fork_are_dropped(self):
+        session = http_clients.get_session("ollama")
+        with mock.patch.object(http_clients, "_pid", -1):
+            self.assertIsNot(http_clients.get_session("ollama"), session)
+
+    def test_close_clients_empties_the_pool(self):
+        session = http_clients.get_session("ollama")
+        http_clients.close_clients()
+        self.assertIsNot(http_clients.get_session("ollama"), session)
+
+
+class AsyncClientPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop("OPENAI_BASE_URL", None)
+
+    def test_session_is_reused_within_a_loop(self):
+        async def main():
+            return http_clients.get_async_session("ollama"), http_clients.get_async_session("ollama")
+
+        first, second = asyncio.run(main())
+        self.assertIs(first, second)
+
+    def test_asyncio_run_closes_the_loop_clients(self):
+        async def main():
+            session = http_clients.get_async_session("ollama")
+            client = http_clients.get_async_openai_client("key")
+            return session, client._client
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            session, http_client = asyncio.run(main())
+            gc.collect()
+        self.assertTrue(session.closed)
+        self.assertTrue(http_client.is_closed)
+        self.assertEqual(len(http_clients._async_clients), 0)
+        self.assertFalse([w for w in caught if "Unclosed" in str(w.message)])
+
+    def test_each_loop_gets_its_own_session(self):
+        async def main():
+            return http_clients.get_async_session("ollama")
+
+        self.assertIsNot(asyncio.run(main()), asyncio.run(main()))
+
+    def test_aclose_clients_closes_early_and_the_pool_reopens(self):
+        async def main():
+            first = http_clients.get_async_session("ollama")
+            await http_clients.aclose_clients()
+            closed = first.closed
+            second = http_clients.get_async_session("ollama")
+            return closed, first, second
+
+        closed, first, second = asyncio.run(main())
+        self.assertTrue(closed)
+        self.assertIsNot(first, second)
+        self.assertTrue(second.closed)
+
+    def test_async_openai_base_url_from_environment_is_part_of_the_key(self):
+        async def main():
+            os.environ["OPENAI_BASE_URL"] = "http://first.example/v1"
+            first = http_clients.get_async_openai_client("key")
+            os.environ["OPENAI_BASE_URL"] = "http://second.example/v1"
+            second = http_clients.get_async_openai_client("key")
+            return first, second
+
+        first, second = asyncio.run(main())
+        self.assertIsNot(first, second)
+        self.assertEqual(str(second.base_url), "http://second.example/v1/")
+
+
+if __name__ == "__main__":
+    unittest.main()
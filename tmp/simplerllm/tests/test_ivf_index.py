@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from SimplerLLM.vectors.ivf_index import IVFFlatIndex
+
+
+def clustered(count_per_cluster=50, clusters=4, dimension=8, seed=0):
+    """Points around `clusters` well separated directions."""
+    rng = np.random.default_rng(seed)
+    centers = np.eye(dimension, dtype=np.float32)[:clusters] * 10
+    points = np.concatenate([center + rng.normal(size=(count_per_cluster, dimension)) for center in centers])
+    return points.astype(np.float32)
+
+
+class IVFFlatIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        # Centroids at the cluster centers, so list i holds rows 50 * i to 50 * i + 49
+        self.matrix = clustered()
+        self.index = IVFFlatIndex(np.eye(8)[:4], nprobe=1)
+        self.index.add(self.matrix, len(self.matrix))
+
+    def test_training(self):
+        index = IVFFlatIndex.train(self.matrix, n_lists=4, nprobe=2, sample_size=120)
+        self.assertEqual((index.n_lists, index.nprobe, index.indexed_rows), (4, 2, 0))
+        np.testing.assert_allclose(np.linalg.norm(index.centroids, axis=1), 1, rtol=1e-5)
+        index.add(self.matrix, len(self.matrix))
+        # Every row is filed under its most similar centroid
+        np.testing.assert_array_equal(index.assignments, np.argmax(self.matrix @ index.centroids.T, axis=1))
+        # Training is reproducible for a given seed
+        np.testing.assert_array_equal(IVFFlatIndex.train(self.matrix, 4, sample_size=120).centroids, index.centroids)
+
+    def test_more_lists_than_rows(self):
+        index = IVFFlatIndex.train(self.matrix[:3], n_lists=10)
+        self.assertEqual(index.n_lists, 3)
+
+    def test_nearest_list_holds_the_query_cluster(self):
+        query = np.eye(8, dtype=np.float32)[2]
+        self.assertEqual(sorted(self.index.candidates(query).tolist()), list(range(100, 150)))
+
+    def test_probing_every_list_returns_every_row_once(self):
+        rows = self.index.candidates(np.eye(8, dtype=np.float32)[0], nprobe=4)
+        self.assertEqual(sorted(rows.tolist()), list(range(200)))
+
+    def test_add_files_only_new_rows(self):
+        extra = np.concatenate([self.matrix, clustered(5, seed=1)])
+        self.index.add(extra, len(extra))
+        self.index.add(extra, len(extra))
+        self.assertEqual(self.index.indexed_rows, 220)
+        self.assertEqual(sorted(self.index.candidates(np.eye(8)[0], nprobe=4).tolist()), list(range(220)))
+
+    def test_reassigned_rows_are_returned_once_from_their_new_list(self):
+        self.index.reassign(0, np.eye(8, dtype=np.float32)[3])
+        self.assertIn(0, self.index.candidates(np.eye(8, dtype=np.float32)[3]).tolist())
+        self.assertNotIn(0, self.index.candidates(np.eye(8, dtype=np.float32)[0]).tolist())
+        rows = self.index.candidates(np.eye(8, dtype=np.float32)[0], nprobe=4)
+        self.assertEqual(sorted(rows.tolist()), list(range(200)))
+        # Rows not indexed yet are left for add()
+        self.index.reassign(500, np.eye(8)[0])
+        self.assertEqual(self.index.indexed_rows, 200)
+
+    def test_remap_after_compaction(self):
+        keep = np.arange(100, 200)
+        label = self.index.assignments[150]
+        self.index.remap(keep)
+        self.assertEqual(self.index.indexed_rows, 100)
+        self.assertEqual(self.index.assignments[50], label)
+        self.assertEqual(sorted(self.index.candidates(np.eye(8)[2]).tolist()), list(range(0, 50)))
+
+    def test_save_and_load(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, ignore_errors=True)
+        path = os.path.join(folder, "ivf.npz")
+        self.index.save(path)
+
+        loaded = IVFFlatIndex.load(path)
+        np.testing.assert_array_equal(loaded.centroids, self.index.centroids)
+        np.testing.assert_array_equal(loaded.assignments, self.index.assignments)
+        self.assertEqual(loaded.nprobe, 1)
+        query = np.eye(8, dtype=np.float32)[1]
+        self.assertEqual(sorted(loaded.candidates(query).tolist()), sorted(self.index.candidates(query).tolist()))
+
+
+if __name__ == "__main__":
+    unittest.main()
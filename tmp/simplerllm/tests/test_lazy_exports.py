@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import SimplerLLM
+from SimplerLLM import language
+from SimplerLLM.language import llm
+from SimplerLLM.utils.import_benchmark import HEAVY_MODULES
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(SimplerLLM.__file__)))
+
+
+def loaded_after(code):
+    """Run `code` in a fresh interpreter; return the top-level modules it loaded."""
+    probe = (
+        "import sys, json\n"
+        "before = set(sys.modules)\n"
+        f"exec({code!r})\n"
+        "print(json.dumps(sorted({name.split('.')[0] for name in set(sys.modules) - before})))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(output.strip().splitlines()[-1]))
+
+
+class LazyImportTests(unittest.TestCase):
+
+    def test_bare_import_loads_no_heavy_dependency(self):
+        for code in ("import SimplerLLM", "import SimplerLLM.language", "import SimplerLLM.voice"):
+            with self.subTest(code=code):
+                self.assertFalse(loaded_after(code) & set(HEAVY_MODULES))
+
+
+class LazyExportTests(unittest.TestCase):
+
+    def test_exports_resolve_to_the_defining_objects(self):
+        from SimplerLLM.language.llm.base import LLM
+        from SimplerLLM.language.llm.cache import CachedLLM
+
+        self.assertIs(SimplerLLM.LLM, LLM)
+        self.assertIs(language.LLM, LLM)
+        self.assertIs(llm.CachedLLM, CachedLLM)
+
+    def test_unknown_names_raise_attribute_error(self):
+        for module in (SimplerLLM, language, llm):
+            with self.subTest(module=module.__name__):
+                with self.assertRaises(AttributeError):
+                    module.NotAnExport
+                self.assertFalse(hasattr(module, "NotAnExport"))
+
+    def test_dir_lists_every_export(self):
+        for module in (SimplerLLM, language, llm):
+            with self.subTest(module=module.__name__):
+                self.assertTrue(set(module.__all__) <= set(dir(module)))
+
+    def test_every_listed_export_resolves(self):
+        for name in llm.__all__:
+            with self.subTest(name=name):
+                self.assertIsNotNone(getattr(llm, name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,374 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+
+from SimplerLLM.vectors import SerializationFormat, SimplerVectors
+from SimplerLLM.vectors.vector_db import DimensionMismatchError, VectorDBOperationError
+
+
+def random_vectors(count, dimension=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class VectorsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, ignore_errors=True)
+
+    def make_db(self, count=0, dimension=16, seed=0):
+        db = SimplerVectors(self.folder)
+        if count:
+            vectors = random_vectors(count, dimension, seed)
+            db.add_vectors_batch([(vector, {"n": i}, f"v{i}") for i, vector in enumerate(vectors)])
+        return db
+
+    def assertSameResults(self, results, expected):
+        self.assertEqual([r[0] for r in results], [e[0] for e in expected])
+        np.testing.assert_allclose([r[2] for r in results], [e[2] for e in expected], rtol=1e-5)
+
+
+class StorageTests(VectorsTestCase):
+
+    def test_matrix_grows_past_its_capacity(self):
+        db = self.make_db()
+        db.initial_capacity = 4
+        vectors = random_vectors(10)
+        for i, vector in enumerate(vectors):
+            db.add_vector(vector, {"n": i}, id=f"v{i}")
+        self.assertEqual(db.get_vector_count(), 10)
+        self.assertGreaterEqual(len(db._matrix), 10)
+        np.testing.assert_allclose(db.get_vector_by_id("v9")[0], vectors[9], rtol=1e-6)
+        np.testing.assert_allclose(db.vectors, vectors, rtol=1e-6)
+
+    def test_adding_an_existing_id_replaces_the_entry(self):
+        db = self.make_db(3)
+        db.add_vector(random_vectors(1, seed=9)[0], {"n": "new"}, id="v1")
+        self.assertEqual(db.get_vector_count(), 3)
+        self.assertEqual(db.get_vector_by_id("v1")[1], {"n": "new"})
+        self.assertEqual(db.query_by_metadata(n=1), [])
+
+    def test_batch_normalizes_on_request(self):
+        db = self.make_db()
+        db.add_vectors_batch([([3.0, 4.0], "a", "a"), ([0.0, 0.0], "zero", "z")], normalize=True)
+        np.testing.assert_allclose(db.get_vector_by_id("a")[0], [0.6, 0.8], rtol=1e-6)
+        np.testing.assert_array_equal(db.get_vector_by_id("z")[0], [0.0, 0.0])
+
+    def test_dimension_mismatch(self):
+        db = self.make_db(3)
+        with self.assertRaises(DimensionMismatchError):
+            db.add_vector(np.ones(4), {})
+        with self.assertRaises(DimensionMismatchError):
+            db.add_vectors_batch([(np.ones(16), {}), (np.ones(4), {})])
+        with self.assertRaises(DimensionMismatchError):
+            db.top_cosine_similarity(np.ones(4))
+        with self.assertRaises(DimensionMismatchError):
+            db.search_batch(np.ones((2, 4)))
+
+    def test_compress_vectors_halves_the_storage_without_warnings(self):
+        db = self.make_db(10)
+        db.initial_capacity = 1024
+        expected = db.top_cosine_similarity(random_vectors(1, seed=5)[0], top_n=3)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(db.compress_vectors(bits=16), 2.0)
+            results = db.top_cosine_similarity(random_vectors(1, seed=5)[0], top_n=3)
+            db.add_vector(random_vectors(1, seed=6)[0], {}, id="after")
+        self.assertEqual(db.vectors.dtype, np.float16)
+        self.assertEqual([r[0] for r in results], [e[0] for e in expected])
+        self.assertEqual(db.get_vector_count(), 11)
+
+
+class SearchTests(VectorsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vectors = random_vectors(200)
+        self.db = self.make_db(200)
+        self.queries = random_vectors(5, seed=1)
+
+    def brute_force(self, query, top_n, rows=None):
+        rows = np.arange(len(self.vectors)) if rows is None else np.asarray(rows)
+        scores = self.vectors[rows] @ query
+        order = np.argsort(-scores)[:top_n]
+        return [(f"v{rows[i]}", None, scores[i]) for i in order]
+
+    def test_top_cosine_similarity_matches_numpy(self):
+        results = self.db.top_cosine_similarity(self.queries[0], top_n=5)
+        self.assertSameResults(results, self.brute_force(self.queries[0], 5))
+        self.assertEqual(results[0][1], {"n": int(results[0][0][1:])})
+
+    def test_search_batch_matches_single_searches(self):
+        self.db.search_block_elements = 400  # two queries per block
+        batch = self.db.search_batch(self.queries * 3.0, top_n=4)
+        self.assertEqual(len(batch), len(self.queries))
+        for query, results in zip(self.queries, batch):
+            self.assertSameResults(results, self.db.top_cosine_similarity(query, top_n=4))
+
+    def test_filter_func(self):
+        even = lambda vector_id, meta: meta["n"] % 2 == 0
+        results = self.db.top_cosine_similarity(self.queries[0], top_n=5, filter_func=even)
+        self.assertSameResults(results, self.brute_force(self.queries[0], 5, rows=range(0, 200, 2)))
+        self.assertEqual(self.db.search_batch(self.queries[:1], top_n=5, filter_func=even)[0][0][0], results[0][0])
+        self.assertEqual(self.db.top_cosine_similarity(self.queries[0], filter_func=lambda *_: False), [])
+
+    def test_top_n_larger_than_the_collection(self):
+        self.assertEqual(len(self.db.top_cosine_similarity(self.queries[0], top_n=500)), 200)
+        self.assertEqual(len(self.db.search_batch(self.queries, top_n=500)[0]), 200)
+
+
+class TombstoneTests(VectorsTestCase):
+
+    def test_deleted_rows_are_hidden_until_compacted(self):
+        db = self.make_db(10)
+        best = db.top_cosine_similarity(db.get_vector_by_id("v3")[0], top_n=1)[0][0]
+        self.assertEqual(best, "v3")
+
+        self.assertTrue(db.delete_vector("v3"))
+        self.assertFalse(db.delete_vector("v3"))
+        self.assertIsNone(db.get_vector_by_id("v3"))
+        self.assertNotIn("v3", [r[0] for r in db.top_cosine_similarity(random_vectors(1, seed=3)[0], top_n=10)])
+        self.assertEqual(db.query_by_metadata(n=3), [])
+        self.assertEqual(db.get_stats()["deleted_rows"], 1)
+        self.assertEqual(db.get_vector_count(), 9)
+
+        self.assertEqual(db.compact(), 1)
+        self.assertEqual(db.compact(), 0)
+        self.assertEqual(db.ids, [f"v{i}" for i in range(10) if i != 3])
+        self.assertEqual(db.get_stats()["deleted_rows"], 0)
+        self.assertEqual(db.query_by_metadata(n=4)[0][0], "v4")
+        np.testing.assert_allclose(db.get_vector_by_id("v4")[0], random_vectors(10)[4], rtol=1e-6)
+
+    def test_compaction_runs_once_enough_rows_are_deleted(self):
+        db = self.make_db(100)
+        for i in range(64):
+            db.delete_vector(f"v{i}")
+        self.assertEqual(db.get_stats()["deleted_rows"], 64)
+        db.delete_vector("v64")
+        self.assertEqual(db.get_stats()["deleted_rows"], 0)
+        self.assertEqual(len(db.ids), 35)
+
+    def test_update_vector_and_metadata(self):
+        db = self.make_db(5)
+        target = random_vectors(1, seed=7)[0]
+        self.assertTrue(db.update_vector("v2", new_vector=target * 2, new_metadata={"n": "two"}))
+        self.assertFalse(db.update_vector("missing", new_metadata={}))
+        np.testing.assert_allclose(db.get_vector_by_id("v2")[0], target, rtol=1e-6)
+        self.assertEqual(db.top_cosine_similarity(target, top_n=1)[0][0], "v2")
+        self.assertEqual(db.query_by_metadata(n="two")[0][0], "v2")
+        self.assertEqual(db.query_by_metadata(n=2), [])
+
+    def test_clear_database(self):
+        db = self.make_db(5)
+        db.delete_vector("v0")
+        db.clear_database()
+        self.assertEqual((db.get_vector_count(), db.list_all_ids(), db.dimension), (0, [], None))
+        db.add_vector(np.ones(3), {}, id="small")
+        self.assertEqual(db.dimension, 3)
+
+
+class MmapPersistenceTests(VectorsTestCase):
+
+    def collection_path(self, name="docs"):
+        return os.path.join(self.folder, name + ".svcol")
+
+    def table_count(self, table, name="docs"):
+        with sqlite3.connect(os.path.join(self.collection_path(name), "collection.sqlite3")) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def file_hashes(self, name="docs"):
+        path = self.collection_path(name)
+        return {
+            file: hashlib.sha256(open(os.path.join(path, file), "rb").read()).hexdigest()
+            for file in os.listdir(path) if file.endswith(".npy")
+        }
+
+    def loaded(self, name="docs"):
+        db = SimplerVectors(self.folder)
+        db.load_from_disk(name)
+        return db
+
+    def test_round_trip(self):
+        db = self.make_db(20)
+        db.delete_vector("v5")
+        db.save_to_disk("docs")
+
+        loaded = self.loaded()
+        self.assertEqual(loaded.list_all_ids(), db.list_all_ids())
+        self.assertEqual(loaded.dimension, 16)
+        self.assertIsNone(loaded.get_vector_by_id("v5"))
+        self.assertEqual(loaded.get_vector_by_id("v7")[1], {"n": 7})
+        np.testing.assert_array_equal(loaded.vectors, db.vectors)
+        query = random_vectors(1, seed=2)[0]
+        self.assertSameResults(loaded.top_cosine_similarity(query, 5), db.top_cosine_similarity(query, 5))
+
+    def test_missing_collection_loads_empty(self):
+        db = self.loaded("nothing")
+        self.assertEqual(db.get_vector_count(), 0)
+
+    def test_appends_become_a_new_segment(self):
+        db = self.make_db(10)
+        db.save_to_disk("docs")
+        before = self.file_hashes()
+        db.add_vector(random_vectors(1, seed=4)[0], {"n": "new"}, id="new")
+        db.save_to_disk("docs")
+
+        self.assertEqual(self.table_count("segments"), 2)
+        self.assertEqual({k: v for k, v in self.file_hashes().items() if k in before}, before)
+        loaded = self.loaded()
+        self.assertEqual(loaded.get_vector_count(), 11)
+        self.assertEqual(loaded.get_vector_by_id("new")[1], {"n": "new"})
+
+    def test_updates_are_saved_as_patches_without_touching_segments(self):
+        db = self.make_db(10)
+        db.save_to_disk("docs")
+        loaded = self.loaded()
+        before = self.file_hashes()
+
+        target = random_vectors(1, seed=8)[0]
+        loaded.update_vector("v4", new_vector=target, new_metadata={"n": "four"})
+        loaded.delete_vector("v6")
+        loaded.save_to_disk("docs")
+
+        self.assertEqual({k: v for k, v in self.file_hashes().items() if k in before}, before)
+        self.assertEqual((self.table_count("patches"), self.table_count("vector_overrides")), (1, 1))
+        reloaded = self.loaded()
+        np.testing.assert_allclose(reloaded.get_vector_by_id("v4")[0], target, rtol=1e-6)
+        self.assertEqual(reloaded.get_vector_by_id("v4")[1], {"n": "four"})
+        self.assertIsNone(reloaded.get_vector_by_id("v6"))
+        self.assertEqual(reloaded.get_vector_count(), 9)
+        np.testing.assert_allclose(reloaded.get_vector_by_id("v3")[0], random_vectors(10)[3], rtol=1e-6)
+
+    def test_files_are_merged_after_max_segments(self):
+        db = self.make_db(4)
+        db.max_segments = 3
+        db.save_to_disk("docs")
+        for i in range(3):
+            db.add_vector(random_vectors(1, seed=20 + i)[0], {"n": f"extra{i}"}, id=f"extra{i}")
+            db.save_to_disk("docs")
+
+        self.assertEqual(self.table_count("segments"), 1)
+        self.assertEqual(len(self.file_hashes()), 1)
+        self.assertEqual(self.loaded().get_vector_count(), 7)
+
+    def test_metadata_must_be_json(self):
+        db = self.make_db()
+        db.add_vector(np.ones(3), {"tags": ("a", "b")}, id="tuple")
+        db.save_to_disk("docs")
+        self.assertEqual(self.loaded().get_vector_by_id("tuple")[1], {"tags": ["a", "b"]})
+
+        db.add_vector(np.ones(3), {"tags": {"a"}}, id="set")
+        with self.assertRaises(VectorDBOperationError):
+            db.save_to_disk("docs")
+
+    def test_binary_format_keeps_arbitrary_metadata(self):
+        db = self.make_db(5)
+        db.add_vector(random_vectors(1)[0], {"tags": {"a"}}, id="set")
+        db.delete_vector("v0")
+        db.save_to_disk("docs", SerializationFormat.BINARY)
+        self.assertTrue(os.path.exists(os.path.join(self.folder, "docs.svdb")))
+
+        # The default MMAP load falls back to the pickle when no .svcol exists
+        loaded = self.loaded()
+        self.assertEqual(loaded.get_vector_by_id("set")[1], {"tags": {"a"}})
+        self.assertEqual(loaded.list_all_ids(), ["v1", "v2", "v3", "v4", "set"])
+
+
+class AnnIndexTests(VectorsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db = self.make_db(300)
+        self.queries = random_vectors(10, seed=1)
+
+    def exact(self, query, top_n=5):
+        ann, self.db._ann = self.db._ann, None
+        try:
+            return self.db.top_cosine_similarity(query, top_n)
+        finally:
+            self.db._ann = ann
+
+    def test_probing_every_list_is_an_exact_search(self):
+        index = self.db.build_ann_index(n_lists=8, nprobe=8)
+        self.assertIs(self.db.ann_index, index)
+        self.assertEqual(self.db.get_stats()["ann_lists"], 8)
+        for query in self.queries:
+            self.assertSameResults(self.db.top_cosine_similarity(query, 5), self.exact(query))
+        for query, results in zip(self.queries, self.db.search_batch(self.queries, top_n=5)):
+            self.assertSameResults(results, self.exact(query))
+
+    def test_fewer_probes_score_fewer_rows(self):
+        index = self.db.build_ann_index(n_lists=8, nprobe=2)
+        self.assertLess(len(index.candidates(self.queries[0])), 300)
+        self.assertEqual(len(self.db.top_cosine_similarity(self.queries[0], 5)), 5)
+
+    def test_index_follows_adds_deletes_and_updates(self):
+        self.db.build_ann_index(n_lists=8, nprobe=8)
+        added = random_vectors(1, seed=50)[0]
+        self.db.add_vector(added, {"n": "added"}, id="added")
+        self.assertEqual(self.db.top_cosine_similarity(added, 1)[0][0], "added")
+
+        self.db.delete_vector("added")
+        self.assertNotEqual(self.db.top_cosine_similarity(added, 1)[0][0], "added")
+
+        moved = random_vectors(1, seed=51)[0]
+        self.db.update_vector("v10", new_vector=moved)
+        results = self.db.top_cosine_similarity(moved, 5)
+        self.assertEqual(results[0][0], "v10")
+        self.assertEqual([r[0] for r in results].count("v10"), 1)
+        self.assertSameResults(results, self.exact(moved))
+
+    def test_filter_func(self):
+        self.db.build_ann_index(n_lists=8, nprobe=8)
+        even = lambda vector_id, meta: meta["n"] % 2 == 0
+        results = self.db.top_cosine_similarity(self.queries[0], 5, filter_func=even)
+        self.assertTrue(all(r[1]["n"] % 2 == 0 for r in results))
+        self.assertEqual(len(results), 5)
+
+    def test_compaction_remaps_the_index(self):
+        self.db.build_ann_index(n_lists=8, nprobe=8)
+        # The 76th delete passes compact_threshold and compacts
+        for i in range(76):
+            self.db.delete_vector(f"v{i}")
+        self.assertEqual(self.db.get_stats()["deleted_rows"], 0)
+        self.assertEqual(self.db.ann_index.indexed_rows, 224)
+        for query in self.queries:
+            self.assertSameResults(self.db.top_cosine_similarity(query, 5), self.exact(query))
+
+    def test_index_is_saved_with_the_collection(self):
+        self.db.build_ann_index(n_lists=8, nprobe=8)
+        self.db.add_vector(random_vectors(1, seed=60)[0], {"n": 300}, id="late")
+        for name, serialization_format in (("mmap", SerializationFormat.MMAP), ("pickle", SerializationFormat.BINARY)):
+            with self.subTest(format=name):
+                self.db.save_to_disk(name, serialization_format)
+                loaded = SimplerVectors(self.folder)
+                loaded.load_from_disk(name, serialization_format)
+                self.assertEqual(loaded.ann_index.n_lists, 8)
+                self.assertEqual(loaded.ann_index.indexed_rows, 301)
+                query = self.queries[0]
+                self.assertSameResults(loaded.top_cosine_similarity(query, 5), self.db.top_cosine_similarity(query, 5))
+
+    def test_dropping_the_index(self):
+        self.db.build_ann_index(n_lists=8, nprobe=1)
+        self.db.save_to_disk("docs")
+        self.db.drop_ann_index()
+        self.assertIsNone(self.db.ann_index)
+        self.db.save_to_disk("docs")
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "docs.svcol", "ivf.npz")))
+        self.assertSameResults(self.db.top_cosine_similarity(self.queries[0], 5), self.exact(self.queries[0]))
+
+    def test_empty_database_cannot_be_indexed(self):
+        with self.assertRaises(VectorDBOperationError):
+            SimplerVectors(self.folder).build_ann_index()
+
+
+if __name__ == "__main__":
+    unittest.main()
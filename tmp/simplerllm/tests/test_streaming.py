@@ -0,0 +1,207 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from SimplerLLM.language.llm_providers import anthropic_llm, ollama_llm, streaming
+from SimplerLLM.language.llm_providers.streaming import StreamState
+
+from .fakes import FakeLLM, stream_server
+
+
+class FakeLinesResponse:
+    """The parts of a `requests` streaming response the iterators use."""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+class FakeAsyncContent:
+    """An aiohttp `response.content`: async iteration over raw lines."""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __aiter__(self):
+        return self._lines()
+
+    async def _lines(self):
+        for line in self.lines:
+            yield line
+
+
+class SSEParsingTests(unittest.TestCase):
+
+    def test_only_data_lines_are_decoded_until_done(self):
+        lines = [
+            b": keep-alive comment",
+            b"event: message",
+            b'data: {"n": 1}',
+            b"",
+            b"data:",
+            'data: {"n": 2}',
+            b"data: [DONE]",
+            b'data: {"n": 3}',
+        ]
+        self.assertEqual(list(streaming.iter_sse_events(FakeLinesResponse(lines))), [{"n": 1}, {"n": 2}])
+
+    def test_async_sse_matches_sync(self):
+        lines = [b'data: {"n": 1}\n', b"\n", b'data: {"n": 2}\n', b"data: [DONE]\n", b'data: {"n": 3}\n']
+
+        async def collect():
+            response = mock.Mock(content=FakeAsyncContent(lines))
+            return [event async for event in streaming.aiter_sse_events(response)]
+
+        self.assertEqual(asyncio.run(collect()), [{"n": 1}, {"n": 2}])
+
+    def test_invalid_json_is_not_swallowed(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(streaming.iter_sse_events(FakeLinesResponse([b"data: {oops"])))
+
+
+class JSONLinesParsingTests(unittest.TestCase):
+
+    def test_blank_lines_are_skipped(self):
+        lines = [b'{"a": 1}', b"", b"   ", b'{"a": 2}']
+        self.assertEqual(list(streaming.iter_json_lines(FakeLinesResponse(lines))), [{"a": 1}, {"a": 2}])
+
+    def test_async_json_lines(self):
+        async def collect():
+            response = mock.Mock(content=FakeAsyncContent([b'{"a": 1}\n', b"\n", b'{"a": 2}\n']))
+            return [event async for event in streaming.aiter_json_lines(response)]
+
+        self.assertEqual(asyncio.run(collect()), [{"a": 1}, {"a": 2}])
+
+
+class StreamStateTests(unittest.TestCase):
+
+    def test_deltas_accumulate_into_the_final_chunk(self):
+        state = StreamState("model-x")
+        first = state.delta("Hel")
+        state.delta("lo")
+        state.usage(input_tokens=7)
+        state.usage(output_tokens=2)
+        final = state.final()
+
+        self.assertEqual((first.text, first.done, first.model), ("Hel", False, "model-x"))
+        self.assertTrue(final.done)
+        self.assertEqual(final.text, "")
+        self.assertEqual(final.generated_text, "Hello")
+        self.assertEqual((final.input_token_count, final.output_token_count), (7, 2))
+        self.assertGreaterEqual(final.process_time, final.time_to_first_token)
+
+    def test_usage_keeps_earlier_counts_when_a_later_event_omits_them(self):
+        state = StreamState("m")
+        state.usage(input_tokens=5, output_tokens=1)
+        state.usage(output_tokens=9)
+        final = state.final()
+        self.assertEqual((final.input_token_count, final.output_token_count), (5, 9))
+
+    def test_empty_stream_has_no_time_to_first_token(self):
+        final = StreamState("m").final()
+        self.assertEqual(final.generated_text, "")
+        self.assertIsNone(final.time_to_first_token)
+
+
+OLLAMA_LINES = [
+    json.dumps({"message": {"content": "Once "}, "done": False}),
+    "",
+    json.dumps({"message": {"content": "upon"}, "done": False}),
+    json.dumps({"message": {"content": ""}, "done": True, "prompt_eval_count": 12, "eval_count": 3}),
+]
+
+ANTHROPIC_LINES = [
+    "event: message_start",
+    "data: " + json.dumps({"type": "message_start", "message": {"usage": {"input_tokens": 20}}}),
+    "",
+    "data: " + json.dumps({"type": "content_block_start", "content_block": {"type": "text", "text": ""}}),
+    "data: " + json.dumps({"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}),
+    "data: " + json.dumps({"type": "content_block_delta", "delta": {"type": "input_json_delta", "partial_json": "{"}}),
+    "data: " + json.dumps({"type": "content_block_delta", "delta": {"type": "text_delta", "text": " there"}}),
+    "data: " + json.dumps({"type": "message_delta", "usage": {"output_tokens": 4}}),
+    "data: " + json.dumps({"type": "message_stop"}),
+]
+
+
+class ProviderStreamTests(unittest.TestCase):
+    """The providers' stream functions against a local HTTP server."""
+
+    def assertStream(self, chunks, texts, generated_text, tokens):
+        self.assertEqual([chunk.text for chunk in chunks[:-1]], texts)
+        self.assertFalse(any(chunk.done for chunk in chunks[:-1]))
+        final = chunks[-1]
+        self.assertTrue(final.done)
+        self.assertEqual(final.generated_text, generated_text)
+        self.assertEqual((final.input_token_count, final.output_token_count), tokens)
+
+    def test_ollama_ndjson_stream(self):
+        with stream_server(OLLAMA_LINES, "application/x-ndjson") as server:
+            with mock.patch.object(ollama_llm, "OLLAMA_URL", server["url"] + "/api/chat"):
+                chunks = list(ollama_llm.generate_response_stream(
+                    "llama3", messages=[{"role": "user", "content": "tell"}]
+                ))
+        self.assertStream(chunks, ["Once ", "upon"], "Once upon", (12, 3))
+        self.assertTrue(server["requests"][0]["stream"])
+
+    def test_ollama_ndjson_stream_async(self):
+        async def collect():
+            stream = ollama_llm.generate_response_stream_async("llama3", messages=[{"role": "user", "content": "t"}])
+            return [chunk async for chunk in stream]
+
+        with stream_server(OLLAMA_LINES, "application/x-ndjson") as server:
+            with mock.patch.object(ollama_llm, "OLLAMA_URL", server["url"] + "/api/chat"):
+                chunks = asyncio.run(collect())
+        self.assertStream(chunks, ["Once ", "upon"], "Once upon", (12, 3))
+
+    def test_wrapper_stream_builds_the_request_from_a_prompt(self):
+        from SimplerLLM.language.llm import LLM, LLMProvider
+
+        llm = LLM.create(LLMProvider.OLLAMA, model_name="llama3")
+        with stream_server(OLLAMA_LINES, "application/x-ndjson") as server:
+            with mock.patch.object(ollama_llm, "OLLAMA_URL", server["url"] + "/api/chat"):
+                chunks = list(llm.generate_response_stream(prompt="tell", system_prompt="be brief"))
+        self.assertStream(chunks, ["Once ", "upon"], "Once upon", (12, 3))
+        request = server["requests"][0]
+        self.assertEqual(request["model"], "llama3")
+        self.assertEqual(request["messages"][-1], {"role": "user", "content": "tell"})
+
+    def test_anthropic_sse_stream(self):
+        with stream_server(ANTHROPIC_LINES) as server:
+            with mock.patch.object(anthropic_llm, "ANTHROPIC_URL", server["url"] + "/v1/messages"):
+                chunks = list(anthropic_llm.generate_response_stream(
+                    "claude", messages=[{"role": "user", "content": "hi"}], api_key="k"
+                ))
+        self.assertStream(chunks, ["Hi", " there"], "Hi there", (20, 4))
+
+    def test_anthropic_error_event_raises(self):
+        lines = ["data: " + json.dumps({"type": "error", "error": {"type": "overloaded_error"}})]
+        with stream_server(lines) as server:
+            with mock.patch.object(anthropic_llm, "ANTHROPIC_URL", server["url"] + "/v1/messages"):
+                with self.assertRaisesRegex(Exception, "overloaded_error"):
+                    list(anthropic_llm.generate_response_stream("claude", messages=[], api_key="k"))
+
+
+class FallbackStreamTests(unittest.TestCase):
+
+    def test_llm_without_native_streaming_yields_one_delta_and_a_final_chunk(self):
+        chunks = list(FakeLLM().generate_response_stream(prompt="story"))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[0].text, "story#1")
+        self.assertTrue(chunks[1].done)
+        self.assertEqual(chunks[1].generated_text, "story#1")
+        self.assertEqual(chunks[1].output_token_count, 1)
+
+    def test_async_fallback(self):
+        async def collect():
+            return [chunk async for chunk in FakeLLM().generate_response_stream_async(prompt="story")]
+
+        chunks = asyncio.run(collect())
+        self.assertEqual([chunk.done for chunk in chunks], [False, True])
+        self.assertEqual(chunks[-1].generated_text, "story#1")
+
+
+if __name__ == "__main__":
+    unittest.main()